@@ -1,5 +1,7 @@
 import tkinter as tk
-from tkinter import ttk
+
+from outliner import VirtualOutliner
+from scene_graph import SceneGraph
 
 class OutlinerWindow(tk.Tk):
     def __init__(self):
@@ -7,14 +9,16 @@ class OutlinerWindow(tk.Tk):
         self.title("GKSHALA - Outliner")
         self.geometry("300x600")
 
-        # Treeview for Hierarchy
-        self.tree = ttk.Treeview(self)
-        self.tree.heading("#0", text="Scene Objects")
+        # Virtualized view of the hierarchy
+        self.tree = VirtualOutliner(self)
 
         # Add Sample Items
-        root = self.tree.insert("", "end", text="World", open=True)
-        cube = self.tree.insert(root, "end", text="pCube1")
-        light = self.tree.insert(root, "end", text="light1")
+        self.scene = SceneGraph()
+        world = self.scene.add_node("World")
+        self.scene.add_node("pCube1", 'Polygon', parent=world)
+        self.scene.add_node("light1", 'Light', parent=world)
+        self.tree.set_scene(self.scene)
+        self.tree.see(world + 1)
 
         self.tree.pack(expand=True, fill="both")
 
@@ -1,9 +1,85 @@
+import time
 import tkinter as tk
 from tkinter import ttk
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.figure import Figure
+from mpl_toolkits.mplot3d.art3d import Poly3DCollection
 import numpy as np
 
+from primitives import PrimitiveLibrary, transform_points, translation_matrix
+
+# Samples per sphere axis; plot_surface capped the old 100x100 grid to 50
+SPHERE_RESOLUTION = 50
+
+# New objects are laid out on a grid this many units apart
+OBJECT_SPACING = 2.5
+OBJECTS_PER_ROW = 5
+
+
+class RetainedScene:
+    """Keeps one matplotlib artist per object so a redraw only touches what changed
+
+    Objects carry only a type, resolution and 4x4 transform; their
+    tessellation comes from a shared primitive library. sync() creates
+    artists for new objects, moves those whose version changed and
+    removes deleted ones; untouched artists are left alone.
+    """
+
+    COLORS = {'cube': 'cyan', 'sphere': 'magenta'}
+
+    def __init__(self, ax, library=None):
+        self.ax = ax
+        self.library = library if library is not None else PrimitiveLibrary()
+        self.artists = {}
+        self.versions = {}
+        self.pushed = 0
+
+    def faces(self, obj):
+        """Return an object's quads in world space as a (n, 4, 3) array"""
+        vertices, quads, _ = self.library.mesh(obj['type'], obj.get('resolution'))
+        return transform_points(vertices, obj['transform'])[quads]
+
+    def sync(self, objects):
+        """Push added or changed objects to their artists and drop removed ones"""
+        self.pushed = 0
+        live = set()
+        for obj in objects:
+            key = obj['id']
+            live.add(key)
+            if self.versions.get(key) == obj['version']:
+                continue
+            faces = self.faces(obj)
+            artist = self.artists.get(key)
+            if artist is None:
+                artist = Poly3DCollection(faces, facecolor=self.COLORS[obj['type']], alpha=0.5)
+                self.ax.add_collection3d(artist)
+                self.artists[key] = artist
+            else:
+                artist.set_verts(faces)
+            self.versions[key] = obj['version']
+            self.pushed += 1
+        for key in set(self.artists) - live:
+            self.artists.pop(key).remove()
+            self.versions.pop(key)
+
+    def fit(self, objects, margin=1.5):
+        """Frame the axes around every object"""
+        if not objects:
+            low, high = np.full(3, -margin), np.full(3, margin)
+        else:
+            positions = np.array([obj['transform'][:3, 3] for obj in objects])
+            low, high = positions.min(axis=0) - margin, positions.max(axis=0) + margin
+        # Equal extents keep spheres round
+        centre, half = (low + high) / 2, (high - low).max() / 2
+        self.ax.set_xlim(centre[0] - half, centre[0] + half)
+        self.ax.set_ylim(centre[1] - half, centre[1] + half)
+        self.ax.set_zlim(centre[2] - half, centre[2] + half)
+
+    def clear(self):
+        """Remove every artist"""
+        self.sync([])
+
+
 class Simple3DModelingTool(tk.Tk):
     def __init__(self):
         super().__init__()
@@ -12,6 +88,8 @@ class Simple3DModelingTool(tk.Tk):
         
         # Initialize 3D view state
         self.objects = []
+        self.next_id = 0
+        self.primitives = PrimitiveLibrary()
         
         # Create UI components
         self.create_menu()
@@ -42,17 +120,23 @@ class Simple3DModelingTool(tk.Tk):
         self.left_panel = ttk.Frame(self.main_panel, width=200)
         self.main_panel.add(self.left_panel)
         
+        # Redraw statistics
+        self.stats_label = ttk.Label(self.left_panel, text="Objects: 0")
+        self.stats_label.pack(anchor=tk.W, padx=5, pady=5)
+        
         # Center panel for 3D viewport
         self.viewport_panel = ttk.Frame(self.main_panel)
         self.main_panel.add(self.viewport_panel, weight=1)
     
     def setup_3d_viewport(self):
-        """Set up the 3D viewport using matplotlib"""
+        """Set up the 3D viewport using matplotlib; called once"""
         self.viewport_figure = Figure(figsize=(5, 5), dpi=100)
         self.viewport_ax = self.viewport_figure.add_subplot(111, projection='3d')
         self.viewport_canvas = FigureCanvasTkAgg(self.viewport_figure, master=self.viewport_panel)
         self.viewport_canvas.draw()
         self.viewport_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self.scene = RetainedScene(self.viewport_ax, self.primitives)
+        self.scene.fit(self.objects)
     
     def create_shape(self, shape_type):
         """Create a 3D shape in the viewport"""
@@ -62,40 +146,40 @@ class Simple3DModelingTool(tk.Tk):
             self.create_sphere()
         self.redraw_viewport()
     
+    def add_object(self, shape_type, resolution=None):
+        """Append an instance at the next free grid slot and return it"""
+        slot = len(self.objects)
+        position = ((slot % OBJECTS_PER_ROW) * OBJECT_SPACING, (slot // OBJECTS_PER_ROW) * OBJECT_SPACING, 0.0)
+        obj = {
+            'id': self.next_id,
+            'type': shape_type,
+            'resolution': resolution,
+            'transform': translation_matrix(position),
+            'version': 0,
+        }
+        self.next_id += 1
+        self.objects.append(obj)
+        return obj
+    
     def create_cube(self):
         """Create a cube in the 3D viewport"""
-        r = 1  # Cube size
-        vertices = np.array([[r, r, r], [-r, r, r], [-r, -r, r], [r, -r, r],
-                             [r, r, -r], [-r, r, -r], [-r, -r, -r], [r, -r, -r]])
-        faces = [[vertices[j] for j in [0, 1, 2, 3]],
-                 [vertices[j] for j in [4, 5, 6, 7]],
-                 [vertices[j] for j in [0, 1, 5, 4]],
-                 [vertices[j] for j in [2, 3, 7, 6]],
-                 [vertices[j] for j in [1, 2, 6, 5]],
-                 [vertices[j] for j in [0, 3, 7, 4]]]
-        
-        for face in faces:
-            self.viewport_ax.add_collection3d(plt.Polygon(face, color='cyan', alpha=0.5))
+        return self.add_object('cube')
     
     def create_sphere(self):
         """Create a sphere in the 3D viewport"""
-        u = np.linspace(0, 2 * np.pi, 100)
-        v = np.linspace(0, np.pi, 100)
-        x = np.outer(np.cos(u), np.sin(v))
-        y = np.outer(np.sin(u), np.sin(v))
-        z = np.outer(np.ones(np.size(u)), np.cos(v))
-        self.viewport_ax.plot_surface(x, y, z, color='magenta', alpha=0.5)
+        return self.add_object('sphere', SPHERE_RESOLUTION)
     
     def redraw_viewport(self):
-        """Redraw all objects in the viewport"""
-        self.viewport_ax.cla()  # Clear the axes
-        self.setup_3d_viewport()  # Reset the viewport
-        for obj in self.objects:
-            if obj['type'] == 'cube':
-                self.create_cube()
-            elif obj['type'] == 'sphere':
-                self.create_sphere()
+        """Push added or changed objects to the retained scene and redraw"""
+        start = time.perf_counter()
+        self.scene.sync(self.objects)
+        self.scene.fit(self.objects)
         self.viewport_canvas.draw()
+        elapsed = (time.perf_counter() - start) * 1000
+        self.stats_label.config(
+            text=f"Objects: {len(self.objects)}\nMeshes: {len(self.primitives)}\n"
+                 f"Pushed: {self.scene.pushed}\nRedraw: {elapsed:.0f} ms"
+        )
     
     def new_scene(self):
         """Create a new empty scene"""
@@ -0,0 +1,236 @@
+import numpy as np
+
+from scene_graph import TRANSFORM_COLUMNS
+
+# Interpolation of the segment that starts at a key
+STEP, LINEAR, BEZIER = 0, 1, 2
+
+# Chunk kinds a node's curves are saved under in a .gks file
+ANIMATION_CHUNKS = ('anim_channels', 'anim_offsets', 'anim_times', 'anim_values', 'anim_modes')
+
+
+def auto_tangents(times, values, starts, ends):
+    """Return clamped auto tangent slopes for packed curves
+
+    Interior keys take the slope between their neighbours, first and last
+    keys and local extremes stay flat so curves never overshoot.
+    """
+    slopes = np.zeros_like(values)
+    if len(times) < 3:
+        return slopes
+    prev_t, next_t = times[:-2], times[2:]
+    prev_v, next_v = values[:-2], values[2:]
+    interior = np.ones(len(times), dtype=bool)
+    interior[starts] = False
+    interior[ends - 1] = False
+    inner = interior[1:-1]
+    slope = (next_v - prev_v) / np.where(next_t > prev_t, next_t - prev_t, 1.0)
+    extreme = (values[1:-1] - prev_v) * (next_v - values[1:-1]) <= 0
+    slopes[1:-1] = np.where(inner & ~extreme, slope, 0.0)
+    return slopes
+
+
+def evaluate_packed(packed, time, channels=None):
+    """Return the value of every packed channel, or just some of them, at a time"""
+    starts, ends, offsets = packed['starts'], packed['ends'], packed['offsets']
+    if channels is not None:
+        starts, ends, offsets = starts[channels], ends[channels], offsets[channels]
+    if len(starts) == 0:
+        return np.empty(0)
+    times, values = packed['times'], packed['values']
+
+    t = min(max(time, packed['t_min']), packed['t_max'])
+    query = offsets + (t - packed['t_min'])
+    i = np.searchsorted(packed['search'], query, side='right') - 1
+    i = np.clip(i, starts, ends - 1)
+    j = np.minimum(i + 1, ends - 1)
+
+    t0, t1 = times[i], times[j]
+    v0, v1 = values[i], values[j]
+    span = t1 - t0
+    u = np.clip((time - t0) / np.where(span > 0, span, 1.0), 0.0, 1.0)
+
+    # Cubic Hermite segment with auto tangents
+    u2 = u * u
+    u3 = u2 * u
+    bezier = ((2 * u3 - 3 * u2 + 1) * v0 + (u3 - 2 * u2 + u) * span * packed['slopes'][i]
+              + (-2 * u3 + 3 * u2) * v1 + (u3 - u2) * span * packed['slopes'][j])
+    linear = v0 + (v1 - v0) * u
+    mode = packed['modes'][i]
+    return np.where(mode == BEZIER, bezier, np.where(mode == LINEAR, linear, v0))
+
+
+def scatter_channels(packed, values, columns, channels=None):
+    """Write evaluated channel values into transform column arrays"""
+    codes, nodes, components = packed['columns'], packed['nodes'], packed['components']
+    if channels is not None:
+        codes, nodes, components = codes[channels], nodes[channels], components[channels]
+    for code, column in enumerate(TRANSFORM_COLUMNS):
+        mask = codes == code
+        if mask.any():
+            columns[column][nodes[mask], components[mask]] = values[mask]
+
+
+class KeyframeStore:
+    """Animation curves for scene graph transform channels
+
+    Each channel (node, column, component) keeps its keys as sorted time and
+    value arrays. For evaluation every curve is packed into flat arrays with
+    a monotonic search key, so one searchsorted call finds the active
+    segment of all channels and interpolation runs as array math.
+    """
+
+    def __init__(self):
+        self.channels = []
+        self.times = []
+        self.values = []
+        self.modes = []
+        self._lookup = {}
+        self._packed = None
+
+    def __len__(self):
+        return len(self.channels)
+
+    def channel(self, node, column, component, create=False):
+        """Return a channel id, or None if the channel has no curve"""
+        key = (node, column, component)
+        channel = self._lookup.get(key)
+        if channel is None and create:
+            channel = len(self.channels)
+            self._lookup[key] = channel
+            self.channels.append(key)
+            self.times.append(np.empty(0))
+            self.values.append(np.empty(0))
+            self.modes.append(np.empty(0, dtype=np.int8))
+        return channel
+
+    def set_key(self, node, column, component, time, value, mode=BEZIER):
+        """Insert or replace one key"""
+        channel = self.channel(node, column, component, create=True)
+        times = self.times[channel]
+        i = np.searchsorted(times, time)
+        if i < len(times) and times[i] == time:
+            self.values[channel][i] = value
+            self.modes[channel][i] = mode
+        else:
+            self.times[channel] = np.insert(times, i, time)
+            self.values[channel] = np.insert(self.values[channel], i, value)
+            self.modes[channel] = np.insert(self.modes[channel], i, mode)
+        self._packed = None
+
+    def set_curve(self, node, column, component, times, values, modes=BEZIER):
+        """Replace a whole curve at once"""
+        channel = self.channel(node, column, component, create=True)
+        times = np.asarray(times, dtype=np.float64)
+        order = np.argsort(times, kind='stable')
+        self.times[channel] = times[order]
+        self.values[channel] = np.asarray(values, dtype=np.float64)[order]
+        self.modes[channel] = np.broadcast_to(np.asarray(modes, dtype=np.int8), times.shape)[order].copy()
+        self._packed = None
+
+    def remove_key(self, node, column, component, time):
+        """Delete the key at a time if there is one"""
+        channel = self.channel(node, column, component)
+        if channel is None:
+            return
+        keep = self.times[channel] != time
+        self.times[channel] = self.times[channel][keep]
+        self.values[channel] = self.values[channel][keep]
+        self.modes[channel] = self.modes[channel][keep]
+        self._packed = None
+
+    def key_times(self, node=None):
+        """Return the sorted distinct key times, optionally for one node"""
+        times = [t for (n, _, _), t in zip(self.channels, self.times) if node is None or n == node]
+        return np.unique(np.concatenate(times)) if times else np.empty(0)
+
+    def influence(self, node, column, component, time):
+        """Return the (first, last) times whose value can change with the key at a time
+
+        Auto tangents reach one key further on each side and curve ends hold
+        their value, so spans touching an end extend to infinity.
+        """
+        channel = self.channel(node, column, component)
+        if channel is None:
+            return time, time
+        times = self.times[channel]
+        i = np.searchsorted(times, time)
+        lo = times[i - 2] if i >= 2 else -np.inf
+        hi = times[i + 2] if i + 2 < len(times) else np.inf
+        return lo, hi
+
+    def pack(self):
+        """Flatten all curves for vectorized evaluation"""
+        if self._packed is not None:
+            return self._packed
+        counts = np.array([len(t) for t in self.times], dtype=np.int64)
+        live = np.flatnonzero(counts)
+        counts = counts[live]
+        ends = np.cumsum(counts)
+        starts = ends - counts
+        times = np.concatenate([self.times[c] for c in live]) if len(live) else np.empty(0)
+        values = np.concatenate([self.values[c] for c in live]) if len(live) else np.empty(0)
+        modes = np.concatenate([self.modes[c] for c in live]) if len(live) else np.empty(0, np.int8)
+
+        t_min = times.min() if len(times) else 0.0
+        stride = (times.max() - t_min + 1.0) if len(times) else 1.0
+        owner = np.repeat(np.arange(len(live)), counts)
+        nodes = np.array([self.channels[c][0] for c in live], dtype=np.int64)
+        columns = np.array([TRANSFORM_COLUMNS.index(self.channels[c][1]) for c in live], dtype=np.int8)
+        components = np.array([self.channels[c][2] for c in live], dtype=np.int64)
+
+        self._packed = {
+            'live': live,
+            'starts': starts,
+            'ends': ends,
+            'times': times,
+            'values': values,
+            'modes': modes,
+            'slopes': auto_tangents(times, values, starts, ends),
+            'search': owner * stride + (times - t_min),
+            'offsets': np.arange(len(live)) * stride,
+            't_min': t_min,
+            't_max': times.max() if len(times) else 0.0,
+            'nodes': nodes,
+            'columns': columns,
+            'components': components,
+            'animated_nodes': np.unique(nodes),
+        }
+        return self._packed
+
+    def evaluate(self, time):
+        """Return the value of every packed channel at a time"""
+        return evaluate_packed(self.pack(), time)
+
+    def apply(self, scene, time):
+        """Evaluate every curve and write the results into the scene graph"""
+        packed = self.pack()
+        if len(packed['starts']) == 0:
+            return 0
+        result = evaluate_packed(packed, time)
+        scatter_channels(packed, result, {column: getattr(scene, column) for column in TRANSFORM_COLUMNS})
+        scene.mark_dirty(packed['animated_nodes'])
+        return len(result)
+
+    def node_arrays(self, node):
+        """Return a node's curves as .gks chunk arrays"""
+        channels = [c for c, (n, _, _) in enumerate(self.channels) if n == node and len(self.times[c])]
+        if not channels:
+            return {}
+        counts = [len(self.times[c]) for c in channels]
+        return {
+            'anim_channels': np.array([[TRANSFORM_COLUMNS.index(self.channels[c][1]), self.channels[c][2]]
+                                       for c in channels], dtype=np.int8),
+            'anim_offsets': np.concatenate([[0], np.cumsum(counts)]).astype(np.int64),
+            'anim_times': np.concatenate([self.times[c] for c in channels]),
+            'anim_values': np.concatenate([self.values[c] for c in channels]),
+            'anim_modes': np.concatenate([self.modes[c] for c in channels]),
+        }
+
+    def load_node_arrays(self, node, arrays):
+        """Restore a node's curves from .gks chunk arrays"""
+        offsets = arrays['anim_offsets']
+        for k, (column, component) in enumerate(arrays['anim_channels'].tolist()):
+            lo, hi = offsets[k], offsets[k + 1]
+            self.set_curve(node, TRANSFORM_COLUMNS[column], component, arrays['anim_times'][lo:hi],
+                           arrays['anim_values'][lo:hi], arrays['anim_modes'][lo:hi])
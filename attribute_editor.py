@@ -0,0 +1,223 @@
+import time
+import tkinter as tk
+from tkinter import ttk
+
+# Panel templates: a list of (section title, rows). A row is (label,
+# fields) where each field is (axis label, column, component) bound to a
+# channel through the editor's value and commit callbacks, or (label, None)
+# for an option checkbox.
+TRANSFORM_SECTION = ("Transform Attributes", [
+    ("Translate", [("X", 'translate', 0), ("Y", 'translate', 1), ("Z", 'translate', 2)]),
+    ("Rotate", [("X", 'rotate', 0), ("Y", 'rotate', 1), ("Z", 'rotate', 2)]),
+    ("Scale", [("X", 'scale', 0), ("Y", 'scale', 1), ("Z", 'scale', 2)]),
+    ("Visibility", [("", 'visibility', None)]),
+])
+OPTION_SECTIONS = [
+    (f"{section} Attributes", [(f"{section} Option {i + 1}", None) for i in range(3)])
+    for section in ("Pivot", "Limits", "Display")
+]
+NODE_TEMPLATES = {
+    'Transform': [TRANSFORM_SECTION] + OPTION_SECTIONS,
+    'Polygon': [TRANSFORM_SECTION] + OPTION_SECTIONS,
+    'Light': [TRANSFORM_SECTION, ("Light Attributes", [
+        ("Intensity", [("", 'intensity', None)]),
+        ("Color", [("R", 'color_r', None), ("G", 'color_g', None), ("B", 'color_b', None)]),
+        ("Emit Diffuse", None),
+        ("Emit Specular", None),
+    ])] + OPTION_SECTIONS[2:],
+    'Camera': [TRANSFORM_SECTION, ("Camera Attributes", [
+        ("Focal Length", [("", 'focal_length', None)]),
+        ("Clip Planes", [("N", 'near_clip', None), ("F", 'far_clip', None)]),
+    ])] + OPTION_SECTIONS[2:],
+}
+RENDER_TEMPLATE = [("Render Stats", [(option, None) for option in (
+    "Casts Shadows", "Receive Shadows", "Primary Visibility", "Visible In Reflections", "Visible In Refractions",
+)])]
+
+
+def count_widgets(template, summary=True):
+    """Return how many widgets a panel built from a template creates"""
+    # Panel, scroll frame, canvas, scrollbar, inner frame and shape summary
+    count = 6 if summary else 5
+    for _, rows in template:
+        count += 1
+        for _, fields in rows:
+            if fields is None:
+                count += 1
+            else:
+                count += 2 + sum(2 if axis else 1 for axis, _, _ in fields)
+    return count
+
+
+class AttributePanel(tk.Frame):
+    """Scrolling panel of sections built once from a template
+
+    A field commits on Return, or on focus loss if its text differs from
+    what rebind() last showed, so tabbing through a panel writes nothing.
+    """
+
+    def __init__(self, parent, template, commit, bg, fg, field_bg, summary=True):
+        super().__init__(parent, bg=bg)
+        self.commit = commit
+        self.entries = {}
+        self.shown = {}
+        self.options = []
+
+        scroll_frame = tk.Frame(self, bg=bg)
+        scroll_frame.pack(fill=tk.BOTH, expand=True)
+        canvas = tk.Canvas(scroll_frame, bg=bg, highlightthickness=0)
+        scrollbar = ttk.Scrollbar(scroll_frame, orient="vertical", command=canvas.yview)
+        inner = tk.Frame(canvas, bg=bg)
+        inner.bind("<Configure>", lambda e: canvas.configure(scrollregion=canvas.bbox("all")))
+        canvas.create_window((0, 0), window=inner, anchor="nw")
+        canvas.configure(yscrollcommand=scrollbar.set)
+        canvas.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+
+        # Shape summary, filled in by the editor on selection
+        self.info = None
+        if summary:
+            self.info = tk.Label(inner, text="No shape", bg=bg, fg="#aaaaaa", anchor=tk.W)
+            self.info.pack(fill=tk.X, padx=5, pady=(5, 0))
+
+        for title, rows in template:
+            section = tk.LabelFrame(inner, text=title, bg=bg, fg=fg, padx=5, pady=5)
+            section.pack(fill=tk.X, padx=5, pady=5)
+            for label, fields in rows:
+                if fields is None:
+                    variable = tk.BooleanVar(value=False)
+                    tk.Checkbutton(section, text=label, variable=variable, bg=bg, fg=fg,
+                                   activebackground=bg, activeforeground=fg, selectcolor=bg).pack(anchor=tk.W)
+                    self.options.append(variable)
+                    continue
+                row = tk.Frame(section, bg=bg)
+                row.pack(fill=tk.X, pady=2)
+                tk.Label(row, text=label, bg=bg, fg=fg, width=12, anchor=tk.W).pack(side=tk.LEFT)
+                for axis, column, component in fields:
+                    if axis:
+                        tk.Label(row, text=axis, bg=bg, fg=fg, width=1).pack(side=tk.LEFT)
+                    entry = tk.Entry(row, bg=field_bg, fg=fg, insertbackground=fg, bd=0, width=8)
+                    entry.pack(side=tk.LEFT, padx=2)
+                    key = (column, component)
+                    entry.bind("<Return>", lambda e, key=key: self.commit_field(key))
+                    entry.bind("<FocusOut>", lambda e, key=key: self.commit_field(key, edited_only=True))
+                    self.entries[key] = entry
+
+    def commit_field(self, key, edited_only=False):
+        """Send a field's text to its channel, if edited_only only when it was changed"""
+        text = self.entries[key].get().strip()
+        if edited_only and text == self.shown.get(key, "").strip():
+            return
+        # Committed text counts as shown, so leaving the field afterwards does not apply it again
+        self.shown[key] = text
+        self.commit(key, text)
+
+    def rebind(self, value):
+        """Show the current values of every bound field"""
+        for key, entry in self.entries.items():
+            text = value(key)
+            entry.delete(0, tk.END)
+            entry.insert(0, text)
+            self.shown[key] = text
+
+
+class AttributeEditor(ttk.Notebook):
+    """Attribute editor whose panels are built the first time they are seen
+
+    The node tab shows a panel built from the template of the selected
+    node's type. Panels are cached per type, so selecting another node of
+    a type already seen only rebinds field values, and a type is never
+    built while its tab is hidden. Other tabs are built on first view too.
+    build_times records how long each panel took.
+    """
+
+    def __init__(self, parent, value, commit, bg="#171717", fg="#ffffff", field_bg="#2d2d2d",
+                 templates=None, tabs=(("lambert1", []), ("Render Stats", RENDER_TEMPLATE))):
+        super().__init__(parent)
+        self.value = value
+        self.commit = commit
+        self.bg = bg
+        self.fg = fg
+        self.field_bg = field_bg
+        self.templates = templates or NODE_TEMPLATES
+        self.panels = {}
+        self.build_times = {}
+        self.node_type = None
+        self.info_text = "No shape"
+        self.current = None
+
+        self.node_tab = tk.Frame(self, bg=bg)
+        self.add(self.node_tab, text=" ")
+        self.pending_tabs = {}
+        for title, template in tabs:
+            tab = tk.Frame(self, bg=bg)
+            self.add(tab, text=title)
+            self.pending_tabs[str(tab)] = (tab, title, template)
+        self.bind("<<NotebookTabChanged>>", lambda e: self.on_tab_changed())
+
+    def template(self, node_type):
+        """Return the template for a node type, falling back to plain transforms"""
+        return self.templates.get(node_type, self.templates['Transform'])
+
+    def build(self, parent, key, template, summary=True):
+        """Build a panel and record its build time"""
+        start = time.perf_counter()
+        panel = AttributePanel(parent, template, self.commit, self.bg, self.fg, self.field_bg, summary)
+        self.build_times[key] = time.perf_counter() - start
+        return panel
+
+    def widget_count(self):
+        """Return how many widgets the panels built so far hold"""
+        def count(widget):
+            return 1 + sum(count(child) for child in widget.winfo_children())
+        return sum(count(child) for child in self.winfo_children())
+
+    def show(self, node_type, name):
+        """Point the node tab at a node of a type, or at nothing with None
+
+        Returns True if this built a new panel.
+        """
+        self.node_type = node_type
+        self.tab(self.node_tab, text=name or " ")
+        return self.sync()
+
+    def sync(self):
+        """Swap in and rebind the panel of the current node type while the node tab is in view"""
+        if self.node_type is None:
+            self.refresh()
+            return False
+        if self.select() != str(self.node_tab):
+            return False
+        panel = self.panels.get(self.node_type)
+        built = panel is None
+        if built:
+            panel = self.build(self.node_tab, self.node_type, self.template(self.node_type))
+            self.panels[self.node_type] = panel
+        if panel is not self.current:
+            if self.current is not None:
+                self.current.pack_forget()
+            panel.pack(fill=tk.BOTH, expand=True)
+            self.current = panel
+        panel.info.config(text=self.info_text)
+        panel.rebind(self.value)
+        return built
+
+    def refresh(self):
+        """Show current values in the visible node panel"""
+        if self.current is not None and self.select() == str(self.node_tab):
+            self.current.rebind(self.value)
+
+    def set_info(self, text):
+        """Set the shape summary line of the node tab"""
+        self.info_text = text
+        if self.current is not None:
+            self.current.info.config(text=text)
+
+    def on_tab_changed(self):
+        """Build a tab's contents the first time it is selected"""
+        selected = self.select()
+        if selected == str(self.node_tab):
+            self.sync()
+        elif selected in self.pending_tabs:
+            tab, title, template = self.pending_tabs.pop(selected)
+            self.build(tab, title, template, summary=False).pack(fill=tk.BOTH, expand=True)
@@ -0,0 +1,58 @@
+import argparse
+import time
+import tkinter as tk
+
+from attribute_editor import NODE_TEMPLATES, RENDER_TEMPLATE, AttributeEditor, count_widgets
+
+
+def run_counts():
+    """Widgets created up front when every panel is built eagerly against only the first one"""
+    eager = sum(count_widgets(template) for template in NODE_TEMPLATES.values())
+    eager += count_widgets(RENDER_TEMPLATE, summary=False) + count_widgets([], summary=False)
+    lazy = count_widgets(NODE_TEMPLATES['Polygon'])
+    print("widgets at startup")
+    print(f"  every panel built eagerly {eager:6}")
+    print(f"  first node panel only     {lazy:6}")
+    for node_type, template in NODE_TEMPLATES.items():
+        print(f"  {node_type:<25} {count_widgets(template):6}")
+
+
+def run_widgets(switches):
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"widgets skipped: {e}")
+        return
+    root.geometry("600x400")
+    values = {}
+    start = time.perf_counter()
+    editor = AttributeEditor(root, value=lambda key: values.get(key, "0.000"), commit=lambda key, text: None)
+    editor.pack(fill=tk.BOTH, expand=True)
+    editor.show('Polygon', "pCube1")
+    root.update()
+    startup = (time.perf_counter() - start) * 1000
+    print(f"lazy attribute editor: startup {startup:.1f} ms, {editor.widget_count()} widgets")
+
+    types = list(NODE_TEMPLATES)
+    for node_type in types:
+        editor.show(node_type, node_type)
+        root.update()
+    for node_type, seconds in editor.build_times.items():
+        print(f"  build {node_type:<18} {seconds * 1000:8.2f} ms")
+
+    # Every type is cached now, so a selection change only rebinds values
+    start = time.perf_counter()
+    for number in range(switches):
+        editor.show(types[number % len(types)], f"node{number}")
+        root.update()
+    rebind = (time.perf_counter() - start) * 1000 / switches
+    print(f"  switch selection   {rebind:8.2f} ms ({editor.widget_count()} widgets after visiting every type)")
+    root.destroy()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Attribute editor startup cost and widget counts")
+    parser.add_argument("--switches", type=int, default=200)
+    args = parser.parse_args()
+    run_counts()
+    run_widgets(args.switches)
@@ -0,0 +1,45 @@
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from bench_gks_format import make_scene
+from gks_format import save_scene
+from gks_journal import SceneJournal
+
+
+def median_time(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def run(sizes, node_count, dirty_nodes, attribute_edits, repeat):
+    print(f"{dirty_nodes} dirty nodes + {attribute_edits} attribute edits per save, median of {repeat}")
+    print(f"{'vertices':>12}{'full (ms)':>12}{'journal (ms)':>14}{'speedup':>10}")
+    for total_vertices in sizes:
+        nodes = make_scene(total_vertices, node_count)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "scene.gks")
+            journal = SceneJournal(path)
+            dirty = {i: nodes[i] for i in range(dirty_nodes)}
+            attributes = [(i % node_count, 'translateX', float(i)) for i in range(attribute_edits)]
+
+            full = median_time(lambda: save_scene(path, nodes), repeat)
+            incremental = median_time(lambda: journal.append(dirty, attributes), repeat)
+        print(f"{total_vertices:>12,}{full * 1000:12.1f}{incremental * 1000:14.2f}{full / incremental:10.0f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Save latency of full .gks writes against journal appends")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000, 5_000_000])
+    parser.add_argument("--nodes", type=int, default=200)
+    parser.add_argument("--dirty", type=int, default=1)
+    parser.add_argument("--edits", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    run(args.sizes, args.nodes, args.dirty, args.edits, args.repeat)
@@ -0,0 +1,108 @@
+import argparse
+import time
+
+import numpy as np
+
+from bvh import BVH, MeshBVH, frustum_planes, points_in_polygon, ray_triangles, transform_boxes
+from primitives import sphere_mesh, translation_matrix, triangulate
+from rasterizer import camera_matrices, project_points, screen_ray, window_matrix
+
+
+def timed(function, repeat):
+    """Return (result, mean seconds) of calling function repeat times"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = function()
+    return result, (time.perf_counter() - start) / repeat
+
+
+def sphere_for(triangles):
+    """Return (vertices, indices) of a unit sphere with about the given triangle count"""
+    resolution = max(4, int(np.sqrt(triangles / 2)) + 1)
+    vertices, quads = sphere_mesh(resolution)
+    return vertices, triangulate(vertices, quads)
+
+
+def run(triangles, objects, width, height, repeat):
+    view, projection = camera_matrices('perspective', width / height)
+    rng = np.random.default_rng(0)
+
+    # One dense mesh: triangle BVH against brute force ray casting
+    vertices, indices = sphere_for(triangles)
+    mesh, build = timed(lambda: MeshBVH(vertices, indices), 1)
+    rays = [(origin * 3, -origin + rng.normal(size=3) * 0.3) for origin in rng.normal(size=(repeat, 3))]
+    start = time.perf_counter()
+    for origin, direction in rays:
+        mesh.raycast(origin, direction)
+    pick = (time.perf_counter() - start) / repeat
+    corners = vertices[indices]
+    _, brute = timed(lambda: ray_triangles(rays[0][0], rays[0][1], corners[:, 0], corners[:, 1], corners[:, 2]), 3)
+    print(f"one mesh of {len(indices):,} triangles")
+    print(f"  build          {build * 1000:8.1f} ms")
+    print(f"  ray pick       {pick * 1000:8.3f} ms   (brute force {brute * 1000:.1f} ms)")
+
+    # Many instanced meshes: object BVH over world bounds, then the shared triangle BVH
+    vertices, indices = sphere_for(triangles // objects)
+    shared = MeshBVH(vertices, indices)
+    side = int(np.ceil(np.sqrt(objects)))
+    models = np.stack([translation_matrix((3.0 * (i % side - side / 2), 0.0, 3.0 * (i // side - side / 2)))
+                       for i in range(objects)])
+    local_lo, local_hi = np.tile(vertices.min(axis=0), (objects, 1)), np.tile(vertices.max(axis=0), (objects, 1))
+    lo, hi = transform_boxes(local_lo, local_hi, models)
+    scene, build = timed(lambda: BVH(lo, hi), 1)
+
+    moved = rng.choice(objects, max(1, objects // 100), replace=False)
+    models[moved, 1, 3] += 0.5
+    moved_lo, moved_hi = transform_boxes(local_lo[moved], local_hi[moved], models[moved])
+    _, refit = timed(lambda: scene.refit(moved, moved_lo, moved_hi), repeat)
+
+    _, cull = timed(lambda: scene.frustum(frustum_planes(projection @ view)), repeat)
+    visible = scene.frustum(frustum_planes(projection @ view))
+
+    def pick_scene(x, y):
+        origin, direction = screen_ray(x, y, width, height, view, projection)
+        items, entries = scene.ray(origin, direction)
+        nearest = np.inf
+        for index, entry in zip(items.tolist(), entries.tolist()):
+            if entry > nearest:
+                break
+            inverse = np.linalg.inv(models[index])
+            t, _ = shared.raycast(inverse[:3, :3] @ origin + inverse[:3, 3], inverse[:3, :3] @ direction)
+            nearest = min(nearest, t)
+        return nearest
+
+    centres, _ = project_points(models[:, :3, 3], width, height, view, projection)
+    targets = centres[rng.choice(visible, repeat)]
+    start = time.perf_counter()
+    for x, y in targets:
+        pick_scene(x, y)
+    scene_pick = (time.perf_counter() - start) / repeat
+
+    x, y = width / 2, height / 2
+    lasso = np.array([(x + 80 * np.cos(a), y + 60 * np.sin(a)) for a in np.linspace(0, 2 * np.pi, 64, endpoint=False)])
+
+    def lasso_select():
+        (x0, y0), (x1, y1) = lasso.min(axis=0), lasso.max(axis=0)
+        candidates = scene.frustum(frustum_planes(window_matrix(x0, y0, x1, y1, width, height) @ projection @ view))
+        box_lo, box_hi = scene.boxes(candidates)
+        pixels, in_front = project_points((box_lo + box_hi) / 2, width, height, view, projection)
+        return candidates[in_front & points_in_polygon(pixels, lasso)]
+
+    selected, lasso_time = timed(lasso_select, repeat)
+    print(f"{objects:,} objects of {len(indices):,} triangles ({objects * len(indices):,} total)")
+    print(f"  build          {build * 1000:8.3f} ms")
+    print(f"  refit {len(moved):>4} moved {refit * 1000:8.3f} ms")
+    print(f"  frustum cull   {cull * 1000:8.3f} ms   ({len(visible):,} visible)")
+    print(f"  ray pick       {scene_pick * 1000:8.3f} ms")
+    print(f"  lasso          {lasso_time * 1000:8.3f} ms   ({len(selected):,} selected)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="BVH picking, lasso and culling cost on million-triangle scenes")
+    parser.add_argument("--triangles", type=int, default=1_000_000)
+    parser.add_argument("--objects", type=int, default=1000)
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=480)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+    run(args.triangles, args.objects, args.width, args.height, args.repeat)
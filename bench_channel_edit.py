@@ -0,0 +1,77 @@
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from gks_journal import SceneJournal
+from scene_graph import SceneGraph, parse_channel_edit
+
+
+def make_scene(node_count, fanout):
+    """Groups of fanout children under their own root"""
+    parents = np.where(np.arange(node_count) % (fanout + 1) == 0, -1,
+                       np.arange(node_count) // (fanout + 1) * (fanout + 1))
+    scene = SceneGraph(capacity=node_count)
+    scene.add_nodes([f"node{i}" for i in range(node_count)], ['Transform'] * node_count, parents)
+    return scene
+
+
+def batched_edit(scene, nodes, text):
+    """The channel box path: one parse, one array write, one world update, one journal record"""
+    operator, value = parse_channel_edit(text)
+    scene.edit_channel(nodes, 'translate', 1, operator, value)
+    scene.update_world()
+    return [(nodes, 'translate', scene.translate[nodes])]
+
+
+def looped_edit(scene, nodes, text):
+    """What editing each selected node in turn costs: a write, world update and record per node"""
+    records = []
+    for index in nodes.tolist():
+        operator, value = parse_channel_edit(text)
+        vector = scene.translate[index].copy()
+        vector[1] = value if operator == '=' else vector[1] + value
+        scene.set_node_attribute(index, 'translate', vector.tolist())
+        scene.update_world()
+        records.append((index, 'translate', vector.tolist()))
+    return records
+
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def run(node_count, fanout, loop_limit, edits):
+    scene = make_scene(node_count, fanout)
+    nodes = np.arange(node_count)
+    print(f"{node_count:,} selected nodes")
+    with tempfile.TemporaryDirectory() as folder:
+        journal = SceneJournal(os.path.join(folder, "bench.gks"))
+        for text in edits:
+            records, edit = timed(lambda: batched_edit(scene, nodes, text))
+            written, save = timed(lambda: journal.append(attributes=records))
+            print(f"  {text!r:8} edit {edit:8.2f} ms, journal {save:7.2f} ms ({written:,} bytes, 1 record)")
+
+        count = min(node_count, loop_limit)
+        records, edit = timed(lambda: looped_edit(scene, nodes[:count], edits[-1]))
+        journal.remove()
+        written, save = timed(lambda: journal.append(attributes=records))
+        scale = node_count / count
+        print(f"per-node loop, first {count:,} nodes")
+        print(f"  {edits[-1]!r:8} edit {edit:8.2f} ms, journal {save:7.2f} ms ({written:,} bytes, {count:,} records)")
+        print(f"  ~{edit * scale / 1000:.1f} s and ~{save * scale / 1000:.1f} s for all {node_count:,}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Latency of one channel box edit applied to a large selection")
+    parser.add_argument("--nodes", type=int, default=50_000)
+    parser.add_argument("--fanout", type=int, default=99)
+    parser.add_argument("--loop-limit", type=int, default=2000,
+                        help="edit at most this many nodes one at a time for the baseline")
+    parser.add_argument("--edits", nargs='+', default=['5', '+=1', '*=2', '-=0.5'])
+    args = parser.parse_args()
+    run(args.nodes, args.fanout, args.loop_limit, args.edits)
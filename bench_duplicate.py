@@ -0,0 +1,91 @@
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from gks_format import save_scene
+from primitives import sphere_mesh, triangulate
+from scene_graph import SceneGraph
+
+
+def make_mesh(triangles):
+    """A sphere tessellated to about the requested triangle count"""
+    resolution = int(np.sqrt(triangles / 2)) + 1
+    vertices, quads = sphere_mesh(resolution)
+    return {'vertices': vertices, 'indices': triangulate(vertices, quads).astype(np.int32)}
+
+
+def share_record(records, scene, source, copy):
+    """What the app's Duplicate does per node: a new record pointing at the same arrays"""
+    node = records[source]
+    for array in node['arrays'].values():
+        array.flags.writeable = False
+    return dict(node, name=scene.names[copy], parent=int(scene.parent[copy]),
+                attributes=dict(node['attributes']), instance=node.get('instance', source))
+
+
+def deep_record(records, scene, source, copy):
+    """Duplicating without sharing: every copy gets its own buffers"""
+    node = records[source]
+    return dict(node, name=scene.names[copy], parent=int(scene.parent[copy]),
+                attributes=dict(node['attributes']),
+                arrays={kind: array.copy() for kind, array in node['arrays'].items()})
+
+
+def duplicate(mesh, copies, make_record):
+    """Duplicate one mesh node copies times, as pressing Ctrl+D repeatedly does"""
+    scene = SceneGraph()
+    scene.add_node("mesh1", 'Polygon')
+    records = [{'name': "mesh1", 'type': 'Polygon', 'parent': -1, 'attributes': {},
+                'arrays': {kind: array.copy() for kind, array in mesh.items()}}]
+    for _ in range(copies):
+        sources, created = scene.duplicate([0])
+        for source, copy in zip(sources.tolist(), created.tolist()):
+            records.append(make_record(records, scene, source, copy))
+    return records
+
+
+def run(triangles, copies, deep_limit):
+    mesh = make_mesh(triangles)
+    mesh_bytes = sum(array.nbytes for array in mesh.values())
+    print(f"mesh: {len(mesh['indices']):,} triangles, {mesh_bytes / 1e6:.1f} MB of buffers")
+
+    for label, make_record, count in (("copy-on-write", share_record, copies),
+                                      ("deep copy", deep_record, min(copies, deep_limit))):
+        start = time.perf_counter()
+        duplicate(mesh, count, make_record)
+        elapsed = time.perf_counter() - start
+        # Measured in a second run, since tracing slows everything down
+        tracemalloc.start()
+        baseline = tracemalloc.get_traced_memory()[0]
+        records = duplicate(mesh, count, make_record)
+        grown = tracemalloc.get_traced_memory()[0] - baseline - mesh_bytes
+        tracemalloc.stop()
+        print(f"{label:14} {count:5} duplicates in {elapsed * 1000:8.1f} ms, "
+              f"+{grown / 1e6:9.2f} MB ({grown / count / 1024:8.1f} KB each)")
+
+        if make_record is share_record:
+            buffers = {array.__array_interface__['data'][0]
+                       for record in records for array in record['arrays'].values()}
+            print(f"  distinct buffers {len(buffers)}; "
+                  f"{count} deep copies would add {count * mesh_bytes / 1e9:.1f} GB")
+            with tempfile.TemporaryDirectory() as folder:
+                path = os.path.join(folder, "bench.gks")
+                start = time.perf_counter()
+                save_scene(path, records)
+                elapsed = time.perf_counter() - start
+                print(f"  saved {len(records)} nodes to {os.path.getsize(path) / 1e6:.1f} MB "
+                      f"in {elapsed * 1000:.0f} ms (shared chunks written once)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Memory and time of duplicating a large mesh many times")
+    parser.add_argument("--triangles", type=int, default=1_000_000)
+    parser.add_argument("--copies", type=int, default=1000)
+    parser.add_argument("--deep-limit", type=int, default=20,
+                        help="make at most this many deep copies for the baseline")
+    args = parser.parse_args()
+    run(args.triangles, args.copies, args.deep_limit)
@@ -0,0 +1,59 @@
+import argparse
+import time
+
+import numpy as np
+
+from bench_keyframes import make_store
+from frame_evaluator import FrameEvaluator
+
+
+def run(curve_count, keys_per_curve, frame_range, samples):
+    scene, store = make_store(curve_count, keys_per_curve, frame_range)
+    store.pack()
+    scene.update_world()
+    frames = np.random.default_rng(1).integers(1, frame_range, samples)
+
+    # Synchronous: the UI thread evaluates curves and matrices itself
+    start = time.perf_counter()
+    for frame in frames:
+        store.apply(scene, frame)
+        scene.update_world()
+    synchronous = (time.perf_counter() - start) / samples
+
+    # Threaded: the UI thread only posts requests and applies finished buffers
+    evaluator = FrameEvaluator()
+    evaluator.sync(scene, store)
+    ui_time = []
+    latency = []
+    for frame in frames:
+        posted = time.perf_counter()
+        evaluator.request(frame)
+        ui = time.perf_counter() - posted
+        result = None
+        while result is None:
+            time.sleep(0.0005)
+            check = time.perf_counter()
+            result = evaluator.take(frame)
+            ui += time.perf_counter() - check
+        check = time.perf_counter()
+        evaluator.apply(result, scene)
+        done = time.perf_counter()
+        ui_time.append(ui + done - check)
+        latency.append(done - posted)
+    evaluator.close()
+
+    print(f"{curve_count:,} curves on {len(scene):,} nodes, {samples} scrubbed frames")
+    print(f"  synchronous update_frame  {synchronous * 1000:8.2f} ms on the UI thread")
+    print(f"  evaluator thread          {np.mean(ui_time) * 1000:8.2f} ms on the UI thread "
+          f"(max {np.max(ui_time) * 1000:.2f})")
+    print(f"  request to applied pose   {np.mean(latency) * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="UI thread cost of posing frames with and without the evaluator thread")
+    parser.add_argument("--curves", type=int, default=50_000)
+    parser.add_argument("--keys", type=int, default=8)
+    parser.add_argument("--frames", type=int, default=100)
+    parser.add_argument("--samples", type=int, default=100)
+    args = parser.parse_args()
+    run(args.curves, args.keys, args.frames, args.samples)
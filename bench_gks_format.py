@@ -0,0 +1,83 @@
+import argparse
+import json
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from gks_format import load_scene, save_scene
+
+
+def make_scene(total_vertices, node_count):
+    """Build synthetic mesh nodes with vertex, index and keyframe arrays"""
+    rng = np.random.default_rng(0)
+    per_node = max(3, total_vertices // node_count)
+    nodes = []
+    for i in range(node_count):
+        vertices = rng.random((per_node, 3), dtype=np.float32)
+        indices = rng.integers(0, per_node, size=(per_node * 2, 3), dtype=np.int32)
+        nodes.append({
+            'name': f"pMesh{i + 1}",
+            'type': 'Polygon',
+            'parent': -1,
+            'attributes': {'visibility': True},
+            'arrays': {
+                'vertices': vertices,
+                'indices': indices,
+                'key_times': np.arange(1, 101, dtype=np.float32),
+                'key_values': rng.random((100, 9), dtype=np.float32),
+            },
+        })
+    return nodes
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def run(total_vertices, node_count):
+    nodes = make_scene(total_vertices, node_count)
+    with tempfile.TemporaryDirectory() as tmp:
+        gks_path = os.path.join(tmp, "scene.gks")
+        json_path = os.path.join(tmp, "scene.json")
+
+        _, gks_save = timed(lambda: save_scene(gks_path, nodes))
+        scene_file, gks_open = timed(lambda: load_scene(gks_path))
+        _, gks_touch = timed(lambda: float(scene_file.array(node_count // 2, 'vertices').sum()))
+        scene_file.close()
+
+        def dump_json():
+            payload = [
+                dict(node, arrays={k: v.tolist() for k, v in node['arrays'].items()})
+                for node in nodes
+            ]
+            with open(json_path, "w") as f:
+                json.dump(payload, f)
+
+        def load_json():
+            with open(json_path) as f:
+                payload = json.load(f)
+            return [{k: np.asarray(v) for k, v in node['arrays'].items()} for node in payload]
+
+        _, json_save = timed(dump_json)
+        _, json_open = timed(load_json)
+
+        gks_size = os.path.getsize(gks_path)
+        json_size = os.path.getsize(json_path)
+
+    print(f"{total_vertices:,} vertices in {node_count} nodes")
+    print(f"{'':8}{'save (s)':>12}{'open (s)':>12}{'size (MB)':>12}")
+    print(f"{'gks':8}{gks_save:12.3f}{gks_open:12.4f}{gks_size / 1e6:12.1f}")
+    print(f"{'json':8}{json_save:12.3f}{json_open:12.4f}{json_size / 1e6:12.1f}")
+    print(f"gks first touch of one node: {gks_touch * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare .gks against a naive JSON dump")
+    parser.add_argument("--vertices", type=int, default=2_000_000)
+    parser.add_argument("--nodes", type=int, default=100)
+    args = parser.parse_args()
+    run(args.vertices, args.nodes)
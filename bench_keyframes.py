@@ -0,0 +1,60 @@
+import argparse
+import time
+
+import numpy as np
+
+from animation import BEZIER, KeyframeStore
+from scene_graph import CHANNELS, SceneGraph
+
+
+def make_store(curve_count, keys_per_curve, frame_range):
+    """Key curve_count channels spread over enough nodes to hold them"""
+    rng = np.random.default_rng(0)
+    node_count = -(-curve_count // len(CHANNELS))
+    scene = SceneGraph(capacity=node_count)
+    scene.add_nodes([f"node{i}" for i in range(node_count)], ['Transform'] * node_count,
+                    np.full(node_count, -1))
+    store = KeyframeStore()
+    for c in range(curve_count):
+        _, column, component = CHANNELS[c % len(CHANNELS)]
+        frames = rng.choice(frame_range, keys_per_curve, replace=False) + 1.0
+        store.set_curve(c // len(CHANNELS), column, component, frames, rng.random(keys_per_curve), BEZIER)
+    return scene, store
+
+
+def run(curve_count, keys_per_curve, frame_range, samples):
+    start = time.perf_counter()
+    scene, store = make_store(curve_count, keys_per_curve, frame_range)
+    build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    store.pack()
+    pack = time.perf_counter() - start
+
+    frames = np.random.default_rng(1).uniform(1, frame_range, samples)
+    start = time.perf_counter()
+    for frame in frames:
+        store.evaluate(frame)
+    evaluate = (time.perf_counter() - start) / samples
+
+    start = time.perf_counter()
+    for frame in frames:
+        store.apply(scene, frame)
+        scene.update_world()
+    scrub = (time.perf_counter() - start) / samples
+
+    print(f"{curve_count:,} curves x {keys_per_curve} keys ({len(scene)} nodes)")
+    print(f"  keying         {build:8.2f} s")
+    print(f"  pack           {pack * 1000:8.2f} ms (once per edit)")
+    print(f"  evaluate       {evaluate * 1000:8.2f} ms per frame")
+    print(f"  scrub + xforms {scrub * 1000:8.2f} ms per frame")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time vectorized keyframe evaluation while scrubbing")
+    parser.add_argument("--curves", type=int, default=50_000)
+    parser.add_argument("--keys", type=int, default=8)
+    parser.add_argument("--frames", type=int, default=100)
+    parser.add_argument("--samples", type=int, default=200)
+    args = parser.parse_args()
+    run(args.curves, args.keys, args.frames, args.samples)
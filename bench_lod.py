@@ -0,0 +1,62 @@
+import argparse
+import time
+
+import numpy as np
+
+from lod import LODMesh, build_lods, lod_level, screen_diameters
+from primitives import sphere_mesh, translation_matrix, triangulate
+from rasterizer import CAMERAS, Rasterizer, camera_matrices
+
+
+def draw(rasterizer, lod, models, view, projection, use_lod):
+    """Draw every instance, at its selected level or at full detail"""
+    rasterizer.clear()
+    if use_lod:
+        levels = lod.select(screen_diameters(lod.bounds, models, view, projection, rasterizer.height))
+    else:
+        levels = np.zeros(len(models), dtype=np.int64)
+    for level in np.unique(levels).tolist():
+        vertices, indices = lod.mesh(level)
+        rasterizer.draw_mesh(vertices, indices, models[levels == level], view, projection)
+    return levels
+
+
+def run(resolution, count, width, height, frames):
+    vertices, quads = sphere_mesh(resolution)
+    vertices = vertices.astype(np.float32)
+    indices = triangulate(vertices, quads)
+    start = time.perf_counter()
+    arrays = build_lods(vertices, indices)
+    decimate = time.perf_counter() - start
+    lod = LODMesh(arrays['lod_bounds'], arrays['lod_levels'][:, 2],
+                  lambda level: (vertices, indices) if level == 0 else lod_level(arrays, level - 1))
+
+    # Instances recede from the perspective camera, fanning out to the right
+    view, projection = camera_matrices('perspective', width / height)
+    eye = np.array(CAMERAS['perspective']['eye'])
+    forward, right = -view[2, :3], view[0, :3]
+    models = np.stack([translation_matrix(eye + (forward + 0.3 * right) * 4 * 1.6 ** i) for i in range(count)])
+    rasterizer = Rasterizer(width, height)
+
+    print(f"{count} meshes of {len(indices):,} triangles at {width}x{height}; "
+          f"decimated once in {decimate * 1000:.0f} ms")
+    print("  levels " + ", ".join(f"{int(cells)} cells: {end - begin:,} tris" for (_, end, cells), begin
+                                 in zip(arrays['lod_levels'], np.concatenate([[0], arrays['lod_levels'][:-1, 1]]))))
+    print(f"{'':>8}{'triangles':>12}{'ms/frame':>10}  level per instance, nearest first")
+    for label, use_lod in (("full", False), ("lod", True)):
+        start = time.perf_counter()
+        for _ in range(frames):
+            levels = draw(rasterizer, lod, models, view, projection, use_lod)
+        elapsed = (time.perf_counter() - start) / frames
+        print(f"{label:>8}{rasterizer.triangles:>12,}{elapsed * 1000:10.1f}  {levels.tolist()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Triangles drawn with and without screen-size LOD selection")
+    parser.add_argument("--resolution", type=int, default=256)
+    parser.add_argument("--count", type=int, default=8)
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=480)
+    parser.add_argument("--frames", type=int, default=3)
+    args = parser.parse_args()
+    run(args.resolution, args.count, args.width, args.height, args.frames)
@@ -0,0 +1,84 @@
+import argparse
+import time
+
+import numpy as np
+
+from poly_mesh import PolyMesh, bevel, bridge, extrude, multi_cut
+from primitives import plane_mesh
+
+
+def make_grid(faces):
+    """A plane of about the requested number of quads"""
+    vertices, quads = plane_mesh(int(np.sqrt(faces)))
+    return PolyMesh.from_faces(vertices, quads)
+
+
+def make_slabs(faces):
+    """Two grids facing each other, one unit apart, for bridging face to face"""
+    vertices, quads = plane_mesh(int(np.sqrt(faces)))
+    top = vertices + [0.0, 1.0, 0.0]
+    return PolyMesh.from_faces(np.concatenate([vertices, top]),
+                               np.concatenate([quads, quads[:, ::-1] + len(vertices)]))
+
+
+def looped_extrude(mesh, faces, distance):
+    """What extruding one face at a time costs: a normal, new corners and walls per face"""
+    vertices = mesh.vertices.tolist()
+    corners = [mesh.corners[mesh.offsets[f]:mesh.offsets[f + 1]].tolist() for f in range(len(mesh))]
+    for f in faces:
+        ring = corners[f]
+        points = np.array([vertices[v] for v in ring])
+        normal = np.cross(points[1] - points[0], points[2] - points[0])
+        normal /= np.linalg.norm(normal)
+        moved = []
+        for point in points + normal * distance:
+            moved.append(len(vertices))
+            vertices.append(point.tolist())
+        for i in range(len(ring)):
+            j = (i + 1) % len(ring)
+            corners.append([ring[i], ring[j], moved[j], moved[i]])
+        corners[f] = moved
+    return vertices, corners
+
+
+def timed(function, repeat):
+    best = np.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    return result, best * 1000
+
+
+def run(faces, loop_limit, repeat):
+    grid = make_grid(faces)
+    every = np.arange(len(grid))
+    print(f"grid: {len(grid):,} quads, {len(grid.vertices):,} vertices")
+    cases = [
+        ("extrude together", lambda: extrude(grid, every, 0.1)),
+        ("extrude separate", lambda: extrude(grid, every, 0.1, together=False)),
+        ("bevel", lambda: bevel(grid, every, 0.2)),
+        ("multi-cut", lambda: multi_cut(grid, every, [0.013, 0.0, 0.0], [1.0, 0.0, 0.3])),
+    ]
+    slabs = make_slabs(faces)
+    half = len(slabs) // 2
+    cases.append(("bridge", lambda: bridge(slabs, np.arange(half), np.arange(half, 2 * half))))
+    for label, function in cases:
+        result, elapsed = timed(function, repeat)
+        print(f"  {label:17} {elapsed:8.1f} ms -> {len(result):,} faces")
+    print(f"  (bridge joins {half:,} face pairs of two facing grids)")
+
+    count = min(loop_limit, len(grid))
+    _, elapsed = timed(lambda: looped_extrude(grid, range(count), 0.1), 1)
+    print(f"per-face loop, first {count:,} faces: {elapsed:.1f} ms, "
+          f"~{elapsed * len(grid) / count / 1000:.1f} s for all {len(grid):,}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Batched polygon modeling operators on large face selections")
+    parser.add_argument("--faces", type=int, default=100_000)
+    parser.add_argument("--loop-limit", type=int, default=10_000,
+                        help="extrude at most this many faces one at a time for the baseline")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    run(args.faces, args.loop_limit, args.repeat)
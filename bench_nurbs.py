@@ -0,0 +1,61 @@
+import argparse
+import time
+
+import numpy as np
+
+from nurbs import NurbsCurve, loft, revolve
+
+
+def timed(function, repeat=3):
+    """Return the best wall time of a few calls, in milliseconds"""
+    best = np.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def run_curve(samples, loop_samples):
+    curve = NurbsCurve(np.random.default_rng(0).random((64, 3)))
+    u = np.linspace(0, 1, samples)
+    batched = timed(lambda: curve.evaluate(u))
+    loop = timed(lambda: [curve.evaluate([t]) for t in u[:loop_samples]], repeat=1) * samples / loop_samples
+    print(f"curve of 64 CVs, {samples:,} parameters")
+    print(f"  per-parameter loop {loop:10.1f} ms (extrapolated from {loop_samples:,})")
+    print(f"  vectorized         {batched:10.1f} ms ({loop / batched:.0f}x)")
+
+
+def run_surface(size):
+    profile = NurbsCurve([(0.6, 0, 0), (1.0, 0.4, 0), (0.5, 1.2, 0), (0.7, 1.8, 0), (0.4, 2.2, 0)])
+    surfaces = {
+        "revolve": revolve(profile),
+        "loft": loft([NurbsCurve.circle(r, (0, h, 0)) for r, h in ((1, 0), (0.6, 0.7), (0.9, 1.4), (0.4, 2.1))]),
+    }
+    u = np.linspace(0, 1, size)
+    for label, surface in surfaces.items():
+        grid = timed(lambda: surface.evaluate(u, u))
+        print(f"{label}: {size} x {size} grid in {grid:.1f} ms ({size * size / grid / 1000:.1f} M points/s)")
+        lod = surface.lod()
+        for level in range(len(lod)):
+            start = time.perf_counter()
+            vertices, triangles = lod.mesh(level)
+            cold = (time.perf_counter() - start) * 1000
+            cached = timed(lambda: lod.mesh(level))
+            print(f"  level {level}: {len(triangles):7,} triangles, tessellated {cold:7.2f} ms, cached {cached:.4f} ms")
+
+        # A moved control point drops the cached tessellations; the next draw redoes only what it asks for
+        surface.set_control_point(2, 2, surface.control[2, 2] * 1.2)
+        start = time.perf_counter()
+        surface.lod().mesh(0)
+        print(f"  after moving a CV: level 0 re-tessellated in {(time.perf_counter() - start) * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="NURBS evaluation and tessellation throughput")
+    parser.add_argument("--samples", type=int, default=1_000_000)
+    parser.add_argument("--loop-samples", type=int, default=5_000)
+    parser.add_argument("--grid", type=int, default=512)
+    args = parser.parse_args()
+    run_curve(args.samples, args.loop_samples)
+    run_surface(args.grid)
@@ -0,0 +1,91 @@
+import argparse
+import time
+import tkinter as tk
+from tkinter import ttk
+
+import numpy as np
+
+from outliner import OutlinerModel, VirtualOutliner
+from scene_graph import SceneGraph
+
+
+def make_scene(node_count, fanout):
+    """Roots with fanout children each, the children with fanout children, until node_count"""
+    parents = np.full(node_count, -1)
+    roots = max(1, node_count // (fanout * fanout + fanout + 1))
+    parents[roots:] = np.arange(node_count - roots) // fanout
+    scene = SceneGraph(capacity=node_count)
+    scene.add_nodes([f"node{i}" for i in range(node_count)], ['Transform'] * node_count, parents)
+    return scene
+
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def run_model(scene):
+    model, populate = timed(lambda: OutlinerModel(scene))
+    roots = len(model)
+    _, expand = timed(lambda: model.expand(int(model.rows[0])))
+    _, collapse = timed(lambda: model.collapse(int(model.rows[0])))
+    deepest = int(np.argmax(scene.depth[:scene.count]))
+    _, reveal = timed(lambda: model.reveal(deepest))
+    _, rebuild = timed(lambda: model.set_scene(scene))
+    print(f"model, {scene.count:,} nodes ({roots:,} roots)")
+    print(f"  populate         {populate:8.2f} ms")
+    print(f"  open first root  {expand:8.2f} ms")
+    print(f"  close it again   {collapse:8.2f} ms")
+    print(f"  reveal deepest   {reveal:8.2f} ms")
+    print(f"  refresh          {rebuild:8.2f} ms")
+
+
+def run_widgets(scene, treeview_limit, scrolls):
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"widgets skipped: {e}")
+        return
+    root.geometry("300x600")
+
+    outliner = VirtualOutliner(root)
+    outliner.pack(fill=tk.BOTH, expand=True)
+    root.update()
+    _, populate = timed(lambda: (outliner.set_scene(scene), root.update()))
+    start = time.perf_counter()
+    for _ in range(scrolls):
+        outliner.scroll(1, outliner.visible_rows() - 1)
+        root.update()
+    scroll = (time.perf_counter() - start) * 1000 / scrolls
+    print(f"virtual outliner, {scene.count:,} nodes")
+    print(f"  populate         {populate:8.2f} ms ({len(outliner.pool)} row items)")
+    print(f"  scroll a page    {scroll:8.2f} ms")
+    outliner.destroy()
+
+    # Every node inserted up front, as the outliners did before
+    count = min(scene.count, treeview_limit)
+    tree = ttk.Treeview(root, show='tree')
+    tree.pack(fill=tk.BOTH, expand=True)
+    start = time.perf_counter()
+    for index in range(count):
+        parent = scene.parent[index]
+        tree.insert('' if parent < 0 else str(parent), 'end', iid=str(index), text=scene.names[index])
+    root.update()
+    populate = (time.perf_counter() - start) * 1000
+    print(f"ttk.Treeview, first {count:,} nodes")
+    print(f"  populate         {populate:8.2f} ms (~{populate * scene.count / count / 1000:.1f} s for all)")
+    root.destroy()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Populate and browse a large hierarchy in the outliner")
+    parser.add_argument("--nodes", type=int, default=250_000)
+    parser.add_argument("--fanout", type=int, default=50)
+    parser.add_argument("--treeview-limit", type=int, default=50_000,
+                        help="insert at most this many nodes into the Treeview baseline")
+    parser.add_argument("--scrolls", type=int, default=100)
+    args = parser.parse_args()
+    scene = make_scene(args.nodes, args.fanout)
+    run_model(scene)
+    run_widgets(scene, args.treeview_limit, args.scrolls)
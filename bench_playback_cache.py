@@ -0,0 +1,62 @@
+import argparse
+import time
+
+import numpy as np
+
+from bench_keyframes import make_store
+from playback_cache import PlaybackCache
+
+
+def fill(cache, scene, store, frame_range):
+    start = time.perf_counter()
+    cache.update(scene, store, 1, frame_range)
+    while cache.poll():
+        time.sleep(0.005)
+    return time.perf_counter() - start
+
+
+def run(curve_count, keys_per_curve, frame_range, workers):
+    scene, store = make_store(curve_count, keys_per_curve, frame_range)
+    store.pack()
+    scene.update_world()
+    frames = np.arange(1, frame_range + 1)
+
+    start = time.perf_counter()
+    for frame in frames:
+        store.apply(scene, frame)
+        scene.update_world()
+    live = (time.perf_counter() - start) / len(frames)
+
+    print(f"{curve_count:,} curves on {len(scene):,} nodes, frames 1-{frame_range}")
+    print(f"  live evaluation        {live * 1000:8.2f} ms per frame")
+    for count in workers:
+        cache = PlaybackCache(workers=count)
+        first = fill(cache, scene, store, frame_range)
+
+        start = time.perf_counter()
+        for frame in frames:
+            cache.apply(frame, scene)
+        lookup = (time.perf_counter() - start) / len(frames)
+
+        # One key edit on one node only re-evaluates that node near the key
+        node = len(scene) // 2
+        store.set_key(node, 'translate', 0, frame_range / 2, 1.0)
+        cache.invalidate(scene, [node], *store.influence(node, 'translate', 0, frame_range / 2))
+        stale = int(np.count_nonzero(cache.stale.any(axis=1)))
+        refill = fill(cache, scene, store, frame_range)
+        size = cache.nbytes()
+        cache.close()
+
+        label = f"{count} processes" if count else "in process"
+        print(f"  {label:<14} fill {first:6.2f} s, lookup {lookup * 1000:6.2f} ms per frame, "
+              f"edit refill {refill * 1000:7.1f} ms for {stale} frames, {size / 2**20:.0f} MB shared")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fill, lookup and edit-refill cost of the shared-memory playback cache")
+    parser.add_argument("--curves", type=int, default=50_000)
+    parser.add_argument("--keys", type=int, default=8)
+    parser.add_argument("--frames", type=int, default=100)
+    parser.add_argument("--workers", type=int, nargs="+", default=[0, 2, 4])
+    args = parser.parse_args()
+    run(args.curves, args.keys, args.frames, args.workers)
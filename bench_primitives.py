@@ -0,0 +1,62 @@
+import argparse
+import time
+
+import numpy as np
+
+from primitives import PrimitiveLibrary, sphere_mesh, translation_matrix, triangulate
+from rasterizer import Rasterizer, camera_matrices
+
+
+def grid_transforms(count, spacing=2.5):
+    """Return count translation matrices laid out on a square XZ grid"""
+    side = int(np.ceil(np.sqrt(count)))
+    return np.stack([translation_matrix((spacing * (i % side - side / 2), 0.0, spacing * (i // side - side / 2)))
+                     for i in range(count)])
+
+
+def run(count, resolution, width, height):
+    transforms = grid_transforms(count)
+
+    # Previous behaviour: every object tessellates and owns its own sphere
+    start = time.perf_counter()
+    owned = []
+    for matrix in transforms:
+        vertices, quads = sphere_mesh(resolution)
+        owned.append((vertices + matrix[:3, 3], quads, triangulate(vertices, quads)))
+    legacy = time.perf_counter() - start
+    legacy_bytes = sum(array.nbytes for mesh in owned for array in mesh)
+
+    start = time.perf_counter()
+    library = PrimitiveLibrary()
+    instances = []
+    for matrix in transforms:
+        library.mesh('sphere', resolution)
+        instances.append(matrix)
+    models = np.stack(instances)
+    shared = time.perf_counter() - start
+    shared_bytes = library.nbytes() + models.nbytes
+
+    vertices, _, triangles = library.mesh('sphere', resolution)
+    view, projection = camera_matrices('perspective', width / height)
+    # Pull the camera back far enough to frame the whole grid
+    view = view @ np.diag([0.25, 0.25, 0.25, 1.0])
+    rasterizer = Rasterizer(width, height)
+    start = time.perf_counter()
+    rasterizer.draw_mesh(vertices, triangles, models, view, projection)
+    draw = time.perf_counter() - start
+
+    print(f"{count:,} spheres at resolution {resolution} ({len(triangles):,} triangles each)")
+    print(f"  tessellations  {len(owned):>8,} owned   {library.builds:>8,} shared")
+    print(f"  create         {legacy * 1000:8.1f} ms     {shared * 1000:8.1f} ms")
+    print(f"  memory         {legacy_bytes / 2**20:8.1f} MiB    {shared_bytes / 2**20:8.2f} MiB")
+    print(f"  instanced draw {draw * 1000:8.1f} ms for {rasterizer.triangles:,} triangles at {width}x{height}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cost of many sphere instances sharing one tessellation")
+    parser.add_argument("--count", type=int, default=1000)
+    parser.add_argument("--resolution", type=int, default=32)
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=480)
+    args = parser.parse_args()
+    run(args.count, args.resolution, args.width, args.height)
@@ -0,0 +1,60 @@
+import argparse
+import time
+
+import numpy as np
+
+from rasterizer import SHADED, TEXTURED, WIREFRAME, Rasterizer, camera_matrices
+
+
+def uv_sphere(segments, rings):
+    """Return (vertices, indices) of a unit UV sphere with 2 * segments * (rings - 1) triangles"""
+    theta = np.linspace(0, np.pi, rings + 1)
+    phi = np.linspace(0, 2 * np.pi, segments, endpoint=False)
+    t, p = np.meshgrid(theta, phi, indexing='ij')
+    vertices = np.stack([np.sin(t) * np.cos(p), np.cos(t), np.sin(t) * np.sin(p)], axis=-1).reshape(-1, 3)
+    r, s = np.meshgrid(np.arange(rings), np.arange(segments), indexing='ij')
+    a = r * segments + s
+    b = r * segments + (s + 1) % segments
+    c, d = a + segments, b + segments
+    indices = np.concatenate([np.stack([a, c, b], -1)[1:], np.stack([b, c, d], -1)[:-1]]).reshape(-1, 3)
+    return vertices, indices
+
+
+def make_scene(triangles, spheres=64):
+    """Merge a grid of spheres into one mesh with about the given triangle count"""
+    per_sphere = max(8, triangles // spheres)
+    rings = max(2, int(np.sqrt(per_sphere / 4)))
+    segments = max(3, per_sphere // (2 * (rings - 1)))
+    vertices, indices = uv_sphere(segments, rings)
+    side = int(np.ceil(np.sqrt(spheres)))
+    offsets = [(3 * (i % side - side / 2), 0.0, 3 * (i // side - side / 2)) for i in range(spheres)]
+    all_vertices = np.concatenate([vertices + offset for offset in offsets])
+    all_indices = np.concatenate([indices + k * len(vertices) for k in range(spheres)])
+    return all_vertices, all_indices
+
+
+def run(sizes, width, height, frames):
+    view, projection = camera_matrices('perspective', width / height)
+    rasterizer = Rasterizer(width, height)
+    print(f"{width}x{height}, mean of {frames} frames")
+    print(f"{'triangles':>12}{'mode':>11}{'ms/frame':>10}{'fps':>8}{'pixels':>10}")
+    for size in sizes:
+        vertices, indices = make_scene(size)
+        for mode in (WIREFRAME, SHADED, TEXTURED):
+            start = time.perf_counter()
+            for _ in range(frames):
+                rasterizer.clear()
+                rasterizer.draw_mesh(vertices, indices, np.eye(4), view, projection, mode)
+                rasterizer.ppm()
+            elapsed = (time.perf_counter() - start) / frames
+            print(f"{len(indices):>12,}{mode:>11}{elapsed * 1000:10.1f}{1 / elapsed:8.1f}{rasterizer.pixels:>10,}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Software rasterizer frame rate by triangle count and display mode")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--width", type=int, default=960)
+    parser.add_argument("--height", type=int, default=540)
+    parser.add_argument("--frames", type=int, default=5)
+    args = parser.parse_args()
+    run(args.sizes, args.width, args.height, args.frames)
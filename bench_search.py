@@ -0,0 +1,77 @@
+import argparse
+import time
+
+import numpy as np
+
+from name_index import NameIndex
+
+BASES = ['pCube', 'pSphere', 'pPlane', 'joint', 'spine', 'locator', 'camera', 'light',
+         'nurbsCurve', 'group', 'ctrl_arm_L', 'ctrl_arm_R']
+TYPES = ['Polygon', 'Joint', 'Transform', 'Light', 'Camera']
+
+
+def make_names(count, seed=0):
+    rng = np.random.default_rng(seed)
+    bases = rng.integers(len(BASES), size=count)
+    types = rng.integers(len(TYPES), size=count)
+    return ([f"{BASES[b]}{i}" for i, b in enumerate(bases.tolist())],
+            [TYPES[t] for t in types.tolist()])
+
+
+def scan(names, types, text):
+    """What a search box without an index does: test every name"""
+    text = text.lower()
+    return [i for i, (name, node_type) in enumerate(zip(names, types))
+            if text in name.lower() or text in node_type.lower()]
+
+
+def run(count, words, edits):
+    names, types = make_names(count)
+    start = time.perf_counter()
+    index = NameIndex(names, types)
+    build = time.perf_counter() - start
+    print(f"{count:,} names, {len(index.codes):,} postings")
+    print(f"  build            {build * 1000:9.1f} ms")
+
+    # Typing each word one keystroke at a time, then deleting it again
+    times = []
+    for word in words:
+        typed = [word[:k] for k in range(1, len(word) + 1)]
+        for text in typed + typed[-2::-1]:
+            start = time.perf_counter()
+            matches = index.search(text)
+            times.append(time.perf_counter() - start)
+            if text == word:
+                print(f"  {word!r:16} {len(matches):9,} matches")
+    times = np.array(times) * 1000
+    print(f"  keystroke        {times.mean():9.2f} ms mean, {times.max():.2f} ms worst over {len(times)}")
+
+    start = time.perf_counter()
+    scan(names, types, words[0][:3])
+    print(f"  unindexed scan   {(time.perf_counter() - start) * 1000:9.1f} ms per keystroke")
+
+    # Incremental upkeep between searches
+    rng = np.random.default_rng(1)
+    start = time.perf_counter()
+    for node in rng.integers(count, size=edits).tolist():
+        index.rename(node, f"renamed{node}")
+    rename = (time.perf_counter() - start) / edits
+    start = time.perf_counter()
+    for number in range(edits):
+        index.add([f"added{number}"], ['Transform'])
+    add = (time.perf_counter() - start) / edits
+    start = time.perf_counter()
+    matches = index.search("renamed1")
+    pending = time.perf_counter() - start
+    print(f"  rename           {rename * 1e6:9.1f} us each ({edits:,} edits, rebuilds amortized)")
+    print(f"  add              {add * 1e6:9.1f} us each")
+    print(f"  search with {len(index.pending):,} pending {pending * 1000:6.2f} ms ({len(matches):,} matches)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Per-keystroke cost of the outliner search index")
+    parser.add_argument("--nodes", type=int, default=1_000_000)
+    parser.add_argument("--words", nargs='+', default=['joint12345', 'ctrl_arm_l9', 'light', 'cube77'])
+    parser.add_argument("--edits", type=int, default=2000)
+    args = parser.parse_args()
+    run(args.nodes, args.words, args.edits)
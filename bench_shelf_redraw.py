@@ -0,0 +1,65 @@
+import argparse
+import importlib
+import time
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from primitives import translation_matrix
+
+shelf = importlib.import_module("3_shelf")
+
+
+def legacy_redraw(object_count):
+    """The previous redraw_viewport: a new figure with every sphere re-tessellated"""
+    figure = Figure(figsize=(5, 5), dpi=100)
+    ax = figure.add_subplot(111, projection='3d')
+    canvas = FigureCanvasAgg(figure)
+    u = np.linspace(0, 2 * np.pi, 100)
+    v = np.linspace(0, np.pi, 100)
+    for _ in range(object_count):
+        x = np.outer(np.cos(u), np.sin(v))
+        y = np.outer(np.sin(u), np.sin(v))
+        z = np.outer(np.ones(np.size(u)), np.cos(v))
+        ax.plot_surface(x, y, z, color='magenta', alpha=0.5)
+    canvas.draw()
+
+
+def run(counts):
+    figure = Figure(figsize=(5, 5), dpi=100)
+    ax = figure.add_subplot(111, projection='3d')
+    canvas = FigureCanvasAgg(figure)
+    scene = shelf.RetainedScene(ax)
+    objects = []
+
+    print(f"{'objects':>8}{'legacy (ms)':>13}{'retained (ms)':>15}{'pushed':>8}")
+    for count in range(1, max(counts) + 1):
+        slot = len(objects)
+        objects.append({
+            'id': slot,
+            'type': 'sphere',
+            'resolution': shelf.SPHERE_RESOLUTION,
+            'transform': translation_matrix(((slot % shelf.OBJECTS_PER_ROW) * shelf.OBJECT_SPACING,
+                                             (slot // shelf.OBJECTS_PER_ROW) * shelf.OBJECT_SPACING, 0.0)),
+            'version': 0,
+        })
+        start = time.perf_counter()
+        scene.sync(objects)
+        scene.fit(objects)
+        canvas.draw()
+        retained = time.perf_counter() - start
+        if count not in counts:
+            continue
+
+        start = time.perf_counter()
+        legacy_redraw(count)
+        legacy = time.perf_counter() - start
+        print(f"{count:>8}{legacy * 1000:13.0f}{retained * 1000:15.0f}{scene.pushed:>8}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cost of adding one sphere to the shelf viewport by object count")
+    parser.add_argument("--counts", type=int, nargs="+", default=[1, 5, 10, 20])
+    args = parser.parse_args()
+    run(set(args.counts))
@@ -0,0 +1,84 @@
+import argparse
+import os
+import time
+
+import numpy as np
+
+from skinning import SkinCluster
+
+
+def character(vertex_count, joint_count):
+    """Return a tube of random vertices around a chain of joints up the Y axis"""
+    rng = np.random.default_rng(0)
+    height = rng.random(vertex_count) * joint_count
+    angle = rng.random(vertex_count) * 2 * np.pi
+    vertices = np.stack([0.3 * np.cos(angle), height, 0.3 * np.sin(angle)], axis=1).astype(np.float32)
+    worlds = np.tile(np.eye(4), (joint_count, 1, 1))
+    worlds[:, 1, 3] = np.arange(joint_count)
+    return vertices, worlds, np.arange(joint_count) - 1
+
+
+def bend(worlds, amount):
+    """Return the chain's world matrices with every joint bent by amount radians about Z"""
+    c, s = np.cos(amount), np.sin(amount)
+    local = np.eye(4)
+    local[:2, :2] = [[c, -s], [s, c]]
+    local[1, 3] = 1.0
+    posed = worlds.copy()
+    for joint in range(1, len(worlds)):
+        posed[joint] = posed[joint - 1] @ local
+    return posed
+
+
+def dense_deform(cluster, matrices):
+    """Every joint transforms every vertex, scaled by a dense (vertices, joints) weight matrix"""
+    dense = np.zeros((len(cluster.vertices), len(matrices)), dtype=np.float32)
+    rows = np.repeat(np.arange(len(cluster.vertices)), np.diff(cluster.indptr))
+    dense[rows, cluster.joints] = cluster.weights
+    out = np.zeros_like(cluster.vertices)
+    for joint, matrix in enumerate(matrices):
+        out += dense[:, joint, None] * (cluster.vertices @ matrix[:, :3].T + matrix[:, 3])
+    return out
+
+
+def run(vertex_count, joint_count, frames, workers):
+    vertices, worlds, parents = character(vertex_count, joint_count)
+    start = time.perf_counter()
+    local = SkinCluster.bind_mesh(vertices, np.arange(joint_count), np.eye(4), worlds, parents, workers=1)
+    print(f"bind {vertex_count:,} vertices to {joint_count} joints: {(time.perf_counter() - start) * 1000:.1f} ms, "
+          f"{local.weights.nbytes + local.joints.nbytes + local.indptr.nbytes:,} bytes of CSR weights")
+
+    poses = [bend(worlds, 0.02 * np.sin(frame / 5)) for frame in range(frames)]
+    start = time.perf_counter()
+    dense_deform(local, local.skin_matrices(np.eye(4), poses[1]))
+    print(f"  dense weights, per joint    {(time.perf_counter() - start) * 1000:8.1f} ms/frame")
+
+    clusters = [("CSR in process", local)]
+    if workers > 1:
+        clusters.append((f"CSR, {workers} worker processes",
+                         SkinCluster(vertices, local.influences, local.bind, local.indptr, local.joints,
+                                     local.weights, workers)))
+    else:
+        print("  worker pool skipped: one CPU")
+    for label, cluster in clusters:
+        cluster.deform(np.eye(4), poses[0])
+        start = time.perf_counter()
+        for pose in poses[1:]:
+            cluster.deform(np.eye(4), pose)
+        per_frame = (time.perf_counter() - start) * 1000 / (frames - 1)
+        print(f"  {label:<27} {per_frame:8.1f} ms/frame ({1000 / per_frame:.0f} fps)")
+        cluster.close()
+
+    start = time.perf_counter()
+    local.deform(np.eye(4), poses[-1])
+    print(f"  unchanged pose              {(time.perf_counter() - start) * 1000:8.3f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Linear blend skinning throughput")
+    parser.add_argument("--vertices", type=int, default=500_000)
+    parser.add_argument("--joints", type=int, default=32)
+    parser.add_argument("--frames", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+    run(args.vertices, args.joints, args.frames, args.workers)
@@ -0,0 +1,107 @@
+import argparse
+import time
+
+import numpy as np
+
+from scene_graph import CHANNEL_OPERATORS, SceneGraph
+from undo import ChannelChange, UndoStack
+
+# Bytes in a mebibyte, the unit sizes are reported in
+MIB = 1024 * 1024
+
+
+class SceneEditor:
+    """The editor side of undo without the UI: channel reads and writes that re-pose the scene"""
+
+    def __init__(self, scene):
+        self.scene = scene
+
+    def read_channel(self, nodes, column, component):
+        if component is None:
+            return getattr(self.scene, column)[nodes]
+        return getattr(self.scene, column)[nodes, component]
+
+    def write_channel(self, nodes, column, component, values):
+        self.scene.write_channel(nodes, column, component, values)
+        self.scene.update_world()
+
+
+def make_scene(node_count, fanout):
+    parents = np.where(np.arange(node_count) % (fanout + 1) == 0, -1,
+                       np.arange(node_count) // (fanout + 1) * (fanout + 1))
+    scene = SceneGraph(capacity=node_count)
+    scene.add_nodes([f"node{i}" for i in range(node_count)], ['Transform'] * node_count, parents)
+    scene.update_all()
+    return scene
+
+
+def scene_bytes(scene):
+    """What a full snapshot of the scene's channel and matrix arrays would hold"""
+    return sum(getattr(scene, name).nbytes for name in
+               ('translate', 'rotate', 'scale', 'visibility', 'local', 'world'))
+
+
+def edit(editor, stack, nodes, column, component, operator, value):
+    """The channel box path: apply the edit, then record the previous values"""
+    previous = editor.scene.edit_channel(nodes, column, component, operator, value)
+    editor.scene.update_world()
+    stack.push(ChannelChange(editor, f"{column} {operator} {value}", nodes, column, component, previous))
+
+
+def timed(function):
+    start = time.perf_counter()
+    function()
+    return (time.perf_counter() - start) * 1000
+
+
+def random_edits(editor, stack, nodes, count, rng):
+    """Edit a rotating channel of every node with a mix of operators, returning each edit's time"""
+    steps = []
+    for number in range(count):
+        column = ('translate', 'rotate', 'scale')[number % 3]
+        operator = list(CHANNEL_OPERATORS)[number % len(CHANNEL_OPERATORS)]
+        value = float(rng.uniform(1.0, 2.0))
+        steps.append(timed(lambda: edit(editor, stack, nodes, column, number % 3, operator, value)))
+    return steps
+
+
+def run(node_count, fanout, edits, budget):
+    scene = make_scene(node_count, fanout)
+    editor = SceneEditor(scene)
+    stack = UndoStack()
+    nodes = np.arange(node_count)
+    original = scene.world.copy()
+    rng = np.random.default_rng(0)
+    print(f"{node_count:,} selected nodes, full scene snapshot {scene_bytes(scene) / MIB:.1f} MiB")
+
+    steps = random_edits(editor, stack, nodes, edits, rng)
+    print(f"  edit      {np.mean(steps):8.2f} ms mean, {stack.done[-1].nbytes / MIB:.2f} MiB per command")
+
+    undos = [timed(stack.undo) for _ in range(len(stack))]
+    restored = np.abs(scene.world - original).max()
+    print(f"  undo      {np.mean(undos):8.2f} ms mean, worst {max(undos):.2f} ms (world error {restored:.2g})")
+    redos = [timed(stack.redo) for _ in range(len(stack.undone))]
+    print(f"  redo      {np.mean(redos):8.2f} ms mean, worst {max(redos):.2f} ms")
+
+    # A bulk operation that rewrites the same channel repeatedly stores it once
+    with stack.group("Nudge"):
+        for _ in range(10):
+            edit(editor, stack, nodes, 'translate', 0, '+=', 0.1)
+    print(f"  grouped   10 nudges kept as {len(stack.done[-1].commands)} change ({stack.done[-1].nbytes / MIB:.2f} MiB)")
+
+    # Keep editing under a budget: the oldest steps are evicted
+    stack = UndoStack(budget * MIB)
+    total = 4 * edits
+    random_edits(editor, stack, nodes, total, rng)
+    print(f"history     {len(stack)} of {total} steps kept in {stack.nbytes / MIB:.1f} MiB (budget {budget} MiB; "
+          f"snapshots would take {total * scene_bytes(scene) / MIB:,.0f} MiB)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Undo and redo latency of channel edits on a large selection")
+    parser.add_argument("--nodes", type=int, default=100_000)
+    parser.add_argument("--fanout", type=int, default=99)
+    parser.add_argument("--edits", type=int, default=30)
+    parser.add_argument("--budget", type=int, default=64, help="undo history budget in MiB")
+    args = parser.parse_args()
+    run(args.nodes, args.fanout, args.edits, args.budget)
@@ -0,0 +1,93 @@
+import argparse
+import time
+import tkinter as tk
+from types import SimpleNamespace
+
+from viewport_grid import ViewportGrid
+
+
+class CallCounter:
+    """Stands in for a widget's Tcl interpreter and counts the calls made through it"""
+
+    def __init__(self, interpreter):
+        self._interpreter = interpreter
+        self.calls = 0
+
+    def call(self, *args):
+        self.calls += 1
+        return self._interpreter.call(*args)
+
+    def __getattr__(self, name):
+        return getattr(self._interpreter, name)
+
+
+def draw_grid_recreate(canvas, width, height):
+    """The previous draw_grid: delete and recreate every line, then rebind"""
+    canvas.delete("grid_line")
+    for i in range(0, width, 20):
+        canvas.create_line(i, 0, i, height, fill='#333333', tags="grid_line")
+    for i in range(0, height, 20):
+        canvas.create_line(0, i, width, i, fill='#333333', tags="grid_line")
+    canvas.create_line(width // 2, 0, width // 2, height, fill='#555555', width=1, tags="grid_line")
+    canvas.create_line(0, height // 2, width, height // 2, fill='#555555', width=1, tags="grid_line")
+    canvas.bind("<Configure>", lambda e: None)
+
+
+def make_canvas(root):
+    canvas = tk.Canvas(root, highlightthickness=0)
+    canvas.pack(fill=tk.BOTH, expand=True)
+    root.update()
+    counter = CallCounter(canvas.tk)
+    canvas.tk = counter
+    return canvas, counter
+
+
+def run(events, viewports):
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"viewport grid skipped: {e}")
+        return
+    root.geometry("1200x800")
+    # A window drag: sizes step a few pixels per event
+    sizes = [(800 + 3 * k, 500 + 2 * k) for k in range(events)]
+
+    canvas, counter = make_canvas(root)
+    start = time.perf_counter()
+    for width, height in sizes:
+        draw_grid_recreate(canvas, width, height)
+    root.update()
+    recreate_calls, recreate_time = counter.calls, time.perf_counter() - start
+    canvas.destroy()
+
+    canvas, counter = make_canvas(root)
+    grid = ViewportGrid(canvas)
+    grid.on_configure(SimpleNamespace(width=800, height=500))
+    time.sleep(grid.delay_ms / 1000)
+    root.update()
+    counter.calls = 0
+    start = time.perf_counter()
+    for width, height in sizes:
+        grid.on_configure(SimpleNamespace(width=width, height=height))
+    pooled_time = time.perf_counter() - start
+    # The debounced redraw fires once resizing stops
+    time.sleep(grid.delay_ms / 1000)
+    start = time.perf_counter()
+    root.update()
+    pooled_calls, pooled_time = counter.calls, pooled_time + time.perf_counter() - start
+    root.destroy()
+
+    print(f"{events} resize events, {viewports} viewports")
+    print(f"{'':14}{'Tk calls/event':>16}{'ms/event':>10}")
+    print(f"{'recreate':14}{recreate_calls * viewports / events:16.1f}"
+          f"{recreate_time * 1000 * viewports / events:10.2f}")
+    print(f"{'pooled':14}{pooled_calls * viewports / events:16.1f}"
+          f"{pooled_time * 1000 * viewports / events:10.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tk calls per resize event for the viewport grid")
+    parser.add_argument("--events", type=int, default=200)
+    parser.add_argument("--viewports", type=int, default=4)
+    args = parser.parse_args()
+    run(args.events, args.viewports)
@@ -0,0 +1,226 @@
+import numpy as np
+
+# Items per leaf; leaves are tested as one batch once the traversal reaches them
+LEAF_SIZE = 16
+
+# Traversal starts at this depth and descends two levels at a time, so
+# each step tests a node's four grandchildren as one array operation
+START_LEVEL = 8
+
+
+def morton_codes(points, bits=10):
+    """Return 3 * bits-bit Morton codes of points quantized within their bounds"""
+    low = points.min(axis=0)
+    extent = np.maximum(points.max(axis=0) - low, 1e-12)
+    grid = np.minimum((points - low) / extent * (1 << bits), (1 << bits) - 1).astype(np.uint64)
+    codes = np.zeros(len(points), dtype=np.uint64)
+    for bit in range(bits):
+        for axis in range(3):
+            codes |= ((grid[:, axis] >> np.uint64(bit)) & np.uint64(1)) << np.uint64(3 * bit + 2 - axis)
+    return codes
+
+
+def transform_boxes(lo, hi, models):
+    """Return the world-space (lo, hi) bounds of local boxes under 4x4 matrices"""
+    with np.errstate(invalid='ignore'):
+        centre = (lo + hi) / 2
+        half = (hi - lo) / 2
+    world_centre = np.einsum('nij,nj->ni', models[:, :3, :3], centre) + models[:, :3, 3]
+    world_half = np.einsum('nij,nj->ni', np.abs(models[:, :3, :3]), half)
+    empty = ~(lo <= hi).all(axis=1)
+    world_lo = np.where(empty[:, None], np.inf, world_centre - world_half)
+    world_hi = np.where(empty[:, None], -np.inf, world_centre + world_half)
+    return world_lo, world_hi
+
+
+def frustum_planes(matrix):
+    """Return the six inward (a, b, c, d) planes of a projection @ view matrix"""
+    rows = np.asarray(matrix)
+    planes = np.array([rows[3] + rows[0], rows[3] - rows[0], rows[3] + rows[1],
+                       rows[3] - rows[1], rows[3] + rows[2], rows[3] - rows[2]])
+    return planes / np.linalg.norm(planes[:, :3], axis=1)[:, None]
+
+
+def ray_boxes(origin, inverse, lo, hi):
+    """Return (hit, entry) of a ray against boxes, given 1 / direction"""
+    with np.errstate(invalid='ignore'):
+        t1 = (lo - origin) * inverse
+        t2 = (hi - origin) * inverse
+    entry = np.minimum(t1, t2).max(axis=1)
+    leave = np.maximum(t1, t2).min(axis=1)
+    hit = (leave >= np.maximum(entry, 0.0)) & (lo[:, 0] <= hi[:, 0])
+    return hit, entry
+
+
+def frustum_boxes(planes, lo, hi, whole=False):
+    """Return which boxes are at least partly, or with whole=True entirely, inside every plane"""
+    # Empty boxes have a NaN centre and so fail every comparison
+    with np.errstate(invalid='ignore'):
+        distance = (lo + hi) / 2 @ planes[:, :3].T + planes[:, 3]
+        reach = (hi - lo) / 2 @ np.abs(planes[:, :3]).T
+        if whole:
+            return (distance >= reach).all(axis=1)
+        return (distance >= -reach).all(axis=1)
+
+
+def ray_triangles(origin, direction, v0, v1, v2):
+    """Return the ray parameter of each triangle hit, or inf for a miss (Moller-Trumbore)"""
+    edge1, edge2 = v1 - v0, v2 - v0
+    p = np.cross(direction, edge2)
+    det = (edge1 * p).sum(axis=1)
+    valid = np.abs(det) > 1e-12
+    inv_det = 1.0 / np.where(valid, det, 1.0)
+    s = origin - v0
+    u = (s * p).sum(axis=1) * inv_det
+    q = np.cross(s, edge1)
+    v = (direction * q).sum(axis=1) * inv_det
+    t = (edge2 * q).sum(axis=1) * inv_det
+    hit = valid & (u >= 0) & (v >= 0) & (u + v <= 1) & (t >= 0)
+    return np.where(hit, t, np.inf)
+
+
+def points_in_polygon(points, polygon):
+    """Return which (n, 2) points fall inside a closed (k, 2) polygon, by even-odd crossings"""
+    x, y = points[:, 0:1], points[:, 1:2]
+    x0, y0 = polygon[:, 0], polygon[:, 1]
+    x1, y1 = np.roll(x0, -1), np.roll(y0, -1)
+    straddles = (y0 > y) != (y1 > y)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        crossing = x0 + (y - y0) * (x1 - x0) / (y1 - y0)
+    return (straddles & (x < crossing)).sum(axis=1) % 2 == 1
+
+
+class BVH:
+    """Bounding volume hierarchy over axis-aligned item boxes
+
+    Items are sorted along a Morton curve and packed LEAF_SIZE to a leaf;
+    the leaves form the bottom of an implicit complete binary tree stored
+    as a heap (node k has children 2k and 2k + 1), so building and
+    refitting are a few array reductions per level. Queries walk the
+    tree breadth first, testing a whole level's frontier at once.
+    """
+
+    def __init__(self, lo, hi, leaf_size=LEAF_SIZE):
+        lo = np.asarray(lo, dtype=np.float64).reshape(-1, 3)
+        hi = np.asarray(hi, dtype=np.float64).reshape(-1, 3)
+        self.count = len(lo)
+        self.leaf_size = leaf_size
+        leaves = max(1, -(-self.count // leaf_size))
+        self.depth = int(np.ceil(np.log2(leaves)))
+        self.leaves = 1 << self.depth
+
+        with np.errstate(invalid='ignore'):
+            centres = (lo + hi) / 2
+        centres = np.where(np.isfinite(centres), centres, 0.0)
+        self.order = np.argsort(morton_codes(centres), kind='stable') if self.count else np.empty(0, np.int64)
+        self.slot = np.empty(self.count, dtype=np.int64)
+        self.slot[self.order] = np.arange(self.count)
+
+        self.item_lo = np.full((self.leaves * leaf_size, 3), np.inf)
+        self.item_hi = np.full((self.leaves * leaf_size, 3), -np.inf)
+        self.item_lo[:self.count] = lo[self.order]
+        self.item_hi[:self.count] = hi[self.order]
+        self.lo = np.empty((2 * self.leaves, 3))
+        self.hi = np.empty((2 * self.leaves, 3))
+        self._fit(np.arange(self.leaves))
+
+    def __len__(self):
+        return self.count
+
+    def _fit(self, leaves):
+        """Recompute the given leaves' boxes and every ancestor of them"""
+        shape = (self.leaves, self.leaf_size, 3)
+        nodes = leaves + self.leaves
+        self.lo[nodes] = self.item_lo.reshape(shape)[leaves].min(axis=1)
+        self.hi[nodes] = self.item_hi.reshape(shape)[leaves].max(axis=1)
+        while len(nodes) and nodes[0] > 1:
+            nodes = np.unique(nodes >> 1)
+            self.lo[nodes] = np.minimum(self.lo[2 * nodes], self.lo[2 * nodes + 1])
+            self.hi[nodes] = np.maximum(self.hi[2 * nodes], self.hi[2 * nodes + 1])
+
+    def refit(self, items, lo, hi):
+        """Move some items to new boxes, updating only the tree paths above them"""
+        slots = self.slot[np.asarray(items, dtype=np.int64)]
+        if not len(slots):
+            return
+        self.item_lo[slots] = lo
+        self.item_hi[slots] = hi
+        self._fit(np.unique(slots // self.leaf_size))
+
+    def boxes(self, items):
+        """Return the current (lo, hi) of some items"""
+        slots = self.slot[np.asarray(items, dtype=np.int64)]
+        return self.item_lo[slots], self.item_hi[slots]
+
+    def _query(self, test, contains=None):
+        """Return (items, slots) whose boxes pass test, pruning whole subtrees that fail
+
+        Subtrees whose box passes contains are accepted without visiting
+        them, since every item below passes too.
+        """
+        level = min(START_LEVEL, self.depth)
+        nodes = np.arange(1 << level, 2 << level)
+        accepted = []
+        while True:
+            nodes = nodes[test(self.lo[nodes], self.hi[nodes])]
+            if contains is not None and len(nodes):
+                whole = contains(self.lo[nodes], self.hi[nodes])
+                # A node at this level covers a contiguous run of slots
+                span = (self.leaves >> level) * self.leaf_size
+                starts = (nodes[whole] - (1 << level)) * span
+                accepted.append((starts[:, None] + np.arange(span)).ravel())
+                nodes = nodes[~whole]
+            if level == self.depth or not len(nodes):
+                break
+            step = min(2, self.depth - level)
+            level += step
+            nodes = ((nodes << step)[:, None] + np.arange(1 << step)).ravel()
+        slots = ((nodes - self.leaves)[:, None] * self.leaf_size + np.arange(self.leaf_size)).ravel()
+        slots = slots[slots < self.count]
+        slots = slots[test(self.item_lo[slots], self.item_hi[slots])]
+        if accepted:
+            inside = np.concatenate(accepted)
+            inside = inside[inside < self.count]
+            # Padding and empty items sit inside accepted runs too
+            inside = inside[self.item_lo[inside, 0] <= self.item_hi[inside, 0]]
+            slots = np.concatenate([inside, slots])
+        return self.order[slots], slots
+
+    def ray(self, origin, direction):
+        """Return (items, entry) of the item boxes a ray passes through, nearest entry first"""
+        origin = np.asarray(origin, dtype=np.float64)
+        with np.errstate(divide='ignore'):
+            inverse = 1.0 / np.asarray(direction, dtype=np.float64)
+        items, slots = self._query(lambda lo, hi: ray_boxes(origin, inverse, lo, hi)[0])
+        _, entry = ray_boxes(origin, inverse, self.item_lo[slots], self.item_hi[slots])
+        order = np.argsort(entry, kind='stable')
+        return items[order], np.maximum(entry[order], 0.0)
+
+    def frustum(self, planes):
+        """Return the items whose boxes are at least partly inside a set of planes"""
+        return self._query(lambda lo, hi: frustum_boxes(planes, lo, hi),
+                           lambda lo, hi: frustum_boxes(planes, lo, hi, whole=True))[0]
+
+
+class MeshBVH(BVH):
+    """BVH over the triangles of one mesh, in the mesh's own space"""
+
+    def __init__(self, vertices, indices, leaf_size=LEAF_SIZE):
+        vertices = np.asarray(vertices, dtype=np.float64).reshape(-1, 3)
+        indices = np.asarray(indices, dtype=np.int64).reshape(-1, 3)
+        self.corners = vertices[indices]
+        super().__init__(self.corners.min(axis=1), self.corners.max(axis=1), leaf_size)
+
+    def raycast(self, origin, direction):
+        """Return (t, triangle) of the nearest hit along origin + t * direction, or (inf, -1)"""
+        origin = np.asarray(origin, dtype=np.float64)
+        direction = np.asarray(direction, dtype=np.float64)
+        with np.errstate(divide='ignore'):
+            inverse = 1.0 / direction
+        triangles, _ = self._query(lambda lo, hi: ray_boxes(origin, inverse, lo, hi)[0])
+        if not len(triangles):
+            return np.inf, -1
+        corners = self.corners[triangles]
+        t = ray_triangles(origin, direction, corners[:, 0], corners[:, 1], corners[:, 2])
+        best = int(np.argmin(t))
+        return (float(t[best]), int(triangles[best])) if np.isfinite(t[best]) else (np.inf, -1)
@@ -1,21 +1,158 @@
 import tkinter as tk
+from tkinter import ttk
+
+# Pixel height of one channel row
+ROW_HEIGHT = 22
+
 
 class ChannelBox(tk.Frame):
-    def __init__(self, parent):
-        super().__init__(parent, bd=2, relief=tk.GROOVE)
-        
-        # Title Label
-        title = tk.Label(self, text="Channel Box", bg="lightgray", font=("Arial", 12, "bold"))
-        title.pack(fill=tk.X)
-
-        # Listbox
-        self.listbox = tk.Listbox(self)
-        self.listbox.pack(fill=tk.BOTH, expand=True)
-
-        # Add channel attributes
-        attributes = ["Translate X", "Rotate Y", "Scale Z"]
-        for attr in attributes:
-            self.listbox.insert(tk.END, attr)
+    """Channel rows drawn from a fixed pool of label and entry widgets
+
+    Only as many rows exist as fit on screen. Scrolling, or switching the
+    selection, rebinds them to other channels and re-reads their values
+    through the value callback, so a node with hundreds of attributes
+    costs the same widgets as one with ten. Channels are (label, key)
+    pairs; an entry calls commit(key, text) on Return, or on focus loss if
+    its text was edited since it was drawn.
+    """
+
+    def __init__(self, parent, value=None, commit=None, bg="#171717", fg="#ffffff",
+                 field_bg="#2d2d2d", row_height=ROW_HEIGHT, label_width=12):
+        super().__init__(parent, bg=bg)
+        self.value = value or (lambda key: "")
+        self.commit = commit or (lambda key, text: None)
+        self.bg = bg
+        self.fg = fg
+        self.field_bg = field_bg
+        self.row_height = row_height
+        self.label_width = label_width
+        self.channels = []
+        self.top = 0
+        self.pool = []
+        self.bound = []
+        self.shown = []
+
+        self.body = tk.Frame(self, bg=bg)
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self.yview)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.body.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.body.bind("<Configure>", lambda e: self.draw())
+        self.bind_scroll(self.body)
+
+    def bind_scroll(self, widget):
+        widget.bind("<MouseWheel>", lambda e: self.scroll(-1 if e.delta > 0 else 1, 3))
+        widget.bind("<Button-4>", lambda e: self.scroll(-1, 3))
+        widget.bind("<Button-5>", lambda e: self.scroll(1, 3))
+
+    def set_channels(self, channels):
+        """Show a list of (label, key) channels, keeping the scroll position if it is unchanged"""
+        channels = list(channels)
+        if channels != self.channels:
+            self.channels = channels
+            self.top = 0
+        self.refresh()
+
+    def refresh(self):
+        """Re-read the values of the rows on screen, discarding anything typed but not committed"""
+        self.shown = [None] * len(self.pool)
+        self.draw()
+
+    # Scrolling
+
+    def visible_rows(self):
+        """Rows that fit in the box, counting a partly shown last row"""
+        return max(1, -(-self.body.winfo_height() // self.row_height))
+
+    def yview(self, *args):
+        """Scrollbar command: 'moveto fraction' or 'scroll n units|pages'"""
+        if args[0] == 'moveto':
+            self.top = int(float(args[1]) * len(self.channels))
+        elif args[0] == 'scroll':
+            self.scroll(int(args[1]), self.visible_rows() - 1 if args[2] == 'pages' else 1)
+            return
+        self.draw()
+
+    def scroll(self, direction, rows):
+        """Move the view by a number of rows"""
+        self.top += direction * max(1, rows)
+        self.draw()
+
+    # Drawing
+
+    def make_row(self, slot):
+        """Create the widgets of one pooled row"""
+        frame = tk.Frame(self.body, bg=self.bg)
+        label = tk.Label(frame, bg=self.bg, fg=self.fg, width=self.label_width, anchor=tk.W)
+        label.pack(side=tk.LEFT)
+        entry = tk.Entry(frame, bg=self.field_bg, fg=self.fg, insertbackground=self.fg, bd=0, width=10)
+        entry.pack(side=tk.RIGHT)
+        entry.bind("<Return>", lambda e: self.commit_slot(slot))
+        entry.bind("<FocusOut>", lambda e: self.commit_slot(slot, edited_only=True))
+        for widget in (frame, label, entry):
+            self.bind_scroll(widget)
+        return frame, label, entry
+
+    def commit_slot(self, slot, edited_only=False):
+        """Send a pooled entry's text to the channel it is bound to, if edited_only only when it was changed"""
+        key, shown = self.bound[slot], self.shown[slot]
+        if key is None or shown is None:
+            return
+        text = self.pool[slot][2].get().strip()
+        if edited_only and text == shown[1].strip():
+            return
+        # Committed text counts as shown, so leaving the entry afterwards does not apply it again
+        self.shown[slot] = (shown[0], text)
+        self.commit(key, text)
+
+    def draw(self):
+        """Bind the row pool to the channels now in view"""
+        total = len(self.channels)
+        visible = self.visible_rows()
+        self.top = max(0, min(self.top, total - visible + 1))
+        while len(self.pool) < visible:
+            self.pool.append(self.make_row(len(self.pool)))
+            self.bound.append(None)
+            self.shown.append(None)
+
+        focused = self.focus_get()
+        pending = None
+        for slot, (frame, label, entry) in enumerate(self.pool):
+            row = self.top + slot
+            key = self.channels[row][1] if row < total else None
+            if key != self.bound[slot]:
+                if entry is focused:
+                    # A half-typed value goes to the channel it was typed for
+                    text = entry.get().strip()
+                    if self.shown[slot] is not None and text != self.shown[slot][1].strip():
+                        pending = (self.bound[slot], text)
+                    self.focus_set()
+                # A rebound row always rewrites its text, so the FocusOut the
+                # move queues finds it unedited and commits nothing
+                self.shown[slot] = None
+            self.bound[slot] = key
+            if key is None:
+                state = None
+            else:
+                state = (self.channels[row][0], self.value(key))
+            # Skip Tk calls for rows that look the same as last time
+            if state == self.shown[slot]:
+                continue
+            self.shown[slot] = state
+            if state is None:
+                frame.place_forget()
+                continue
+            frame.place(x=5, y=slot * self.row_height, relwidth=1.0, width=-10, height=self.row_height)
+            label.config(text=state[0])
+            entry.delete(0, tk.END)
+            entry.insert(0, state[1])
+
+        if total:
+            self.scrollbar.set(self.top / total, min(1.0, (self.top + visible) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+        if pending is not None:
+            self.commit(*pending)
+
 
 # Example usage
 if __name__ == "__main__":
@@ -23,7 +160,17 @@ if __name__ == "__main__":
     root.title("GKSHALA - Channel Box")
     root.geometry("800x600")
 
-    channel_box = ChannelBox(root)
+    values = {f"custom{i}": float(i) for i in range(500)}
+
+    def commit(key, text):
+        try:
+            values[key] = float(text)
+        except ValueError:
+            pass
+        channel_box.refresh()
+
+    channel_box = ChannelBox(root, value=lambda key: f"{values[key]:.3f}", commit=commit)
     channel_box.pack(side=tk.RIGHT, fill=tk.Y)
+    channel_box.set_channels([(key, key) for key in values])
 
     root.mainloop()
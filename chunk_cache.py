@@ -0,0 +1,78 @@
+from collections import OrderedDict
+
+import numpy as np
+
+DEFAULT_BUDGET = 512 * 1024 * 1024
+
+
+class ChunkCache:
+    """LRU cache of .gks chunks paged in on first use
+
+    Chunks are copied out of the file mapping so the cache owns exactly the
+    memory it reports, and evicting an entry really frees it. Entries are
+    keyed by file offset, so nodes that share a chunk share one copy.
+    """
+
+    def __init__(self, budget_bytes=DEFAULT_BUDGET):
+        self.budget_bytes = budget_bytes
+        self.resident_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, scene_file, index, kind):
+        """Return a chunk, reading it from the file on a miss"""
+        key = scene_file.chunk_offset(index, kind)
+        array = self._entries.get(key)
+        if array is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return array
+
+        self.misses += 1
+        array = np.array(scene_file.array(index, kind))
+        array.flags.writeable = False
+        if array.nbytes <= self.budget_bytes:
+            self._entries[key] = array
+            self.resident_bytes += array.nbytes
+            self._evict()
+        return array
+
+    def set_budget(self, budget_bytes):
+        """Change the memory budget, evicting immediately if now over it"""
+        self.budget_bytes = budget_bytes
+        self._evict()
+
+    def discard(self, scene_file, index):
+        """Drop every cached chunk of one node"""
+        for kind in scene_file.chunk_kinds(index):
+            array = self._entries.pop(scene_file.chunk_offset(index, kind), None)
+            if array is not None:
+                self.resident_bytes -= array.nbytes
+
+    def clear(self):
+        """Drop all cached chunks"""
+        self._entries.clear()
+        self.resident_bytes = 0
+
+    def _evict(self):
+        while self.resident_bytes > self.budget_bytes and self._entries:
+            _, array = self._entries.popitem(last=False)
+            self.resident_bytes -= array.nbytes
+            self.evictions += 1
+
+
+def format_bytes(size):
+    """Format a byte count for the status bar"""
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f}{unit}" if unit == "B" else f"{size:.1f}{unit}"
+        size /= 1024
+    return f"{size:.1f}GB"
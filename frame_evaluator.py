@@ -0,0 +1,199 @@
+import queue
+import threading
+import time
+
+import numpy as np
+
+from animation import evaluate_packed, scatter_channels
+from scene_graph import TRANSFORM_COLUMNS, compose_matrices
+
+
+class FrameEvaluator:
+    """Evaluates animation frames on a worker thread
+
+    The UI thread only posts frame requests and applies finished results.
+    Curves and the world matrices of the animated subtrees are computed on
+    a snapshot of the scene into one of a pair of result buffers, so the
+    worker fills the back buffer while the front one waits to be applied.
+    Edits make the snapshot stale through invalidate(); results computed
+    from an older snapshot are dropped without being applied.
+    """
+
+    def __init__(self, buffers=2):
+        self.buffer_count = buffers
+        self.version = 0
+        self.evaluated = 0
+        self.discarded = 0
+        self.last_ms = 0.0
+        self.results = queue.Queue()
+        self._snapshot = None
+        self._pending = []
+        self._running = None
+        self._ready = {}
+        self._condition = threading.Condition()
+        self._closed = False
+        self._thread = None
+
+    def invalidate(self):
+        """Mark the snapshot stale after an edit to the scene or the keys"""
+        with self._condition:
+            self.version += 1
+            self._pending.clear()
+        for result in self._ready.values():
+            self._release(result)
+        self._ready.clear()
+
+    def sync(self, scene, keyframes):
+        """Snapshot the scene and curves unless the last snapshot is still current
+
+        The scene's world matrices must be up to date when this is called.
+        """
+        if self._snapshot is not None and self._snapshot['version'] == self.version:
+            return
+        packed = keyframes.pack()
+        n = scene.count
+        animated = packed['animated_nodes']
+        affected = scene.descendants(animated) if len(animated) else np.empty(0, dtype=np.int64)
+        depth = scene.depth[affected]
+        order = np.argsort(depth, kind='stable')
+        affected = affected[order]
+        groups = np.split(affected, np.flatnonzero(np.diff(depth[order])) + 1) if len(affected) else []
+
+        free = queue.Queue()
+        buffers = []
+        for index in range(self.buffer_count):
+            buffers.append({
+                'values': np.empty(len(packed['starts'])),
+                'local': np.empty((len(affected), 4, 4)),
+                'world': np.empty((len(affected), 4, 4)),
+            })
+            free.put(index)
+        snapshot = {
+            'version': self.version,
+            'packed': packed,
+            'columns': {column: getattr(scene, column)[:n].copy() for column in TRANSFORM_COLUMNS},
+            'parent': scene.parent[:n].copy(),
+            'local': scene.local[:n].copy(),
+            'world': scene.world[:n].copy(),
+            'affected': affected,
+            'groups': groups,
+            'buffers': buffers,
+            'free': free,
+        }
+        with self._condition:
+            self._snapshot = snapshot
+
+    def request(self, frame, ahead=0):
+        """Ask for a frame, plus the next few when playing, dropping any other pending work"""
+        self.collect()
+        wanted = [frame + k for k in range(ahead + 1)]
+        for other in [f for f in self._ready if f not in wanted]:
+            self._release(self._ready.pop(other))
+        with self._condition:
+            self._pending = [f for f in wanted if f not in self._ready and f != self._running]
+            self._condition.notify()
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def collect(self):
+        """Move finished results off the queue, dropping those from stale snapshots"""
+        while True:
+            try:
+                result = self.results.get_nowait()
+            except queue.Empty:
+                return
+            frame, version = result[0], result[1]
+            if version != self.version:
+                self.discarded += 1
+                self._release(result)
+            else:
+                if frame in self._ready:
+                    self._release(self._ready[frame])
+                self._ready[frame] = result
+
+    def take(self, frame):
+        """Return the finished result for a frame, or None if it is not ready yet"""
+        self.collect()
+        return self._ready.pop(frame, None)
+
+    def busy(self):
+        """True while requested frames are queued or being evaluated"""
+        self.collect()
+        with self._condition:
+            return bool(self._pending) or self._running is not None or not self.results.empty()
+
+    def apply(self, result, scene):
+        """Write a finished frame into the scene graph and hand its buffer back"""
+        snapshot, index = result[2], result[3]
+        buffer = snapshot['buffers'][index]
+        scatter_channels(snapshot['packed'], buffer['values'],
+                         {column: getattr(scene, column) for column in TRANSFORM_COLUMNS})
+        scene.set_pose(snapshot['affected'], buffer['local'], buffer['world'])
+        self._release(result)
+        return len(snapshot['affected'])
+
+    def close(self):
+        """Stop the worker thread"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _release(self, result):
+        snapshot, index = result[2], result[3]
+        snapshot['free'].put(index)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._pending and not self._closed:
+                    self._condition.wait()
+                if self._closed:
+                    return
+                frame = self._pending.pop(0)
+                snapshot = self._snapshot
+                self._running = frame
+
+            # Both buffers may still be waiting on the UI; give up on the
+            # frame if an edit makes it stale in the meantime
+            index = None
+            while index is None and snapshot['version'] == self.version and not self._closed:
+                try:
+                    index = snapshot['free'].get(timeout=0.1)
+                except queue.Empty:
+                    pass
+            if index is not None:
+                start = time.perf_counter()
+                evaluate_pose(snapshot, frame, snapshot['buffers'][index])
+                self.last_ms = (time.perf_counter() - start) * 1000
+                self.evaluated += 1
+                self.results.put((frame, snapshot['version'], snapshot, index))
+            with self._condition:
+                self._running = None
+
+
+def evaluate_pose(snapshot, frame, buffer):
+    """Evaluate curves and animated world matrices of a snapshot into a result buffer"""
+    packed = snapshot['packed']
+    columns = snapshot['columns']
+    local, world, parent = snapshot['local'], snapshot['world'], snapshot['parent']
+    values = evaluate_packed(packed, frame)
+    scatter_channels(packed, values, columns)
+
+    animated = packed['animated_nodes']
+    local[animated] = compose_matrices(columns['translate'][animated], columns['rotate'][animated],
+                                       columns['scale'][animated])
+    for group in snapshot['groups']:
+        parents = parent[group]
+        if parents[0] < 0:
+            world[group] = local[group]
+        else:
+            world[group] = world[parents] @ local[group]
+
+    affected = snapshot['affected']
+    buffer['values'][:] = values
+    buffer['local'][:] = local[affected]
+    buffer['world'][:] = world[affected]
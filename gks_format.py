@@ -0,0 +1,189 @@
+import json
+import mmap
+import os
+import struct
+
+import numpy as np
+
+# File layout
+#   header  : magic, version, flags, toc length, data offset
+#   toc     : UTF-8 JSON describing every node and where its chunks live
+#   chunks  : raw little-endian arrays, each aligned to ALIGNMENT bytes
+MAGIC = b"GKS1"
+VERSION = 1
+HEADER = struct.Struct("<4sHHQQ")
+ALIGNMENT = 64
+
+
+class GKSFormatError(Exception):
+    """Raised when a file is not a readable .gks scene"""
+
+
+def _align(offset):
+    """Round offset up to the next chunk boundary"""
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def save_scene(path, nodes):
+    """Write scene nodes to a .gks container
+
+    Each node is a dict with 'name', 'type', 'parent' (index of an earlier
+    node or -1), optional 'attributes' (JSON values) and optional 'arrays'
+    mapping a chunk kind such as 'vertices' or 'indices' to a NumPy array.
+    Nodes whose arrays are views of the same buffer, such as duplicates
+    sharing a mesh, point at one chunk instead of writing it again.
+
+    The file is written next to the target and swapped in, so a failed
+    save never truncates the previous version. Windows refuses the swap
+    while the target is memory-mapped; close it first, or write with
+    stage_scene() and swap in once the mapping is released.
+    """
+    tmp_path = stage_scene(path, nodes)
+    try:
+        os.replace(tmp_path, path)
+    except OSError:
+        discard_staged(tmp_path)
+        raise
+
+
+def discard_staged(tmp_path):
+    """Delete a file written by stage_scene() that will not be swapped in"""
+    try:
+        os.remove(tmp_path)
+    except OSError:
+        pass
+
+
+def stage_scene(path, nodes):
+    """Write scene nodes as save_scene() does, but next to path; return the written file's path"""
+    toc_nodes = []
+    chunks = []
+    written = {}
+    offset = 0
+    for node in nodes:
+        entry = {
+            'name': node['name'],
+            'type': node.get('type', ''),
+            'parent': int(node.get('parent', -1)),
+            'attributes': node.get('attributes', {}),
+            'chunks': {},
+        }
+        for kind, array in node.get('arrays', {}).items():
+            array = np.asarray(array)
+            # Every array stays alive until the file is written, so buffer addresses are unique
+            key = (array.__array_interface__['data'][0], array.shape, array.strides, array.dtype.str)
+            if key in written:
+                entry['chunks'][kind] = written[key]
+                continue
+            array = np.ascontiguousarray(array)
+            dtype = array.dtype.newbyteorder('<') if array.dtype.byteorder == '>' else array.dtype
+            array = array.astype(dtype, copy=False)
+            offset = _align(offset)
+            entry['chunks'][kind] = {
+                'offset': offset,
+                'dtype': dtype.str,
+                'shape': list(array.shape),
+            }
+            written[key] = entry['chunks'][kind]
+            chunks.append((offset, array))
+            offset += array.nbytes
+        toc_nodes.append(entry)
+
+    toc = json.dumps({'nodes': toc_nodes}, separators=(',', ':')).encode('utf-8')
+    data_offset = _align(HEADER.size + len(toc))
+
+    tmp_path = path + ".tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, 0, len(toc), data_offset))
+            f.write(toc)
+            position = HEADER.size + len(toc)
+            for chunk_offset, array in chunks:
+                target = data_offset + chunk_offset
+                f.write(b"\0" * (target - position))
+                f.write(array.reshape(-1).view(np.uint8).data)
+                position = target + array.nbytes
+    except OSError:
+        # Don't leave a partial file behind, say from a full disk
+        discard_staged(tmp_path)
+        raise
+    return tmp_path
+
+
+class GKSFile:
+    """Memory-mapped view of a .gks container
+
+    Opening reads only the header and table of contents; chunk arrays are
+    zero-copy views into the mapping and are paged in by the OS on access.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            header = self._file.read(HEADER.size)
+            if len(header) != HEADER.size:
+                raise GKSFormatError(f"{path} is too short to be a .gks file")
+            magic, version, _flags, toc_length, data_offset = HEADER.unpack(header)
+            if magic != MAGIC:
+                raise GKSFormatError(f"{path} is not a .gks file")
+            if version > VERSION:
+                raise GKSFormatError(f"{path} uses unsupported .gks version {version}")
+            self.nodes = json.loads(self._file.read(toc_length).decode('utf-8'))['nodes']
+            self.data_offset = data_offset
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self._file.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def chunk_kinds(self, index):
+        """Return the chunk kinds stored for a node"""
+        return list(self.nodes[index]['chunks'])
+
+    def chunk_nbytes(self, index, kind):
+        """Return the size in bytes of one chunk without touching its data"""
+        chunk = self.nodes[index]['chunks'][kind]
+        return int(np.prod(chunk['shape'], dtype=np.int64)) * np.dtype(chunk['dtype']).itemsize
+
+    def chunk_offset(self, index, kind):
+        """Return where a chunk starts, the same for nodes that share it"""
+        return self.nodes[index]['chunks'][kind]['offset']
+
+    def array(self, index, kind):
+        """Return a read-only array view of one chunk"""
+        chunk = self.nodes[index]['chunks'][kind]
+        dtype = np.dtype(chunk['dtype'])
+        count = int(np.prod(chunk['shape'], dtype=np.int64))
+        view = np.frombuffer(self._mmap, dtype=dtype, count=count,
+                             offset=self.data_offset + chunk['offset'])
+        return view.reshape(chunk['shape'])
+
+    def arrays(self, index):
+        """Return every chunk of a node as a dict of array views"""
+        return {kind: self.array(index, kind) for kind in self.nodes[index]['chunks']}
+
+    def close(self):
+        """Release the mapping and the file handle"""
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                # Arrays handed out still reference the mapping; it is
+                # released once they are garbage collected
+                pass
+            self._mmap = None
+        self._file.close()
+
+
+def load_scene(path):
+    """Open a .gks file for reading"""
+    return GKSFile(path)
@@ -0,0 +1,223 @@
+import json
+import os
+import struct
+import zlib
+
+import numpy as np
+
+# Journal layout
+#   header  : magic, version
+#   records : tag, crc32 of payload, payload length, payload
+#   payload : meta length, meta JSON, raw chunk bytes in meta order
+# Records are absolute (a whole node, one attribute value, or one attribute
+# of many nodes with a value row each), so replaying a journal that was
+# already folded into its scene is harmless.
+MAGIC = b"GKSJ"
+VERSION = 1
+HEADER = struct.Struct("<4sH")
+RECORD = struct.Struct("<4sIQ")
+META = struct.Struct("<I")
+NODE = b"NODE"
+ATTR = b"ATTR"
+ATTRS = b"ATRS"
+
+
+def journal_path(scene_path):
+    """Return the journal file that sits next to a scene"""
+    return scene_path + ".journal"
+
+
+def _encode(tag, meta, arrays=()):
+    meta = json.dumps(meta, separators=(',', ':')).encode('utf-8')
+    parts = [META.pack(len(meta)), meta]
+    parts += [np.ascontiguousarray(a).reshape(-1).view(np.uint8).tobytes() for a in arrays]
+    payload = b"".join(parts)
+    return RECORD.pack(tag, zlib.crc32(payload), len(payload)) + payload
+
+
+def _chunk_meta(kind, array):
+    return {'kind': kind, 'dtype': np.asarray(array).dtype.str, 'shape': list(np.shape(array))}
+
+
+class SceneJournal:
+    """Append-only log of node and attribute changes since the last full save"""
+
+    def __init__(self, scene_path):
+        self.path = journal_path(scene_path)
+        self.valid_length = 0
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def size(self):
+        """Return the journal size in bytes, 0 if there is none"""
+        try:
+            return os.path.getsize(self.path)
+        except OSError:
+            return 0
+
+    def append(self, nodes=None, attributes=()):
+        """Append changed nodes and attribute deltas, return bytes written
+
+        nodes maps a node index to its record; attributes is a sequence of
+        (index, name, value) tuples applied after the nodes. An index array
+        with one value row per node is journaled as a single record. A record
+        with an 'instance' index shares that earlier node's chunks, so only
+        its own arrays are written.
+        """
+        records = []
+        for index, node in sorted((nodes or {}).items()):
+            arrays = node.get('arrays', {})
+            meta = {
+                'index': index,
+                'name': node['name'],
+                'type': node.get('type', ''),
+                'parent': int(node.get('parent', -1)),
+                'attributes': node.get('attributes', {}),
+                'arrays': [_chunk_meta(kind, a) for kind, a in arrays.items()],
+            }
+            if node.get('instance') is not None:
+                meta['instance'] = int(node['instance'])
+            records.append(_encode(NODE, meta, arrays.values()))
+        for index, name, value in attributes:
+            if isinstance(index, np.ndarray):
+                chunks = {'indices': index.astype(np.int64), 'values': np.asarray(value)}
+                meta = {'name': name, 'arrays': [_chunk_meta(kind, a) for kind, a in chunks.items()]}
+                records.append(_encode(ATTRS, meta, chunks.values()))
+            else:
+                records.append(_encode(ATTR, {'index': index, 'name': name, 'value': value}))
+        if not records:
+            return 0
+
+        new_file = not self.exists()
+        with open(self.path, "ab") as f:
+            if new_file:
+                f.write(HEADER.pack(MAGIC, VERSION))
+            for record in records:
+                f.write(record)
+            f.flush()
+            os.fsync(f.fileno())
+        return sum(len(r) for r in records)
+
+    def truncate(self, keep_from=None):
+        """Drop the journal, keeping bytes from keep_from onwards if given
+
+        Used after compaction: records appended while the scene was being
+        rewritten survive into the fresh journal.
+        """
+        if keep_from is None or keep_from >= self.size():
+            self.remove()
+            return
+        with open(self.path, "rb") as f:
+            f.seek(keep_from)
+            tail = f.read()
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION))
+            f.write(tail)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    def remove(self):
+        """Delete the journal"""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    def records(self):
+        """Yield (tag, meta, arrays) for every intact record
+
+        Reading stops at the first truncated or corrupt record, which is
+        what a crash in the middle of an append leaves behind. Afterwards
+        valid_length holds the offset just past the last intact record.
+        """
+        self.valid_length = 0
+        try:
+            f = open(self.path, "rb")
+        except FileNotFoundError:
+            return
+        with f:
+            header = f.read(HEADER.size)
+            if len(header) != HEADER.size or HEADER.unpack(header)[0] != MAGIC:
+                return
+            self.valid_length = HEADER.size
+            while True:
+                head = f.read(RECORD.size)
+                if len(head) != RECORD.size:
+                    return
+                tag, crc, length = RECORD.unpack(head)
+                payload = f.read(length)
+                if len(payload) != length or zlib.crc32(payload) != crc:
+                    return
+                meta_length = META.unpack_from(payload)[0]
+                position = META.size + meta_length
+                meta = json.loads(payload[META.size:position].decode('utf-8'))
+                arrays = {}
+                for chunk in meta.get('arrays', []):
+                    dtype = np.dtype(chunk['dtype'])
+                    count = int(np.prod(chunk['shape'], dtype=np.int64))
+                    array = np.frombuffer(payload, dtype=dtype, count=count, offset=position)
+                    arrays[chunk['kind']] = array.reshape(chunk['shape'])
+                    position += count * dtype.itemsize
+                self.valid_length += RECORD.size + length
+                yield tag, meta, arrays
+
+    def repair(self):
+        """Cut off a torn tail so later appends are not hidden behind it"""
+        for _ in self.records():
+            pass
+        if self.valid_length < self.size():
+            if self.valid_length == 0:
+                self.remove()
+                return
+            with open(self.path, "r+b") as f:
+                f.truncate(self.valid_length)
+
+
+def replay_journal(scene_path, nodes):
+    """Apply a scene's journal to its node records in place, return records applied"""
+    journal = SceneJournal(scene_path)
+    journal.repair()
+    applied = 0
+    for tag, meta, arrays in journal.records():
+        if tag == ATTRS:
+            indices = arrays['indices']
+            if len(indices) and indices.max() >= len(nodes):
+                break
+            for index, value in zip(indices.tolist(), arrays['values'].tolist()):
+                nodes[index].setdefault('attributes', {})[meta['name']] = value
+            applied += 1
+            continue
+        index = meta['index']
+        if tag == NODE:
+            node = {
+                'name': meta['name'],
+                'type': meta['type'],
+                'parent': meta['parent'],
+                'attributes': meta['attributes'],
+                'arrays': arrays,
+            }
+            instance = meta.get('instance')
+            if instance is not None:
+                if instance >= len(nodes):
+                    break
+                # Share the instanced node's buffers, or its chunks in the scene file
+                shared = nodes[instance]
+                node['arrays'] = dict(shared.get('arrays', {}), **arrays)
+                node['instance'] = instance
+                if shared.get('source') is not None:
+                    node['source'] = shared['source']
+            if index < len(nodes):
+                nodes[index] = node
+            elif index == len(nodes):
+                nodes.append(node)
+            else:
+                break
+        elif tag == ATTR:
+            if index >= len(nodes):
+                break
+            nodes[index].setdefault('attributes', {})[meta['name']] = meta['value']
+        applied += 1
+    return applied
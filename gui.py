@@ -1,6 +1,9 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog, Menu
 
+from gks_format import GKSFormatError, load_scene, save_scene
+from viewport_grid import ViewportGrid
+
 class GKSHALA(tk.Tk):
     def __init__(self):
         super().__init__()
@@ -13,7 +16,10 @@ class GKSHALA(tk.Tk):
         
         # Variables
         self.current_file = None
+        self.scene_file = None
+        self.scene_nodes = []
         self.is_maximized = False
+        self.viewport_grids = []
         
         # Custom title bar
         self.create_title_bar()
@@ -548,30 +554,9 @@ class GKSHALA(tk.Tk):
         self.viewport_tabs.add(top, text="Top")
     
     def draw_grid(self, canvas):
-        """Draw gridlines on the viewport canvas"""
-        width = canvas.winfo_width()
-        height = canvas.winfo_height()
-        
-        if width <= 1 or height <= 1:
-            return
-        
-        # Clear existing grid
-        canvas.delete("grid_line")
-        
-        # Draw vertical lines
-        for i in range(0, width, 20):
-            canvas.create_line(i, 0, i, height, fill='#333333', tags="grid_line")
-        
-        # Draw horizontal lines
-        for i in range(0, height, 20):
-            canvas.create_line(0, i, width, i, fill='#333333', tags="grid_line")
-        
-        # Draw center lines
-        canvas.create_line(width//2, 0, width//2, height, fill='#555555', width=1, tags="grid_line")
-        canvas.create_line(0, height//2, width, height//2, fill='#555555', width=1, tags="grid_line")
-        
-        # Bind resize event to redraw grid
-        canvas.bind("<Configure>", lambda e: self.draw_grid(canvas))
+        """Attach a grid to the viewport canvas that follows its size"""
+        # The grid binds its own resize handling and reuses its line items
+        self.viewport_grids.append(ViewportGrid(canvas))
     
     def create_channel_box(self):
         """Create the channel box on the right side"""
@@ -728,14 +713,16 @@ class GKSHALA(tk.Tk):
     
     def new_scene(self):
         """Create a new scene"""
+        self.close_scene_file()
         self.current_file = None
+        self.scene_nodes = []
         self.status_bar.config(text="New scene created")
         self.after(3000, lambda: self.status_bar.config(text="Ready"))
     
     def save_file(self):
         """Handle save file action"""
         if self.current_file:
-            # In a real app, you would save the file here
+            self.write_scene(self.current_file)
             self.status_bar.config(text=f"Saved {self.current_file}")
             self.after(3000, lambda: self.status_bar.config(text="Ready"))
         else:
@@ -748,8 +735,8 @@ class GKSHALA(tk.Tk):
             filetypes=[("GKSHALA Files", "*.gks"), ("All Files", "*.*")]
         )
         if file_path:
+            self.write_scene(file_path)
             self.current_file = file_path
-            # In a real app, you would save the file here
             self.status_bar.config(text=f"Saved as {file_path}")
             self.after(3000, lambda: self.status_bar.config(text="Ready"))
     
@@ -759,11 +746,42 @@ class GKSHALA(tk.Tk):
             filetypes=[("GKSHALA Files", "*.gks"), ("All Files", "*.*")]
         )
         if file_path:
+            try:
+                self.read_scene(file_path)
+            except (OSError, GKSFormatError) as e:
+                messagebox.showerror("Open Scene", str(e))
+                return
             self.current_file = file_path
-            # In a real app, you would open the file here
-            self.status_bar.config(text=f"Opened {file_path}")
+            self.status_bar.config(text=f"Opened {file_path} ({len(self.scene_nodes)} nodes)")
             self.after(3000, lambda: self.status_bar.config(text="Ready"))
     
+    def write_scene(self, file_path):
+        """Write the current scene to a .gks file"""
+        save_scene(file_path, self.scene_nodes)
+        self.read_scene(file_path)
+    
+    def read_scene(self, file_path):
+        """Map a .gks file and load its nodes"""
+        scene_file = load_scene(file_path)
+        self.close_scene_file()
+        self.scene_file = scene_file
+        self.scene_nodes = [
+            {
+                'name': entry['name'],
+                'type': entry['type'],
+                'parent': entry['parent'],
+                'attributes': entry['attributes'],
+                'arrays': scene_file.arrays(index),
+            }
+            for index, entry in enumerate(scene_file.nodes)
+        ]
+    
+    def close_scene_file(self):
+        """Release the memory map of the currently open scene"""
+        if self.scene_file is not None:
+            self.scene_file.close()
+            self.scene_file = None
+    
     def start_move(self, event):
         """Start window move on title bar drag"""
         self.x = event.x
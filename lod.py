@@ -0,0 +1,121 @@
+import numpy as np
+
+# Chunk kinds a mesh's decimated levels are saved under in a .gks file
+LOD_CHUNKS = ('lod_vertices', 'lod_indices', 'lod_levels', 'lod_bounds')
+
+# Vertex clustering grids tried at import, finest first
+LOD_GRIDS = (64, 32, 16, 8)
+
+# A level is kept only if it drops at least this share of the previous level's triangles
+LOD_MIN_REDUCTION = 0.25
+
+# Coarsest level allowed is the one whose cells stay this small on screen
+LOD_CELL_PIXELS = 4.0
+
+
+def bounding_sphere(vertices):
+    """Return (cx, cy, cz, radius) enclosing the vertices, centred on their bounding box"""
+    if not len(vertices):
+        return np.zeros(4)
+    centre = (vertices.min(axis=0) + vertices.max(axis=0)) / 2
+    radius = np.sqrt(((vertices - centre) ** 2).sum(axis=1).max())
+    return np.append(centre, radius)
+
+
+def cluster_mesh(vertices, indices, cells):
+    """Decimate a triangle mesh by merging the vertices inside each cell of a cells^3 grid
+
+    Merged vertices move to the mean of their cell; triangles that collapse
+    or duplicate another are dropped, keeping the winding of the rest.
+    """
+    low = vertices.min(axis=0)
+    extent = (vertices.max(axis=0) - low).max()
+    size = extent / cells if extent > 0 else 1.0
+    keys = np.minimum(((vertices - low) / size).astype(np.int64), cells - 1)
+    codes = (keys[:, 0] * cells + keys[:, 1]) * cells + keys[:, 2]
+    _, cluster = np.unique(codes, return_inverse=True)
+    cluster = cluster.reshape(-1)
+    counts = np.bincount(cluster)
+    merged = np.stack([np.bincount(cluster, vertices[:, axis]) / counts for axis in range(3)], axis=1)
+
+    triangles = cluster[indices]
+    a, b, c = triangles[:, 0], triangles[:, 1], triangles[:, 2]
+    triangles = triangles[(a != b) & (b != c) & (a != c)]
+    _, first = np.unique(np.sort(triangles, axis=1), axis=0, return_index=True)
+    triangles = triangles[np.sort(first)]
+
+    used, remap = np.unique(triangles, return_inverse=True)
+    return merged[used].astype(vertices.dtype), remap.reshape(-1, 3).astype(np.int32)
+
+
+def build_lods(vertices, indices, grids=LOD_GRIDS):
+    """Decimate a mesh once into .gks chunk arrays holding every coarser level
+
+    lod_levels rows are (vertex end, index end, cells) of each level within
+    the concatenated lod_vertices and lod_indices; lod_bounds is the
+    bounding sphere used to pick a level at draw time.
+    """
+    vertices = np.asarray(vertices).reshape(-1, 3)
+    indices = np.asarray(indices).reshape(-1, 3)
+    levels, level_vertices, level_indices = [], [], []
+    previous = len(indices)
+    for cells in grids:
+        if not len(indices):
+            break
+        decimated, triangles = cluster_mesh(vertices, indices, cells)
+        if len(triangles) > previous * (1 - LOD_MIN_REDUCTION):
+            continue
+        level_vertices.append(decimated)
+        level_indices.append(triangles)
+        levels.append((sum(map(len, level_vertices)), sum(map(len, level_indices)), cells))
+        previous = len(triangles)
+    return {
+        'lod_vertices': np.concatenate(level_vertices) if levels else np.empty((0, 3), vertices.dtype),
+        'lod_indices': np.concatenate(level_indices) if levels else np.empty((0, 3), np.int32),
+        'lod_levels': np.array(levels, dtype=np.int64).reshape(-1, 3),
+        'lod_bounds': bounding_sphere(vertices),
+    }
+
+
+def lod_level(arrays, level):
+    """Return (vertices, indices) of one decimated level from .gks chunk arrays"""
+    levels = arrays['lod_levels']
+    v0, i0 = (levels[level - 1, :2] if level else (0, 0))
+    v1, i1 = levels[level, :2]
+    return arrays['lod_vertices'][v0:v1], arrays['lod_indices'][i0:i1]
+
+
+def screen_diameters(bounds, models, view, projection, height):
+    """Return the on-screen diameter in pixels of a bounding sphere under each model matrix"""
+    centres = models[:, :3, :3] @ bounds[:3] + models[:, :3, 3]
+    scale = np.linalg.norm(models[:, :3, :3], axis=1).max(axis=1)
+    clip = projection @ view
+    w = centres @ clip[3, :3] + clip[3, 3]
+    # Centres behind the camera are culled anyway, so give them the coarsest level
+    return np.where(w > 1e-6, bounds[3] * scale * projection[1, 1] * height / np.maximum(w, 1e-6), 0.0)
+
+
+class LODMesh:
+    """A mesh's levels of detail, full detail first, with its bounding sphere
+
+    cells gives how many cells span each decimated level, coarsest last.
+    Levels are fetched on demand through fetch(level), so a mesh that only
+    ever draws small never pages in its full-detail buffers.
+    """
+
+    def __init__(self, bounds, cells, fetch):
+        self.bounds = np.array(bounds, dtype=np.float64)
+        self.cells = np.concatenate([[np.inf], np.asarray(cells, dtype=np.float64)])
+        self.fetch = fetch
+
+    def __len__(self):
+        return len(self.cells)
+
+    def select(self, pixels, cell_pixels=LOD_CELL_PIXELS):
+        """Return the coarsest level for each on-screen diameter that keeps cells small"""
+        fits = np.asarray(pixels)[:, None] / self.cells[None, :] <= cell_pixels
+        return fits.sum(axis=1) - 1
+
+    def mesh(self, level):
+        """Return (vertices, indices) of a level"""
+        return self.fetch(level)
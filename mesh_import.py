@@ -0,0 +1,52 @@
+import os
+
+import numpy as np
+
+from lod import build_lods
+
+
+def read_obj(path):
+    """Read a Wavefront .obj file as (vertices, triangle indices)
+
+    Polygons are fan-triangulated; texture and normal references are
+    ignored. Raises ValueError on a malformed file.
+    """
+    vertices = []
+    triangles = []
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        for number, line in enumerate(f, 1):
+            fields = line.split()
+            if not fields:
+                continue
+            # A vertex needs x, y and z, and a face at least three corners
+            if fields[0] in ('v', 'f') and len(fields) < 4:
+                raise ValueError(f"{path}:{number}: {fields[0]!r} line needs at least 3 values")
+            try:
+                if fields[0] == 'v':
+                    vertices.append([float(value) for value in fields[1:4]])
+                elif fields[0] == 'f':
+                    corners = [int(field.split('/')[0]) for field in fields[1:]]
+                    # Negative references count back from the latest vertex
+                    corners = [c - 1 if c > 0 else len(vertices) + c for c in corners]
+                    triangles.extend([corners[0], corners[k], corners[k + 1]] for k in range(1, len(corners) - 1))
+            except ValueError:
+                raise ValueError(f"{path}:{number}: cannot parse {fields[0]!r} line") from None
+    vertices = np.array(vertices, dtype=np.float32).reshape(-1, 3)
+    indices = np.array(triangles, dtype=np.int32).reshape(-1, 3)
+    if len(indices) and (indices.min() < 0 or indices.max() >= len(vertices)):
+        raise ValueError(f"{path}: face refers to a missing vertex")
+    return vertices, indices
+
+
+def import_mesh(path):
+    """Return a .gks node record for a mesh file, with its levels of detail built once"""
+    vertices, indices = read_obj(path)
+    arrays = {'vertices': vertices, 'indices': indices}
+    arrays.update(build_lods(vertices, indices))
+    return {
+        'name': os.path.splitext(os.path.basename(path))[0],
+        'type': 'Polygon',
+        'parent': -1,
+        'attributes': {},
+        'arrays': arrays,
+    }
@@ -0,0 +1,209 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Nodes added or renamed since the postings were built are matched by a
+# direct scan of their names; past this many the postings are rebuilt
+MAX_PENDING = 4096
+
+# Rows of names turned into postings per step while building, bounding
+# the temporary arrays for very large scenes
+BUILD_BLOCK = 65536
+
+
+def encode_names(names):
+    """Return names lowercased as UTF-8 bytes in a zero-padded (n, width) uint8 array"""
+    encoded = [name.lower().encode('utf-8') for name in names]
+    width = max(map(len, encoded), default=0)
+    if not width:
+        return np.zeros((len(encoded), 0), dtype=np.uint8)
+    return np.array(encoded, dtype=f'S{width}').view(np.uint8).reshape(len(encoded), width)
+
+
+def trigram_codes(chars):
+    """Return the 24-bit code of the three bytes starting at each column, zero-padded past the end"""
+    padded = np.pad(chars, ((0, 0), (0, 2))).astype(np.uint32)
+    return padded[:, :-2] << 16 | padded[:, 1:-1] << 8 | padded[:, 2:]
+
+
+class NameIndex:
+    """Case-insensitive substring search over node names and types
+
+    Every byte position of every name is posted under the trigram that
+    starts there, sorted by code, so the one- and two-byte prefixes of a
+    trigram are contiguous code ranges too. A query starts from the
+    rarest of its trigrams (or its prefix range) and checks the remaining
+    bytes with one gather each. Typing one more character narrows the
+    previous keystroke's occurrences instead when they are fewer.
+
+    Node ids are scene graph indices. Added and renamed nodes go to a
+    small pending set that is scanned directly, and their old postings
+    are masked as stale, until there are enough to rebuild.
+    """
+
+    def __init__(self, names=(), types=()):
+        self.count = 0
+        self.chars = np.zeros((64, 1), dtype=np.uint8)
+        self.alive = np.zeros(64, dtype=bool)
+        self.stale = np.zeros(64, dtype=bool)
+        self.type_codes = np.zeros(64, dtype=np.int32)
+        self.type_keys = []
+        self.type_ids = {}
+        self.pending = set()
+        self.codes = np.empty(0, dtype=np.uint32)
+        self.nodes = np.empty(0, dtype=np.int32)
+        self.starts = np.empty(0, dtype=np.int16)
+        self.version = 0
+        self._last = None
+        if len(names):
+            self.add(names, types)
+
+    def __len__(self):
+        return self.count
+
+    def _grow(self, needed, width):
+        capacity, current = self.chars.shape
+        if needed <= capacity and width <= current:
+            return
+        while capacity < needed:
+            capacity *= 2
+        chars = np.zeros((capacity, max(width, current)), dtype=np.uint8)
+        chars[:len(self.chars), :current] = self.chars
+        self.chars = chars
+        extra = capacity - len(self.alive)
+        if extra:
+            self.alive = np.concatenate([self.alive, np.zeros(extra, dtype=bool)])
+            self.stale = np.concatenate([self.stale, np.zeros(extra, dtype=bool)])
+            self.type_codes = np.concatenate([self.type_codes, np.zeros(extra, dtype=np.int32)])
+
+    def _mark_pending(self, nodes):
+        self.version += 1
+        if len(self.pending) + len(nodes) > MAX_PENDING:
+            self.rebuild()
+        else:
+            self.pending.update(nodes)
+
+    # Editing
+
+    def add(self, names, types):
+        """Index nodes appended to the scene, in node order"""
+        rows = encode_names(names)
+        start = self.count
+        end = start + len(rows)
+        if end == start:
+            return
+        # A zero column always follows the longest name
+        self._grow(end, rows.shape[1] + 1)
+        self.chars[start:end] = 0
+        self.chars[start:end, :rows.shape[1]] = rows
+        for index, node_type in enumerate(types, start):
+            if node_type not in self.type_ids:
+                self.type_ids[node_type] = len(self.type_keys)
+                self.type_keys.append(node_type.lower().encode('utf-8'))
+            self.type_codes[index] = self.type_ids[node_type]
+        self.alive[start:end] = True
+        self.count = end
+        self._mark_pending(range(start, end))
+
+    def rename(self, node, name):
+        """Index a node under a new name"""
+        row = encode_names([name])
+        self._grow(self.count, row.shape[1] + 1)
+        self.chars[node] = 0
+        self.chars[node, :row.shape[1]] = row[0]
+        self.stale[node] = True
+        self._mark_pending([node])
+
+    def remove(self, node):
+        """Stop matching a deleted node"""
+        self.alive[node] = False
+        self.stale[node] = True
+        self.pending.discard(node)
+        self.version += 1
+
+    def rebuild(self):
+        """Post every live name under its trigrams and clear the pending set"""
+        codes, nodes, starts = [], [], []
+        for first in range(0, self.count, BUILD_BLOCK):
+            chars = self.chars[first:min(first + BUILD_BLOCK, self.count)]
+            posted = (chars != 0) & self.alive[first:first + len(chars), None]
+            node, start = np.nonzero(posted)
+            codes.append(trigram_codes(chars)[posted])
+            nodes.append((node + first).astype(np.int32))
+            starts.append(start.astype(np.int16))
+        codes = np.concatenate(codes) if codes else np.empty(0, dtype=np.uint32)
+        # Stable, so each code's postings stay in node order
+        order = np.argsort(codes, kind='stable')
+        self.codes = codes[order]
+        self.nodes = np.concatenate(nodes)[order] if nodes else np.empty(0, dtype=np.int32)
+        self.starts = np.concatenate(starts)[order] if starts else np.empty(0, dtype=np.int16)
+        self.stale[:] = False
+        self.pending.clear()
+        self.version += 1
+        self._last = None
+
+    # Searching
+
+    def _occurrences(self, query):
+        """Return (nodes, starts) of every posted occurrence of a query"""
+        length = len(query)
+        padded = np.frombuffer(query + b'\0\0', dtype=np.uint8).astype(np.uint32)
+        if length < 3:
+            # A one- or two-byte query is a range of trigram codes
+            low = padded[0] << 16 | padded[1] << 8
+            grams = np.array([low]), np.array([low + (1 << 16 if length == 1 else 1 << 8)])
+        else:
+            low = padded[:length - 2] << 16 | padded[1:length - 1] << 8 | padded[2:length]
+            grams = low, low + 1
+        begin = np.searchsorted(self.codes, grams[0])
+        end = np.searchsorted(self.codes, grams[1])
+        rarest = int(np.argmin(end - begin))
+        count = int(end[rarest] - begin[rarest])
+
+        last = self._last
+        if (last is not None and last[0] == self.version and query.startswith(last[1])
+                and len(last[2]) <= count):
+            # Narrow the previous keystroke's occurrences
+            _, previous, nodes, starts = last
+            check = range(len(previous), length)
+        else:
+            span = slice(begin[rarest], end[rarest])
+            nodes = self.nodes[span].astype(np.int64)
+            starts = self.starts[span].astype(np.int64) - rarest
+            inside = starts >= 0
+            if rarest:
+                nodes, starts = nodes[inside], starts[inside]
+            check = [j for j in range(length) if not rarest <= j < rarest + 3]
+
+        flat = self.chars.reshape(-1)
+        width = self.chars.shape[1]
+        for j in check:
+            # The last column is always zero, so names too short fail
+            column = np.minimum(starts + j, width - 1)
+            keep = flat[nodes * width + column] == query[j]
+            nodes, starts = nodes[keep], starts[keep]
+        self._last = (self.version, query, nodes, starts)
+        return nodes, starts
+
+    def _pending_matches(self, query):
+        """Return the pending nodes whose names contain a query, by direct scan"""
+        if not self.pending or len(query) >= self.chars.shape[1]:
+            return np.empty(0, dtype=np.int64)
+        nodes = np.fromiter(self.pending, dtype=np.int64, count=len(self.pending))
+        windows = sliding_window_view(self.chars[nodes], len(query), axis=1)
+        target = np.frombuffer(query, dtype=np.uint8)
+        return nodes[(windows == target).all(axis=2).any(axis=1)]
+
+    def search(self, text):
+        """Return the sorted ids of live nodes whose name or type contains text, ignoring case"""
+        query = text.lower().encode('utf-8')
+        if not query:
+            return np.flatnonzero(self.alive[:self.count])
+        found = np.zeros(self.count, dtype=bool)
+        nodes, _ = self._occurrences(query)
+        found[nodes] = True
+        found &= ~self.stale[:self.count]
+        found[self._pending_matches(query)] = True
+        types = np.array([query in key for key in self.type_keys], dtype=bool)
+        if types.any():
+            found |= types[self.type_codes[:self.count]] & self.alive[:self.count]
+        return np.flatnonzero(found)
@@ -0,0 +1,271 @@
+import numpy as np
+
+from lod import LODMesh, bounding_sphere
+from primitives import grid_quads, triangulate
+
+# Chunk kinds a NURBS surface is saved as
+NURBS_CHUNKS = ('nurbs_control', 'nurbs_weights', 'nurbs_knots_u', 'nurbs_knots_v', 'nurbs_degrees')
+
+# Chordal error allowed at each level of detail, as a fraction of the bounding radius
+TESSELLATION_TOLERANCES = (0.0005, 0.002, 0.008, 0.032)
+
+# A knot span is never split into more segments than this
+MAX_SPAN_SEGMENTS = 64
+
+
+def clamped_knots(count, degree):
+    """Return a uniform knot vector clamped at both ends for count control points"""
+    return np.concatenate([np.zeros(degree), np.linspace(0, 1, count - degree + 1), np.ones(degree)])
+
+
+def find_spans(degree, knots, u):
+    """Return the knot span holding each parameter, the last span for the end of the range"""
+    last = len(knots) - degree - 2
+    return np.clip(np.searchsorted(knots, u, side='right') - 1, degree, last)
+
+
+def basis_functions(degree, knots, spans, u):
+    """Return the degree + 1 non-zero basis functions at every parameter, shape (len(u), degree + 1)
+
+    Cox-de Boor's triangular recurrence, looping over the degree only and
+    over all parameters at once.
+    """
+    u = np.asarray(u, dtype=np.float64)
+    basis = np.zeros((len(u), degree + 1))
+    basis[:, 0] = 1.0
+    left = np.zeros((len(u), degree + 1))
+    right = np.zeros((len(u), degree + 1))
+    for j in range(1, degree + 1):
+        left[:, j] = u - knots[spans + 1 - j]
+        right[:, j] = knots[spans + j] - u
+        saved = np.zeros(len(u))
+        for r in range(j):
+            denominator = right[:, r + 1] + left[:, j - r]
+            term = np.divide(basis[:, r], denominator, out=np.zeros(len(u)), where=denominator != 0)
+            basis[:, r] = saved + right[:, r + 1] * term
+            saved = left[:, j - r] * term
+        basis[:, j] = saved
+    return basis
+
+
+def homogeneous(points, weights):
+    """Return weighted points with the weight appended as a fourth coordinate"""
+    return np.concatenate([points * weights[..., None], weights[..., None]], axis=-1)
+
+
+def arc_frame(angle):
+    """Return (angles, scales, weights) of the rational quadratic control points of a circular arc
+
+    The arc is split into pieces of at most 90 degrees; each piece's middle
+    point sits where the end tangents meet, pushed out by 1/cos(half step).
+    """
+    pieces = max(1, int(np.ceil(angle / (np.pi / 2) - 1e-9)))
+    half = angle / pieces / 2
+    middle = np.arange(2 * pieces + 1) % 2 == 1
+    angles = half * np.arange(2 * pieces + 1)
+    scales = np.where(middle, 1.0 / np.cos(half), 1.0)
+    weights = np.where(middle, np.cos(half), 1.0)
+    knots = np.concatenate([[0, 0, 0], np.repeat(np.arange(1, pieces) / pieces, 2), [1, 1, 1]])
+    return angles, scales, weights, knots
+
+
+class NurbsCurve:
+    """Rational B-spline curve: control points, weights, degree and clamped knots"""
+
+    def __init__(self, points, degree=3, weights=None, knots=None):
+        self.points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        self.degree = min(degree, len(self.points) - 1)
+        self.weights = np.ones(len(self.points)) if weights is None else np.asarray(weights, dtype=np.float64)
+        self.knots = clamped_knots(len(self.points), self.degree) if knots is None \
+            else np.asarray(knots, dtype=np.float64)
+
+    @classmethod
+    def circle(cls, radius=1.0, centre=(0, 0, 0), normal=(0, 1, 0)):
+        """Return an exact circle as a rational quadratic curve"""
+        normal = np.asarray(normal, dtype=np.float64) / np.linalg.norm(normal)
+        x = np.cross(normal, [0.0, 0.0, 1.0] if abs(normal[2]) < 0.9 else [1.0, 0.0, 0.0])
+        x *= radius / np.linalg.norm(x)
+        y = np.cross(normal, x)
+        angles, scales, weights, knots = arc_frame(2 * np.pi)
+        points = np.asarray(centre) + scales[:, None] * (np.cos(angles)[:, None] * x + np.sin(angles)[:, None] * y)
+        return cls(points, 2, weights, knots)
+
+    def evaluate(self, u):
+        """Return the points at many parameters in [0, 1]"""
+        u = np.atleast_1d(np.asarray(u, dtype=np.float64))
+        spans = find_spans(self.degree, self.knots, u)
+        basis = basis_functions(self.degree, self.knots, spans, u)
+        rows = spans[:, None] - self.degree + np.arange(self.degree + 1)
+        weighted = np.einsum('mk,mkd->md', basis, homogeneous(self.points, self.weights)[rows])
+        return weighted[:, :3] / weighted[:, 3:]
+
+
+class NurbsSurface:
+    """Rational tensor-product B-spline surface
+
+    control is an (nu, nv, 3) grid of points with matching weights; u runs
+    along the first axis. Tessellations are cached per tolerance, along
+    with the levels of detail built from them, and dropped whenever a
+    control point moves.
+    """
+
+    def __init__(self, control, weights=None, degrees=(3, 3), knots_u=None, knots_v=None):
+        self.control = np.asarray(control, dtype=np.float64)
+        count_u, count_v = self.control.shape[:2]
+        self.weights = np.ones((count_u, count_v)) if weights is None else np.asarray(weights, dtype=np.float64)
+        self.degree_u = min(degrees[0], count_u - 1)
+        self.degree_v = min(degrees[1], count_v - 1)
+        self.knots_u = clamped_knots(count_u, self.degree_u) if knots_u is None \
+            else np.asarray(knots_u, dtype=np.float64)
+        self.knots_v = clamped_knots(count_v, self.degree_v) if knots_v is None \
+            else np.asarray(knots_v, dtype=np.float64)
+        self.version = 0
+        self._meshes = {}
+        self._lod = None
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        """Build a surface from the .gks chunks written by to_arrays()"""
+        return cls(np.array(arrays['nurbs_control']), np.array(arrays['nurbs_weights']),
+                   tuple(int(d) for d in arrays['nurbs_degrees']),
+                   arrays['nurbs_knots_u'], arrays['nurbs_knots_v'])
+
+    def to_arrays(self):
+        """Return the surface as .gks chunks"""
+        return {
+            'nurbs_control': self.control,
+            'nurbs_weights': self.weights,
+            'nurbs_knots_u': self.knots_u,
+            'nurbs_knots_v': self.knots_v,
+            'nurbs_degrees': np.array([self.degree_u, self.degree_v], dtype=np.int32),
+        }
+
+    def set_control_point(self, i, j, point, weight=None):
+        """Move one control point, dropping every cached tessellation"""
+        self.control[i, j] = point
+        if weight is not None:
+            self.weights[i, j] = weight
+        self.version += 1
+        self._meshes.clear()
+        self._lod = None
+
+    def evaluate(self, u, v):
+        """Return the (len(u), len(v), 3) grid of points at parameters u x v
+
+        The basis along u is contracted with the control grid first, leaving
+        one curve's worth of weighted points per u, which the v basis then
+        reduces; no (u, v, control) sized array is ever built.
+        """
+        u = np.atleast_1d(np.asarray(u, dtype=np.float64))
+        v = np.atleast_1d(np.asarray(v, dtype=np.float64))
+        spans_u = find_spans(self.degree_u, self.knots_u, u)
+        spans_v = find_spans(self.degree_v, self.knots_v, v)
+        basis_u = basis_functions(self.degree_u, self.knots_u, spans_u, u)
+        basis_v = basis_functions(self.degree_v, self.knots_v, spans_v, v)
+        weighted = homogeneous(self.control, self.weights)
+        rows = weighted[spans_u[:, None] - self.degree_u + np.arange(self.degree_u + 1)]
+        curves = np.einsum('ma,manD->mnD', basis_u, rows)
+        columns = curves[:, spans_v[:, None] - self.degree_v + np.arange(self.degree_v + 1)]
+        points = np.einsum('kb,mkbD->mkD', basis_v, columns)
+        return points[..., :3] / points[..., 3:]
+
+    def parameters(self, axis, tolerance):
+        """Return sample parameters along one axis, denser across the spans that bend most
+
+        A degree p span whose control polygon has second differences up
+        to M stays within tolerance of its chords when cut into
+        sqrt(p (p - 1) M / (8 tolerance)) segments.
+        """
+        degree, knots = (self.degree_u, self.knots_u) if axis == 0 else (self.degree_v, self.knots_v)
+        control = np.moveaxis(self.control, axis, 0)
+        starts = np.flatnonzero(np.diff(knots) > 0)
+        if degree < 2:
+            segments = np.ones(len(starts), dtype=np.int64)
+        else:
+            bend = np.linalg.norm(control[:-2] - 2 * control[1:-1] + control[2:], axis=-1).max(axis=1)
+            # Span s is shaped by control points s - degree to s, so by second differences s - degree to s - 2
+            window = np.stack([bend[starts - degree + k] for k in range(degree - 1)]).max(axis=0)
+            segments = np.ceil(np.sqrt(degree * (degree - 1) * window / (8 * tolerance)))
+            segments = np.clip(segments, 1, MAX_SPAN_SEGMENTS).astype(np.int64)
+        steps = np.arange(segments.sum()) - np.repeat(np.cumsum(segments) - segments, segments)
+        low, high = np.repeat(knots[starts], segments), np.repeat(knots[starts + 1], segments)
+        return np.append(low + (high - low) * steps / np.repeat(segments, segments), knots[-1])
+
+    def tessellate(self, tolerance):
+        """Return (vertices, triangles) within a chordal tolerance, cached until a control point moves"""
+        mesh = self._meshes.get(tolerance)
+        if mesh is None:
+            u, v = self.parameters(0, tolerance), self.parameters(1, tolerance)
+            vertices = self.evaluate(u, v).reshape(-1, 3)
+            mesh = (vertices, triangulate(vertices, grid_quads(len(u), len(v))))
+            for array in mesh:
+                array.setflags(write=False)
+            self._meshes[tolerance] = mesh
+        return mesh
+
+    def lod(self):
+        """Return the surface's levels of detail, one tessellation tolerance per level"""
+        if self._lod is None:
+            # The control hull bounds the surface
+            bounds = bounding_sphere(self.control.reshape(-1, 3))
+            radius = max(bounds[3], 1e-9)
+            tolerances = [radius * fraction for fraction in TESSELLATION_TOLERANCES]
+            # A chord of a circle of radius r sags by t over sqrt(8 r t); that many fit across 2r
+            cells = [np.sqrt(radius / (2 * tolerance)) for tolerance in tolerances[1:]]
+            self._lod = LODMesh(bounds, cells, lambda level: self.tessellate(tolerances[level]))
+        return self._lod
+
+
+def revolve(curve, angle=2 * np.pi, origin=(0, 0, 0), axis=(0, 1, 0)):
+    """Sweep a profile curve around an axis; u runs around the axis, v along the profile"""
+    axis = np.asarray(axis, dtype=np.float64) / np.linalg.norm(axis)
+    angles, scales, arc_weights, knots = arc_frame(angle)
+    relative = curve.points - origin
+    along = relative @ axis
+    centres = np.asarray(origin, dtype=np.float64) + along[:, None] * axis
+    x = relative - along[:, None] * axis
+    y = np.cross(axis, x)
+    turn = scales[:, None, None] * (np.cos(angles)[:, None, None] * x + np.sin(angles)[:, None, None] * y)
+    return NurbsSurface(centres + turn, arc_weights[:, None] * curve.weights, (2, curve.degree), knots, curve.knots)
+
+
+def loft(curves, degree=3):
+    """Skin a surface through a sequence of compatible curves
+
+    The curves become isoparms at parameters spaced by the average
+    distance between neighbours; the control rows are solved from them,
+    in homogeneous coordinates so rational curves loft exactly.
+    """
+    first = curves[0]
+    if any(len(c.points) != len(first.points) or c.degree != first.degree
+           or not np.allclose(c.knots, first.knots) for c in curves):
+        raise ValueError("lofted curves need the same degree, knots and number of control points")
+    rows = np.stack([homogeneous(c.points, c.weights) for c in curves])
+    degree = min(degree, len(curves) - 1)
+    gaps = np.linalg.norm(np.diff(rows[..., :3] / rows[..., 3:], axis=0), axis=2).mean(axis=1)
+    parameters = np.concatenate([[0], np.cumsum(gaps)]) / max(gaps.sum(), 1e-12)
+    # Knots by averaging the parameters, so every span holds a curve
+    inner = [parameters[j:j + degree].mean() for j in range(1, len(curves) - degree)]
+    knots = np.concatenate([np.zeros(degree + 1), inner, np.ones(degree + 1)])
+    spans = find_spans(degree, knots, parameters)
+    basis = basis_functions(degree, knots, spans, parameters)
+    matrix = np.zeros((len(curves), len(curves)))
+    np.put_along_axis(matrix, spans[:, None] - degree + np.arange(degree + 1), basis, axis=1)
+    solved = np.linalg.solve(matrix, rows.reshape(len(curves), -1)).reshape(rows.shape)
+    return NurbsSurface(solved[..., :3] / solved[..., 3:], solved[..., 3], (degree, first.degree),
+                        knots, first.knots)
+
+
+def extrude(curve, direction):
+    """Sweep a curve along a straight direction"""
+    control = np.stack([curve.points, curve.points + np.asarray(direction, dtype=np.float64)])
+    return NurbsSurface(control, np.stack([curve.weights, curve.weights]), (1, curve.degree),
+                        [0, 0, 1, 1], curve.knots)
+
+
+def planar(curve):
+    """Fill a closed planar curve with a surface collapsing to its centre"""
+    centre = curve.evaluate(np.linspace(0, 1, 64, endpoint=False)).mean(axis=0)
+    control = np.stack([np.broadcast_to(centre, curve.points.shape), curve.points])
+    return NurbsSurface(control, np.stack([curve.weights, curve.weights]), (1, curve.degree),
+                        [0, 0, 1, 1], curve.knots)
@@ -0,0 +1,350 @@
+import tkinter as tk
+from tkinter import ttk
+
+import numpy as np
+
+# Pixel height of one outliner row and the indent per hierarchy level
+ROW_HEIGHT = 20
+INDENT = 16
+
+
+class OutlinerModel:
+    """Rows of a scene hierarchy flattened in display order
+
+    Only the children of opened nodes are listed, so a collapsed scene of
+    any size is one array of its roots. Rows hold scene graph node ids,
+    which stay valid as nodes are added. A filter replaces the hierarchy
+    with a flat list of matching nodes until it is cleared. row_index maps
+    each node to its row, or -1, and is updated along with the rows.
+    """
+
+    def __init__(self, scene=None):
+        self.scene = scene
+        self.expanded = set()
+        self.filter = None
+        self.rows = np.empty(0, dtype=np.int64)
+        self.row_index = np.empty(0, dtype=np.int64)
+        if scene is not None:
+            self.rebuild()
+
+    def __len__(self):
+        return len(self.rows)
+
+    def set_scene(self, scene):
+        """Show another scene, or the same one after nodes were added, keeping opened nodes open"""
+        self.scene = scene
+        self.expanded = {node for node in self.expanded if node < scene.count}
+        self.rebuild()
+
+    def set_filter(self, nodes):
+        """List only the given nodes, flat and in order, or the hierarchy again with None"""
+        self.filter = None if nodes is None else np.asarray(nodes, dtype=np.int64)
+        self.rebuild()
+
+    def rebuild(self):
+        """Flatten the roots and every opened subtree in one pass"""
+        self.row_index = np.full(self.scene.count, -1, dtype=np.int64)
+        if self.filter is not None:
+            self.rows = self.filter[self.filter < self.scene.count]
+            self.index_rows()
+            return
+        parent = self.scene.parent[:self.scene.count]
+        opened = np.zeros(self.scene.count, dtype=bool)
+        opened[list(self.expanded)] = True
+        # Opened nodes under a closed parent are never reached, and are forgotten
+        self.expanded = set()
+        pieces = self.flatten(np.flatnonzero(parent < 0), opened)
+        self.rows = np.concatenate(pieces) if pieces else np.empty(0, dtype=np.int64)
+        self.index_rows()
+
+    def flatten(self, roots, opened):
+        """Return arrays that concatenate to the roots with the children of opened nodes below them"""
+        def level(nodes):
+            return nodes, iter(np.flatnonzero(opened[nodes]).tolist()), 0
+
+        pieces = []
+        # A stack rather than recursion, so a deep chain of opened nodes fits
+        stack = [level(roots)]
+        while stack:
+            nodes, hits, start = stack.pop()
+            position = next(hits, None)
+            if position is None:
+                pieces.append(nodes[start:])
+                continue
+            node = int(nodes[position])
+            self.expanded.add(node)
+            pieces.append(nodes[start:position + 1])
+            stack.append((nodes, hits, position + 1))
+            stack.append(level(self.scene.children(node)))
+        return pieces
+
+    def index_rows(self, start=0):
+        """Point row_index at the rows from start on, after they moved"""
+        self.row_index[self.rows[start:]] = np.arange(start, len(self.rows))
+
+    def has_children(self, nodes):
+        """Return whether each node has children that can be opened; none while filtered"""
+        nodes = np.asarray(nodes, dtype=np.int64)
+        if self.filter is not None:
+            return np.zeros(len(nodes), dtype=bool)
+        offsets, _ = self.scene.child_table()
+        return offsets[nodes + 1] > offsets[nodes]
+
+    def indent(self, node):
+        """Return the indent level a node's row is drawn at"""
+        return 0 if self.filter is not None else int(self.scene.depth[node])
+
+    def row_of(self, node):
+        """Return the row showing a node, or None while an ancestor is closed"""
+        if node >= len(self.row_index) or self.row_index[node] < 0:
+            return None
+        return int(self.row_index[node])
+
+    def expand(self, node):
+        """List a node's children below it"""
+        row = self.row_of(node)
+        if row is None or node in self.expanded or self.filter is not None:
+            return False
+        self.expanded.add(node)
+        children = self.scene.children(node)
+        self.rows = np.concatenate([self.rows[:row + 1], children, self.rows[row + 1:]])
+        self.index_rows(row + 1)
+        return True
+
+    def collapse(self, node):
+        """Remove every row below a node; opened descendants stay open for next time"""
+        row = self.row_of(node)
+        if row is None or node not in self.expanded or self.filter is not None:
+            return False
+        self.expanded.discard(node)
+        depth = self.scene.depth[self.rows[row + 1:]]
+        end = np.flatnonzero(depth <= self.scene.depth[node])
+        stop = row + 1 + (int(end[0]) if len(end) else len(depth))
+        self.row_index[self.rows[row + 1:stop]] = -1
+        self.rows = np.concatenate([self.rows[:row + 1], self.rows[stop:]])
+        self.index_rows(row + 1)
+        return True
+
+    def toggle(self, node):
+        """Open a closed node or close an open one"""
+        return self.collapse(node) if node in self.expanded else self.expand(node)
+
+    def reveal(self, node):
+        """Open every ancestor of a node and return its row"""
+        if self.filter is not None:
+            return self.row_of(node)
+        path = [node]
+        while self.scene.parent[path[-1]] >= 0:
+            path.append(int(self.scene.parent[path[-1]]))
+        path.reverse()
+        # Rows of nodes listed here come from the children just inserted, and
+        # everything from the first insertion on is indexed once at the end
+        row = self.row_of(path[0])
+        start = None
+        for ancestor, child in zip(path, path[1:]):
+            if row is None:
+                # Remembered as open under a closed parent; forget it
+                self.expanded.discard(ancestor)
+            elif ancestor in self.expanded:
+                row = self.row_of(child) if start is None else None
+            else:
+                self.expanded.add(ancestor)
+                children = self.scene.children(ancestor)
+                self.rows = np.concatenate([self.rows[:row + 1], children, self.rows[row + 1:]])
+                start = row + 1 if start is None else start
+                row += 1 + int(np.flatnonzero(children == child)[0])
+        if start is not None:
+            self.index_rows(start)
+        return row
+
+
+class VirtualOutliner(tk.Frame):
+    """Scene hierarchy view that only materializes the rows on screen
+
+    A small pool of canvas items is retargeted to the slice of rows in
+    view on every scroll or resize, so populating, scrolling and opening
+    cost the same for ten nodes or a million. Selection and focus are
+    scene graph node ids; clicking changes them and generates
+    <<OutlinerSelect>>, setting them from code does not.
+    """
+
+    def __init__(self, master, bg='#333333', fg='#cccccc', select_bg='#4d7cff',
+                 font=('Segoe UI', 9), row_height=ROW_HEIGHT):
+        super().__init__(master, bg=bg)
+        self.fg = fg
+        self.select_bg = select_bg
+        self.font = font
+        self.row_height = row_height
+        self.model = OutlinerModel()
+        self.top = 0
+        self.selected = []
+        self.anchor = None
+        self.focused = None
+        self.pool = []
+        self.shown = []
+
+        self.canvas = tk.Canvas(self, bg=bg, highlightthickness=0)
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self.yview)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.canvas.bind("<Configure>", lambda e: self.draw())
+        self.canvas.bind("<ButtonPress-1>", self.on_click)
+        self.canvas.bind("<Double-Button-1>", self.on_double_click)
+        self.canvas.bind("<MouseWheel>", lambda e: self.scroll(-1 if e.delta > 0 else 1, 3))
+        self.canvas.bind("<Button-4>", lambda e: self.scroll(-1, 3))
+        self.canvas.bind("<Button-5>", lambda e: self.scroll(1, 3))
+
+    def set_scene(self, scene):
+        """Show a scene graph, or refresh after nodes were added"""
+        self.model.set_scene(scene)
+        self.selected = [node for node in self.selected if node < scene.count]
+        self.draw()
+
+    def set_filter(self, nodes):
+        """Show only the given nodes as a flat list, or the whole hierarchy with None"""
+        self.model.set_filter(nodes)
+        self.top = 0
+        self.draw()
+
+    # Selection
+
+    def selection(self):
+        """Return the selected node ids"""
+        return list(self.selected)
+
+    def selection_set(self, nodes):
+        """Replace the selection without generating <<OutlinerSelect>>"""
+        self.selected = [int(node) for node in nodes]
+        self.draw()
+
+    def focus(self, node=None):
+        """Return the focused node id, or set it"""
+        if node is None:
+            return self.focused
+        self.focused = int(node)
+        self.anchor = self.focused
+        self.draw()
+
+    def see(self, node):
+        """Open a node's ancestors and scroll it into view"""
+        row = self.model.reveal(int(node))
+        if row is None:
+            return
+        visible = self.visible_rows()
+        if row < self.top:
+            self.top = row
+        elif row >= self.top + visible - 1:
+            self.top = row - visible + 2
+        self.draw()
+
+    # Scrolling
+
+    def visible_rows(self):
+        """Rows that fit in the canvas, counting a partly shown last row"""
+        return max(1, -(-self.canvas.winfo_height() // self.row_height))
+
+    def yview(self, *args):
+        """Scrollbar command: 'moveto fraction' or 'scroll n units|pages'"""
+        if args[0] == 'moveto':
+            self.top = int(float(args[1]) * len(self.model))
+        elif args[0] == 'scroll':
+            self.scroll(int(args[1]), self.visible_rows() - 1 if args[2] == 'pages' else 1)
+            return
+        self.draw()
+
+    def scroll(self, direction, rows):
+        """Move the view by a number of rows"""
+        self.top += direction * max(1, rows)
+        self.draw()
+
+    # Drawing
+
+    def draw(self):
+        """Point the row pool at the rows now in view"""
+        total = len(self.model)
+        visible = self.visible_rows()
+        self.top = max(0, min(self.top, total - visible + 1))
+        while len(self.pool) < visible:
+            self.pool.append((
+                self.canvas.create_rectangle(0, 0, 0, 0, fill=self.select_bg, width=0, state='hidden'),
+                self.canvas.create_text(0, 0, anchor=tk.W, fill=self.fg, font=self.font),
+                self.canvas.create_text(0, 0, anchor=tk.W, fill=self.fg, font=self.font),
+            ))
+            self.shown.append(None)
+
+        scene = self.model.scene
+        nodes = self.model.rows[self.top:self.top + len(self.pool)]
+        opener = self.model.has_children(nodes) if scene is not None else []
+        width = max(self.canvas.winfo_width(), 1)
+        selected = set(self.selected)
+        for slot, (background, arrow, label) in enumerate(self.pool):
+            if slot < len(nodes):
+                node = int(nodes[slot])
+                mark = ("▾" if node in self.model.expanded else "▸") if opener[slot] else ""
+                state = (node, mark, node in selected, scene.names[node], self.model.indent(node), width)
+            else:
+                state = None
+            # Skip Tk calls for rows that look the same as last time
+            if state == self.shown[slot]:
+                continue
+            self.shown[slot] = state
+            if state is None:
+                for item in (background, arrow, label):
+                    self.canvas.itemconfigure(item, state='hidden')
+                continue
+            y = slot * self.row_height
+            x = 4 + state[4] * INDENT
+            self.canvas.coords(background, 0, y, width, y + self.row_height)
+            self.canvas.itemconfigure(background, state='normal' if state[2] else 'hidden')
+            self.canvas.coords(arrow, x, y + self.row_height // 2)
+            self.canvas.itemconfigure(arrow, text=mark, state='normal')
+            self.canvas.coords(label, x + INDENT, y + self.row_height // 2)
+            self.canvas.itemconfigure(label, text=state[3], state='normal')
+
+        if total:
+            self.scrollbar.set(self.top / total, min(1.0, (self.top + visible) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    # Events
+
+    def row_at(self, y):
+        """Return (row, node) under a canvas y, or (None, None) below the last row"""
+        row = self.top + int(y // self.row_height)
+        if row >= len(self.model):
+            return None, None
+        return row, int(self.model.rows[row])
+
+    def on_click(self, event):
+        """Open or close from the arrow, otherwise select with Shift and Control extending"""
+        row, node = self.row_at(event.y)
+        if node is None:
+            return
+        x = 4 + self.model.indent(node) * INDENT
+        if x - 4 <= event.x < x + INDENT and self.model.has_children([node])[0]:
+            self.model.toggle(node)
+            self.draw()
+            return
+        if event.state & 0x0001 and self.anchor is not None:
+            start = self.model.row_of(self.anchor)
+            if start is not None:
+                low, high = min(start, row), max(start, row)
+                self.selected = [int(n) for n in self.model.rows[low:high + 1]]
+        elif event.state & 0x0004:
+            if node in self.selected:
+                self.selected.remove(node)
+            else:
+                self.selected.append(node)
+            self.anchor = node
+        else:
+            self.selected = [node]
+            self.anchor = node
+        self.focused = node
+        self.draw()
+        self.event_generate("<<OutlinerSelect>>")
+
+    def on_double_click(self, event):
+        """Open or close the row under the cursor"""
+        _, node = self.row_at(event.y)
+        if node is not None and self.model.toggle(node):
+            self.draw()
@@ -0,0 +1,75 @@
+import math
+import time
+from collections import deque
+
+
+class PlaybackClock:
+    """Frame scheduler locked to a monotonic clock
+
+    The frame to show is always derived from the time since playback
+    started, so late ticks never accumulate drift: when evaluation falls
+    behind, the skipped frames are counted as dropped instead.
+    """
+
+    def __init__(self, fps=24.0, clock=time.perf_counter):
+        self.fps = fps
+        self.clock = clock
+        self.start_frame = 1
+        self.end_frame = 100
+        self.loop = False
+        self.dropped = 0
+        self.shown = 0
+        self._origin = 0.0
+        self._anchor = 1
+        self._last = None
+        self._recent = deque()
+
+    def start(self, frame, start_frame, end_frame, loop=False):
+        """Begin playback at frame within the inclusive range"""
+        self.start_frame = start_frame
+        self.end_frame = max(start_frame, end_frame)
+        self.loop = loop
+        self.dropped = 0
+        self.shown = 0
+        self._recent.clear()
+        self._anchor = min(max(frame, start_frame), self.end_frame)
+        self._origin = self.clock()
+        self._last = None
+
+    def tick(self):
+        """Return the frame due now, or None once a non-looping range has ended"""
+        now = self.clock()
+        elapsed_frames = int((now - self._origin) * self.fps)
+        frame = self._anchor + elapsed_frames
+        length = self.end_frame - self.start_frame + 1
+        if frame > self.end_frame:
+            if not self.loop:
+                return None
+            frame = self.start_frame + (frame - self.start_frame) % length
+
+        if frame == self._last:
+            return frame
+        if self._last is not None:
+            step = (frame - self._last) % length if self.loop else frame - self._last
+            self.dropped += max(0, step - 1)
+        self._last = frame
+        self.shown += 1
+
+        # Rolling one-second window for the achieved rate
+        self._recent.append(now)
+        while now - self._recent[0] > 1.0:
+            self._recent.popleft()
+        return frame
+
+    def delay_ms(self):
+        """Milliseconds until the next frame is due"""
+        elapsed = (self.clock() - self._origin) * self.fps
+        next_frame = math.floor(elapsed) + 1
+        return max(1, int(math.ceil((next_frame - elapsed) / self.fps * 1000)))
+
+    def achieved_fps(self):
+        """Frames actually shown during the last second"""
+        if len(self._recent) < 2:
+            return 0.0
+        span = self._recent[-1] - self._recent[0]
+        return (len(self._recent) - 1) / span if span > 0 else 0.0
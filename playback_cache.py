@@ -0,0 +1,316 @@
+import multiprocessing
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from animation import evaluate_packed, scatter_channels
+from scene_graph import TRANSFORM_COLUMNS, compose_matrices
+
+# Frames handed to a worker process per task
+FRAMES_PER_TASK = 8
+
+# Shared blocks this worker process has attached, by name
+_attached = {}
+
+# (block name, snapshot) of the last snapshot this worker process read
+_snapshot = (None, None)
+
+
+def cache_arrays(buffer, frame_count, channel_count, node_count):
+    """Return the (values, local, world) arrays laid out in a cache block"""
+    values_size = frame_count * channel_count * 8
+    matrix_size = frame_count * node_count * 16 * 8
+    values = np.ndarray((frame_count, channel_count), buffer=buffer)
+    local = np.ndarray((frame_count, node_count, 4, 4), buffer=buffer, offset=values_size)
+    world = np.ndarray((frame_count, node_count, 4, 4), buffer=buffer, offset=values_size + matrix_size)
+    return values, local, world
+
+
+def evaluate_frames(snapshot, values, local, world, rows, frames, stale):
+    """Evaluate the stale nodes of some frames into cache rows"""
+    packed = snapshot['packed']
+    columns = {column: array.copy() for column, array in snapshot['columns'].items()}
+    nodes, parent_pos = snapshot['affected'], snapshot['parent_pos']
+    animated, static = snapshot['animated'], snapshot['static']
+    for row, frame, mask in zip(rows, frames, stale):
+        # Curves outside the stale subtrees keep their cached values
+        if mask.all():
+            values[row] = evaluate_packed(packed, frame)
+            scatter_channels(packed, values[row], columns)
+        else:
+            channels = np.flatnonzero(mask[snapshot['channel_pos']])
+            values[row, channels] = evaluate_packed(packed, frame, channels)
+            scatter_channels(packed, values[row, channels], columns, channels)
+        moving = animated[mask[animated]]
+        targets = nodes[moving]
+        local[row, moving] = compose_matrices(columns['translate'][targets], columns['rotate'][targets],
+                                              columns['scale'][targets])
+        still = static[mask[static]]
+        local[row, still] = snapshot['local'][still]
+
+        # Stale nodes form whole subtrees, so parents outside the mask are current
+        for group in snapshot['groups']:
+            group = group[mask[group]]
+            if not len(group):
+                continue
+            parents = parent_pos[group]
+            inner = parents >= 0
+            world[row, group[inner]] = world[row, parents[inner]] @ local[row, group[inner]]
+            outer = group[~inner]
+            world[row, outer] = snapshot['parent_world'][outer] @ local[row, outer]
+
+
+def read_snapshot(name):
+    """Return the snapshot pickled into a shared block, unpickling it once per worker process"""
+    global _snapshot
+    if _snapshot[0] != name:
+        block = shared_memory.SharedMemory(name=name)
+        try:
+            _snapshot = (name, pickle.loads(bytes(block.buf)))
+        finally:
+            block.close()
+    return _snapshot[1]
+
+
+def fill_frames(name, shape, snapshot_name, rows, frames, stale):
+    """Worker process entry point: evaluate frames straight into the shared block"""
+    snapshot = read_snapshot(snapshot_name)
+    block = _attached.get(name)
+    if block is None:
+        for old in _attached.values():
+            old.close()
+        _attached.clear()
+        block = _attached[name] = shared_memory.SharedMemory(name=name)
+    values, local, world = cache_arrays(block.buf, *shape)
+    evaluate_frames(snapshot, values, local, world, rows, frames, stale)
+    return len(rows)
+
+
+class PlaybackCache:
+    """World transforms for a frame range, precomputed into shared memory
+
+    The range is split into chunks evaluated by a pool of worker processes
+    that write straight into one shared block, after which playing a frame
+    is a copy of its matrices into the scene graph. Each frame keeps a
+    stale mask over the animated subtrees, so an edit only re-evaluates
+    the frames a key can influence, and only below the edited nodes.
+    The scene snapshot the workers read is pickled into a shared block of
+    its own once per update, so a task sends only its frame rows.
+    """
+
+    def __init__(self, workers=None):
+        self.workers = workers if workers is not None else os.cpu_count() or 1
+        self.start = 1
+        self.end = 0
+        self.shape = None
+        self.stale = None
+        self.inflight = None
+        self.snapshot = None
+        self._layout = None
+        self._block = None
+        self._snapshot_block = None
+        self._arrays = None
+        self._current = False
+        self._pool = None
+        self._tasks = []
+        self._retired = []
+
+    def __len__(self):
+        return self.end - self.start + 1 if self._layout is not None else 0
+
+    def nbytes(self):
+        """Size of the shared block"""
+        return self._block.size if self._block is not None else 0
+
+    def update(self, scene, keyframes, start, end):
+        """Match the cache to the scene and range, then queue every stale frame
+
+        The scene's world matrices must be up to date when this is called.
+        """
+        packed = keyframes.pack()
+        layout = (start, end, scene.count, packed['live'].tobytes(), packed['animated_nodes'].tobytes())
+        if layout != self._layout:
+            self._allocate(scene, packed, start, end)
+            self._layout = layout
+        self._take_snapshot(scene, packed)
+        self._dispatch()
+
+    def invalidate(self, scene, nodes, first=-np.inf, last=np.inf):
+        """Mark the subtrees below nodes stale for the frames between first and last"""
+        self._current = False
+        if self._layout is None:
+            return
+        lo = int(np.floor(max(first, self.start)))
+        hi = int(np.ceil(min(last, self.end)))
+        if lo > hi:
+            return
+        below = scene.descendants(nodes)
+        mask = np.isin(self.snapshot['affected'], below)
+        self.stale[lo - self.start:hi - self.start + 1, mask] = True
+
+    def reset(self):
+        """Forget the cached range entirely"""
+        self._layout = None
+        self._current = False
+        self._retire()
+
+    def poll(self):
+        """Collect finished chunks and return how many frames are still pending"""
+        running = []
+        for future, rows in self._tasks:
+            if future.done():
+                future.result()
+                self.inflight[rows] = False
+            else:
+                running.append((future, rows))
+        self._tasks = running
+        self._retired = [(block, tasks) for block, tasks in self._retired if not self._release(block, tasks)]
+        self._dispatch()
+        if self._layout is None:
+            return 0
+        return int(np.count_nonzero(self.inflight | self.stale.any(axis=1)))
+
+    def ready(self, frame):
+        """True if a frame can be played straight from the cache"""
+        if self._layout is None or not self.start <= frame <= self.end:
+            return False
+        row = frame - self.start
+        return not self.inflight[row] and not self.stale[row].any()
+
+    def filled(self):
+        """Number of frames that can be played from the cache"""
+        if self._layout is None:
+            return 0
+        return int(np.count_nonzero(~self.inflight & ~self.stale.any(axis=1)))
+
+    def apply(self, frame, scene):
+        """Copy a cached frame into the scene graph"""
+        values, local, world = self._arrays
+        row = frame - self.start
+        scatter_channels(self.snapshot['packed'], values[row],
+                         {column: getattr(scene, column) for column in TRANSFORM_COLUMNS})
+        scene.set_pose(self.snapshot['affected'], local[row], world[row])
+        return len(self.snapshot['affected'])
+
+    def close(self):
+        """Stop the worker processes and free the shared block"""
+        self.reset()
+        for block, tasks in self._retired:
+            for future, _ in tasks:
+                future.cancel()
+            for future, _ in tasks:
+                if not future.cancelled():
+                    future.exception()
+            self._release(block, [])
+        self._retired = []
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def _allocate(self, scene, packed, start, end):
+        self._retire()
+        animated = packed['animated_nodes']
+        affected = scene.descendants(animated) if len(animated) else np.empty(0, dtype=np.int64)
+        depth = scene.depth[affected]
+        order = np.argsort(depth, kind='stable')
+        affected = affected[order]
+        positions = np.arange(len(affected))
+        groups = np.split(positions, np.flatnonzero(np.diff(depth[order])) + 1) if len(affected) else []
+
+        # Parent of each affected node as a position in the cache, or -1
+        # when the parent is static and its world matrix comes from the scene
+        lookup = np.full(scene.count, -1, dtype=np.int64)
+        lookup[affected] = positions
+        parents = scene.parent[affected]
+        parent_pos = np.where(parents >= 0, lookup[np.maximum(parents, 0)], -1)
+        is_animated = np.isin(affected, animated)
+
+        frame_count = end - start + 1
+        self.start, self.end = start, end
+        self.shape = (frame_count, len(packed['starts']), len(affected))
+        size = frame_count * (self.shape[1] * 8 + self.shape[2] * 2 * 16 * 8)
+        self._block = shared_memory.SharedMemory(create=True, size=max(1, size))
+        self._arrays = cache_arrays(self._block.buf, *self.shape)
+        self.stale = np.ones((frame_count, len(affected)), dtype=bool)
+        self.inflight = np.zeros(frame_count, dtype=bool)
+        self.snapshot = {
+            'affected': affected,
+            'channel_pos': lookup[packed['nodes']],
+            'parent_pos': parent_pos,
+            'animated': positions[is_animated],
+            'static': positions[~is_animated],
+            'groups': groups,
+        }
+
+    def _take_snapshot(self, scene, packed):
+        affected = self.snapshot['affected']
+        parents = scene.parent[affected]
+        parent_world = np.where((parents >= 0)[:, None, None], scene.world[np.maximum(parents, 0)], np.eye(4))
+        n = scene.count
+        self.snapshot.update({
+            'packed': packed,
+            'columns': {column: getattr(scene, column)[:n].copy() for column in TRANSFORM_COLUMNS},
+            'local': scene.local[affected],
+            'parent_world': parent_world,
+        })
+        self._unpublish()
+        self._current = True
+
+    def _dispatch(self):
+        if self._layout is None or not self._current:
+            return
+        rows = np.flatnonzero(self.stale.any(axis=1) & ~self.inflight)
+        if not len(rows):
+            return
+        stale = self.stale[rows]
+        self.stale[rows] = False
+        self.inflight[rows] = True
+        if self.workers == 0:
+            evaluate_frames(self.snapshot, *self._arrays, rows, rows + self.start, stale)
+            self.inflight[rows] = False
+            return
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context('spawn'))
+        if self._snapshot_block is None:
+            self._publish()
+        for lo in range(0, len(rows), FRAMES_PER_TASK):
+            chunk = rows[lo:lo + FRAMES_PER_TASK]
+            future = self._pool.submit(fill_frames, self._block.name, self.shape, self._snapshot_block.name,
+                                       chunk, chunk + self.start, stale[lo:lo + FRAMES_PER_TASK])
+            self._tasks.append((future, chunk))
+
+    def _publish(self):
+        data = pickle.dumps(self.snapshot, protocol=pickle.HIGHEST_PROTOCOL)
+        self._snapshot_block = shared_memory.SharedMemory(create=True, size=len(data))
+        self._snapshot_block.buf[:len(data)] = data
+
+    def _unpublish(self):
+        # Tasks queued so far read the old snapshot; free it once they finish
+        if self._snapshot_block is None:
+            return
+        if not self._release(self._snapshot_block, self._tasks):
+            self._retired.append((self._snapshot_block, list(self._tasks)))
+        self._snapshot_block = None
+
+    def _retire(self):
+        # Workers may still be writing into the old block; free it once they finish
+        self._unpublish()
+        if self._block is None:
+            return
+        for future, _ in self._tasks:
+            future.cancel()
+        self._arrays = None
+        if not self._release(self._block, self._tasks):
+            self._retired.append((self._block, self._tasks))
+        self._block = None
+        self._tasks = []
+
+    def _release(self, block, tasks):
+        if not all(future.done() for future, _ in tasks):
+            return False
+        block.close()
+        block.unlink()
+        return True
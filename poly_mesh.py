@@ -0,0 +1,308 @@
+import numpy as np
+
+# Signed plane distances closer to zero than this count as on the positive side
+PLANE_EPSILON = 1e-9
+
+
+def face_mask(count, faces):
+    """Return a boolean mask over count faces from face ids or a mask"""
+    faces = np.asarray(faces)
+    if faces.dtype == bool:
+        return faces
+    mask = np.zeros(count, dtype=bool)
+    mask[faces] = True
+    return mask
+
+
+def normalize(vectors):
+    """Scale rows to unit length, leaving zero rows at zero"""
+    length = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return np.divide(vectors, length, out=np.zeros_like(vectors), where=length > 0)
+
+
+class PolyMesh:
+    """Polygons of any size held in compact arrays
+
+    Face f uses the vertex ids corners[offsets[f]:offsets[f + 1]],
+    counter-clockwise around its normal. Half-edges are implicit: corner c
+    runs from its vertex to the vertex of next_corners()[c]. Operators
+    return a new mesh and never write into the arrays they were given.
+    """
+
+    def __init__(self, vertices, offsets, corners):
+        self.vertices = np.asarray(vertices, dtype=np.float64).reshape(-1, 3)
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.corners = np.asarray(corners, dtype=np.int64)
+
+    @classmethod
+    def from_faces(cls, vertices, faces):
+        """Build a mesh from an (n, k) array of faces that all have k corners"""
+        faces = np.asarray(faces).reshape(len(faces), -1)
+        return cls(vertices, np.arange(len(faces) + 1) * faces.shape[1], faces.reshape(-1))
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        """Build a mesh from the .gks chunks written by to_arrays()"""
+        return cls(arrays['vertices'], arrays['face_offsets'], arrays['face_vertices'])
+
+    def to_arrays(self):
+        """Return .gks chunks: the polygons plus the triangles they are drawn with"""
+        return {
+            'vertices': self.vertices,
+            'indices': self.triangles().astype(np.int32),
+            'face_offsets': self.offsets,
+            'face_vertices': self.corners.astype(np.int32),
+        }
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def sizes(self):
+        """Return the number of corners of every face"""
+        return np.diff(self.offsets)
+
+    def face_of_corners(self):
+        """Return the face each corner belongs to"""
+        return np.repeat(np.arange(len(self)), self.sizes())
+
+    def next_corners(self):
+        """Return the corner after each corner around its face"""
+        following = np.arange(1, len(self.corners) + 1)
+        following[self.offsets[1:] - 1] = self.offsets[:-1]
+        return following
+
+    def centroids(self):
+        """Return the mean corner position of every face"""
+        sums = np.add.reduceat(self.vertices[self.corners], self.offsets[:-1], axis=0)
+        return sums / self.sizes()[:, None]
+
+    def area_vectors(self):
+        """Return every face's normal scaled by its area, by Newell's method"""
+        points = self.vertices[self.corners]
+        following = points[self.next_corners()]
+        return np.add.reduceat(np.cross(points, following), self.offsets[:-1], axis=0) / 2
+
+    def normals(self):
+        """Return every face's unit normal"""
+        return normalize(self.area_vectors())
+
+    def triangles(self):
+        """Return the fan triangulation of every face as (n, 3) vertex ids"""
+        fans = np.maximum(self.sizes() - 2, 0)
+        face = np.repeat(np.arange(len(self)), fans)
+        step = np.arange(len(face)) - np.repeat(np.cumsum(fans) - fans, fans)
+        first = self.offsets[face]
+        return np.stack([self.corners[first], self.corners[first + step + 1],
+                         self.corners[first + step + 2]], axis=1)
+
+    def half_edge_keys(self):
+        """Return a sortable key per half-edge, from its corner's vertex to the next corner's"""
+        count = len(self.vertices)
+        return self.corners * count + self.corners[self.next_corners()]
+
+    def twins(self):
+        """Return the opposite half-edge of every corner, -1 on open borders"""
+        keys = self.half_edge_keys()
+        count = len(self.vertices)
+        opposite = (keys % count) * count + keys // count
+        order = np.argsort(keys, kind='stable')
+        position = np.minimum(np.searchsorted(keys[order], opposite), len(keys) - 1)
+        found = order[position]
+        return np.where(keys[found] == opposite, found, -1)
+
+    def remove_faces(self, mask):
+        """Return the corners and offsets of the faces not in a mask"""
+        keep = ~mask
+        corners = self.corners[keep[self.face_of_corners()]]
+        offsets = np.concatenate([[0], np.cumsum(self.sizes()[keep])])
+        return offsets, corners
+
+    def bounds(self):
+        """Return the (low, high) corners of the vertex bounding box"""
+        return self.vertices.min(axis=0), self.vertices.max(axis=0)
+
+
+def weld(mesh, decimals=9):
+    """Merge vertices that coincide, dropping corners and faces that collapse
+
+    Joins the seams and poles of a UV sphere; a corner is dropped when it
+    repeats the vertex before it and a face when fewer than three remain.
+    """
+    _, first, remap = np.unique(mesh.vertices.round(decimals), axis=0, return_index=True, return_inverse=True)
+    # Keep vertex order stable by numbering merged vertices by first use
+    order = np.argsort(first)
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    corners = rank[remap.reshape(-1)][mesh.corners]
+    keep = corners != corners[mesh.next_corners()]
+    sizes = np.add.reduceat(keep, mesh.offsets[:-1]) if len(mesh) else np.zeros(0, dtype=np.int64)
+    face_of = mesh.face_of_corners()
+    keep &= (sizes >= 3)[face_of]
+    offsets = np.concatenate([[0], np.cumsum(sizes[sizes >= 3])])
+    return PolyMesh(mesh.vertices[first[order]], offsets, corners[keep])
+
+
+def add_faces(offsets, corners, faces):
+    """Append an (n, k) array of faces to compact face arrays"""
+    faces = np.asarray(faces)
+    offsets = np.concatenate([offsets, offsets[-1] + np.arange(1, len(faces) + 1) * faces.shape[1]])
+    return offsets, np.concatenate([corners, faces.reshape(-1)])
+
+
+def extrude(mesh, faces, distance, together=True, inset=0.0):
+    """Extrude faces along their normals by distance
+
+    With together, adjacent selected faces stay joined and move as one
+    region along their averaged vertex normals; walls are only added on
+    the region's border. Otherwise every face is extruded on its own and
+    its new corners are pulled towards its centroid by the inset fraction,
+    and distance may be one value per face. The extruded faces keep their
+    ids; walls are appended after them.
+    """
+    selected = face_mask(len(mesh), faces)
+    face_of = mesh.face_of_corners()
+    following = mesh.next_corners()
+    picked = np.flatnonzero(selected[face_of])
+    normals = mesh.normals()
+    vertex_count = len(mesh.vertices)
+
+    if together:
+        # One new vertex per vertex of the region, moved along its averaged normal
+        used = mesh.corners[picked]
+        region = np.unique(used)
+        moved = np.full(vertex_count, -1, dtype=np.int64)
+        moved[region] = vertex_count + np.arange(len(region))
+        direction = np.stack([np.bincount(used, normals[face_of[picked], axis], vertex_count)
+                              for axis in range(3)], axis=1)[region]
+        positions = mesh.vertices[region] + normalize(direction) * distance
+        corner_moved = np.full(len(mesh.corners), -1, dtype=np.int64)
+        corner_moved[picked] = moved[used]
+        twins = mesh.twins()
+        border = picked[(twins[picked] < 0) | ~selected[face_of[twins[picked]]]]
+    else:
+        # One new vertex per corner, so each face gets walls all around
+        face = face_of[picked]
+        points = mesh.vertices[mesh.corners[picked]]
+        points = points + (mesh.centroids()[face] - points) * inset
+        lift = np.broadcast_to(np.asarray(distance, dtype=np.float64), (len(mesh),))[face]
+        positions = points + normals[face] * lift[:, None]
+        corner_moved = np.full(len(mesh.corners), -1, dtype=np.int64)
+        corner_moved[picked] = vertex_count + np.arange(len(picked))
+        border = picked
+
+    corners = mesh.corners.copy()
+    corners[picked] = corner_moved[picked]
+    walls = np.stack([mesh.corners[border], mesh.corners[following[border]],
+                      corner_moved[following[border]], corner_moved[border]], axis=1)
+    offsets, corners = add_faces(mesh.offsets, corners, walls)
+    return PolyMesh(np.concatenate([mesh.vertices, positions]), offsets, corners)
+
+
+def bevel(mesh, faces, fraction):
+    """Chamfer faces: inset each by fraction towards its centroid and lift it as far
+
+    This is a polygon bevel (extrude plus outline) applied to each face on
+    its own; the lift matches the inset so the new border walls sit at
+    roughly 45 degrees.
+    """
+    face_of = mesh.face_of_corners()
+    # A face's mean corner distance from its centroid sets how far its inset reaches
+    spread = np.linalg.norm(mesh.vertices[mesh.corners] - mesh.centroids()[face_of], axis=1)
+    radius = np.add.reduceat(spread, mesh.offsets[:-1]) / mesh.sizes()
+    return extrude(mesh, faces, radius * fraction, together=False, inset=fraction)
+
+
+def bridge(mesh, faces_a, faces_b):
+    """Remove pairs of facing faces and join each pair with a tube of quads
+
+    faces_a[i] and faces_b[i] must have the same number of corners. Each
+    b ring is turned to start at the corner nearest a's first corner.
+    """
+    faces_a = np.asarray(faces_a, dtype=np.int64)
+    faces_b = np.asarray(faces_b, dtype=np.int64)
+    sizes = mesh.sizes()
+    if len(faces_a) != len(faces_b):
+        raise ValueError("bridge needs as many faces on each side")
+    if np.any(sizes[faces_a] != sizes[faces_b]):
+        raise ValueError("bridged faces must have the same number of corners")
+    removed = face_mask(len(mesh), faces_a)
+    if np.any(removed[faces_b]) or len(np.unique(faces_a)) != len(faces_a) \
+            or len(np.unique(faces_b)) != len(faces_b):
+        raise ValueError("a face can only be bridged once")
+    removed[faces_b] = True
+
+    offsets, corners = mesh.remove_faces(removed)
+    # Pairs are batched by ring size, so each batch is a rectangular array
+    for size in np.unique(sizes[faces_a]).tolist():
+        batch = sizes[faces_a] == size
+        ring = np.arange(size)
+        a = mesh.corners[mesh.offsets[faces_a[batch]][:, None] + ring]
+        # b winds the other way round the tube, so walk it backwards
+        b = mesh.corners[mesh.offsets[faces_b[batch]][:, None] + (-ring % size)]
+        start = mesh.vertices[a[:, 0]]
+        nearest = np.argmin(np.linalg.norm(mesh.vertices[b] - start[:, None], axis=2), axis=1)
+        b = np.take_along_axis(b, (nearest[:, None] + ring) % size, axis=1)
+        after = (ring + 1) % size
+        walls = np.stack([a, a[:, after], b[:, after], b], axis=2)
+        offsets, corners = add_faces(offsets, corners, walls.reshape(-1, 4))
+    return PolyMesh(mesh.vertices, offsets, corners)
+
+
+def multi_cut(mesh, faces, origin, normal):
+    """Slice faces with a plane, splitting each one it crosses in two
+
+    A new vertex is added where the plane crosses an edge of a selected
+    face and shared by both faces on that edge, so unselected neighbours
+    gain the vertex too rather than leaving a crack. Faces crossed more
+    than twice, which only concave ones are, keep their new vertices but
+    are not split. The first half of a split face keeps its id.
+    """
+    selected = face_mask(len(mesh), faces)
+    face_of = mesh.face_of_corners()
+    following = mesh.next_corners()
+    distance = (mesh.vertices - origin) @ np.asarray(normal, dtype=np.float64)
+    distance[np.abs(distance) < PLANE_EPSILON] = PLANE_EPSILON
+    start, end = mesh.corners, mesh.corners[following]
+    crossing = (distance[start] > 0) != (distance[end] > 0)
+
+    # One new vertex per crossed edge of a selected face, keyed by its sorted vertex pair
+    count = len(mesh.vertices)
+    edge = np.minimum(start, end) * count + np.maximum(start, end)
+    cut_edges = np.unique(edge[crossing & selected[face_of]])
+    cut = crossing & np.isin(edge, cut_edges)
+    low, high = cut_edges // count, cut_edges % count
+    t = distance[low] / (distance[low] - distance[high])
+    points = mesh.vertices[low] + (mesh.vertices[high] - mesh.vertices[low]) * t[:, None]
+    new_vertex = count + np.searchsorted(cut_edges, edge[cut])
+
+    # Each corner is followed by the new vertex on its outgoing edge, if that edge was cut
+    width = 1 + cut
+    position = np.cumsum(width) - width
+    ring = np.empty(position[-1] + width[-1] if len(width) else 0, dtype=np.int64)
+    ring[position] = mesh.corners
+    ring[position[cut] + 1] = new_vertex
+    cuts = np.bincount(face_of[cut], minlength=len(mesh))
+    ring_offsets = np.concatenate([[0], np.cumsum(mesh.sizes() + cuts)])
+    ring_sizes = np.diff(ring_offsets)
+
+    # Split convex selected faces at the two new vertices of their ring
+    split = selected & (cuts == 2)
+    marks = np.flatnonzero(cut & split[face_of])
+    first, second = marks[0::2], marks[1::2]
+    faces_split = face_of[first]
+    p = position[first] + 1 - ring_offsets[faces_split]
+    q = position[second] + 1 - ring_offsets[faces_split]
+
+    shift = np.zeros(len(mesh), dtype=np.int64)
+    size = ring_sizes.copy()
+    shift[faces_split] = p
+    size[faces_split] = q - p + 1
+    parts_start = np.concatenate([ring_offsets[:-1], ring_offsets[faces_split]])
+    parts_length = np.concatenate([ring_sizes, ring_sizes[faces_split]])
+    parts_shift = np.concatenate([shift, q])
+    parts_size = np.concatenate([size, ring_sizes[faces_split] - q + p + 1])
+    step = np.arange(parts_size.sum()) - np.repeat(np.cumsum(parts_size) - parts_size, parts_size)
+    gather = np.repeat(parts_start, parts_size) + (np.repeat(parts_shift, parts_size) + step) \
+        % np.repeat(parts_length, parts_size)
+    offsets = np.concatenate([[0], np.cumsum(parts_size)])
+    return PolyMesh(np.concatenate([mesh.vertices, points]), offsets, ring[gather])
@@ -0,0 +1,135 @@
+import numpy as np
+
+from lod import LODMesh, bounding_sphere
+
+# Tessellation used when a primitive does not name one
+DEFAULT_RESOLUTION = {'cube': 1, 'sphere': 32, 'plane': 10}
+
+# Spheres drawn small fall back to halved resolutions down to this one
+MIN_SPHERE_RESOLUTION = 8
+
+
+def cube_mesh(resolution=1):
+    """Return (vertices, quads) of a cube spanning -1 to 1; resolution is unused"""
+    vertices = np.array([[1, 1, 1], [-1, 1, 1], [-1, -1, 1], [1, -1, 1],
+                         [1, 1, -1], [-1, 1, -1], [-1, -1, -1], [1, -1, -1]], dtype=np.float64)
+    quads = np.array([[0, 1, 2, 3], [4, 7, 6, 5], [0, 4, 5, 1],
+                      [2, 6, 7, 3], [1, 5, 6, 2], [0, 3, 7, 4]], dtype=np.int32)
+    return vertices, quads
+
+
+def grid_quads(rows, columns):
+    """Return the quads joining a rows x columns vertex grid, wound so spheres face outwards"""
+    r, c = np.meshgrid(np.arange(rows - 1), np.arange(columns - 1), indexing='ij')
+    a = r * columns + c
+    return np.stack([a, a + 1, a + columns + 1, a + columns], axis=-1).reshape(-1, 4).astype(np.int32)
+
+
+def sphere_mesh(resolution=32):
+    """Return (vertices, quads) of a unit UV sphere sampled resolution times along each axis"""
+    u = np.linspace(0, 2 * np.pi, resolution)
+    v = np.linspace(0, np.pi, resolution)
+    grid = np.stack([np.outer(np.cos(u), np.sin(v)),
+                     np.outer(np.sin(u), np.sin(v)),
+                     np.outer(np.ones(resolution), np.cos(v))], axis=-1)
+    return grid.reshape(-1, 3), grid_quads(resolution, resolution)
+
+
+def plane_mesh(resolution=10):
+    """Return (vertices, quads) of a plane spanning -1 to 1 on XZ in resolution squares per side"""
+    steps = np.linspace(-1, 1, resolution + 1)
+    x, z = np.meshgrid(steps, steps, indexing='ij')
+    vertices = np.stack([x, np.zeros_like(x), z], axis=-1).reshape(-1, 3)
+    return vertices, grid_quads(resolution + 1, resolution + 1)
+
+
+def triangulate(vertices, quads):
+    """Split quads into triangles, dropping the zero-area ones at collapsed poles"""
+    triangles = quads[:, [0, 1, 2, 0, 2, 3]].reshape(-1, 3)
+    p0, p1, p2 = vertices[triangles[:, 0]], vertices[triangles[:, 1]], vertices[triangles[:, 2]]
+    area = np.linalg.norm(np.cross(p1 - p0, p2 - p0), axis=1)
+    return triangles[area > 1e-12]
+
+
+def translation_matrix(offset):
+    """Return a 4x4 matrix moving points by offset"""
+    matrix = np.eye(4)
+    matrix[:3, 3] = offset
+    return matrix
+
+
+def transform_points(points, matrix):
+    """Apply a 4x4 affine matrix to (n, 3) points"""
+    return points @ matrix[:3, :3].T + matrix[:3, 3]
+
+
+class PrimitiveLibrary:
+    """Shared tessellations of the built-in primitives
+
+    Each (type, resolution) mesh is built on first use and handed out as
+    read-only vertex and face buffers, so every instance of it shares the
+    same memory and carries nothing but its own 4x4 transform.
+    """
+
+    BUILDERS = {'cube': cube_mesh, 'sphere': sphere_mesh, 'plane': plane_mesh}
+
+    def __init__(self):
+        self.meshes = {}
+        self.lods = {}
+        self.builds = 0
+
+    def __len__(self):
+        return len(self.meshes)
+
+    def key(self, kind, resolution=None):
+        """Return the cache key of a primitive, filling in its default resolution"""
+        if kind not in self.BUILDERS:
+            raise ValueError(f"unknown primitive {kind!r}")
+        if kind == 'cube' or resolution is None:
+            resolution = DEFAULT_RESOLUTION[kind]
+        return kind, int(resolution)
+
+    def mesh(self, kind, resolution=None):
+        """Return the shared (vertices, quads, triangles) buffers of a primitive"""
+        key = self.key(kind, resolution)
+        mesh = self.meshes.get(key)
+        if mesh is None:
+            vertices, quads = self.BUILDERS[key[0]](key[1])
+            mesh = (vertices, quads, triangulate(vertices, quads))
+            for array in mesh:
+                array.setflags(write=False)
+            self.meshes[key] = mesh
+            self.builds += 1
+        return mesh
+
+    def lod(self, kind, resolution=None):
+        """Return the levels of detail of a primitive as an LODMesh
+
+        A sphere's coarser levels are the same sphere at halved
+        resolutions; the other primitives are already minimal.
+        """
+        key = self.key(kind, resolution)
+        lod = self.lods.get(key)
+        if lod is None:
+            resolutions = [key[1]]
+            while kind == 'sphere' and resolutions[-1] // 2 >= MIN_SPHERE_RESOLUTION:
+                resolutions.append(resolutions[-1] // 2)
+
+            def fetch(level):
+                vertices, _, triangles = self.mesh(kind, resolutions[level])
+                return vertices, triangles
+
+            # About resolution / pi segments span a sphere's diameter
+            cells = [r / np.pi for r in resolutions[1:]]
+            lod = LODMesh(bounding_sphere(self.mesh(*key)[0]), cells, fetch)
+            self.lods[key] = lod
+        return lod
+
+    def nbytes(self):
+        """Bytes held by every cached tessellation"""
+        return sum(array.nbytes for mesh in self.meshes.values() for array in mesh)
+
+    def clear(self):
+        """Drop every cached tessellation"""
+        self.meshes.clear()
+        self.lods.clear()
@@ -0,0 +1,373 @@
+import numpy as np
+
+# Display modes, matching the ribbon Display buttons
+WIREFRAME, SHADED, TEXTURED = 'wireframe', 'shaded', 'textured'
+
+# Candidate pixels tested per rasterization batch
+BATCH_PIXELS = 1 << 22
+
+# Depth is quantized to this many bits when resolving overlapping pixels
+DEPTH_BITS = 24
+
+# Eye position and orthographic axis of the standard views
+CAMERAS = {
+    'perspective': {'eye': (14.0, 10.0, 14.0), 'fov': 45.0},
+    'front': {'eye': (0.0, 0.0, 50.0), 'half_height': 10.0},
+    'side': {'eye': (50.0, 0.0, 0.0), 'half_height': 10.0},
+    'top': {'eye': (0.0, 50.0, 0.0), 'half_height': 10.0, 'up': (0.0, 0.0, -1.0)},
+}
+
+
+def look_at(eye, target=(0.0, 0.0, 0.0), up=(0.0, 1.0, 0.0)):
+    """Return a view matrix looking from eye towards target"""
+    eye = np.asarray(eye, dtype=np.float64)
+    forward = np.asarray(target, dtype=np.float64) - eye
+    forward /= np.linalg.norm(forward)
+    right = np.cross(forward, up)
+    right /= np.linalg.norm(right)
+    true_up = np.cross(right, forward)
+    view = np.eye(4)
+    view[0, :3], view[1, :3], view[2, :3] = right, true_up, -forward
+    view[:3, 3] = -view[:3, :3] @ eye
+    return view
+
+
+def perspective(fov_y, aspect, near=0.1, far=1000.0):
+    """Return an OpenGL-style perspective projection"""
+    f = 1.0 / np.tan(np.radians(fov_y) / 2)
+    projection = np.zeros((4, 4))
+    projection[0, 0] = f / aspect
+    projection[1, 1] = f
+    projection[2, 2] = (far + near) / (near - far)
+    projection[2, 3] = 2 * far * near / (near - far)
+    projection[3, 2] = -1.0
+    return projection
+
+
+def orthographic(half_height, aspect, near=0.1, far=1000.0):
+    """Return an orthographic projection showing half_height units above and below centre"""
+    projection = np.eye(4)
+    projection[0, 0] = 1.0 / (half_height * aspect)
+    projection[1, 1] = 1.0 / half_height
+    projection[2, 2] = -2.0 / (far - near)
+    projection[2, 3] = -(far + near) / (far - near)
+    return projection
+
+
+def camera_matrices(name, aspect):
+    """Return (view, projection) for one of the standard CAMERAS"""
+    camera = CAMERAS[name]
+    view = look_at(camera['eye'], up=camera.get('up', (0.0, 1.0, 0.0)))
+    if 'fov' in camera:
+        return view, perspective(camera['fov'], aspect)
+    return view, orthographic(camera['half_height'], aspect)
+
+
+def screen_ray(x, y, width, height, view, projection):
+    """Return the world-space (origin, direction) through a pixel, from the near to the far plane"""
+    ndc_x = 2.0 * x / width - 1.0
+    ndc_y = 1.0 - 2.0 * y / height
+    inverse = np.linalg.inv(projection @ view)
+    near = inverse @ np.array([ndc_x, ndc_y, -1.0, 1.0])
+    far = inverse @ np.array([ndc_x, ndc_y, 1.0, 1.0])
+    near, far = near[:3] / near[3], far[:3] / far[3]
+    return near, far - near
+
+
+def project_points(points, width, height, view, projection):
+    """Return (n, 2) pixel positions of world points and whether each is in front of the camera"""
+    clip = points @ (projection @ view)[:, :3].T + (projection @ view)[:, 3]
+    w = clip[:, 3]
+    safe = np.where(np.abs(w) > 1e-12, w, 1e-12)
+    pixels = np.stack([(clip[:, 0] / safe + 1) * 0.5 * width, (1 - clip[:, 1] / safe) * 0.5 * height], axis=1)
+    return pixels, w > 1e-6
+
+
+def window_matrix(x0, y0, x1, y1, width, height):
+    """Return a clip-space matrix stretching a pixel rectangle over the whole viewport"""
+    left, right = 2.0 * min(x0, x1) / width - 1.0, 2.0 * max(x0, x1) / width - 1.0
+    top, bottom = 1.0 - 2.0 * min(y0, y1) / height, 1.0 - 2.0 * max(y0, y1) / height
+    dx, dy = max(right - left, 1e-9), max(top - bottom, 1e-9)
+    window = np.eye(4)
+    window[0, 0], window[0, 3] = 2.0 / dx, -(left + right) / dx
+    window[1, 1], window[1, 3] = 2.0 / dy, -(top + bottom) / dy
+    return window
+
+
+def batch_ranges(sizes, limit=BATCH_PIXELS):
+    """Split consecutive items into (start, stop) ranges whose sizes sum to about limit"""
+    totals = np.cumsum(sizes)
+    if not len(totals):
+        return []
+    cuts = np.searchsorted(totals, np.arange(limit, totals[-1], limit), side='right')
+    bounds = np.unique(np.concatenate([[0], cuts, [len(totals)]]))
+    return list(zip(bounds[:-1].tolist(), bounds[1:].tolist()))
+
+
+def padded_size(sizes):
+    """Round sizes up to the next power of two or one and a half times a power of two"""
+    power = 1 << np.floor(np.log2(np.maximum(sizes, 1))).astype(np.int64)
+    return np.where(sizes <= power, power, np.where(2 * sizes <= 3 * power, 3 * power // 2, 2 * power))
+
+
+def clip_near(clip, indices, attributes):
+    """Clip triangles to the near plane z >= -w in homogeneous space
+
+    A triangle with one vertex in front of the plane becomes a smaller
+    triangle, one with two becomes a quad split in two, and one with none
+    is dropped. Cut points are appended to clip and to every per-vertex
+    array in attributes (None entries pass through). Returns (clip,
+    indices, attributes).
+    """
+    distance = clip[:, 2] + clip[:, 3]
+    inside = distance[indices] >= 0
+    count = inside.sum(axis=1)
+    cut = (count == 1) | (count == 2)
+    whole = indices[count == 3]
+    if not cut.any():
+        return clip, whole, attributes
+    tris, inside, count = indices[cut], inside[cut], count[cut]
+    # Rotate each cut triangle so the vertex alone on its side of the plane comes first
+    alone = np.where(count == 1, inside.argmax(axis=1), (~inside).argmax(axis=1))
+    tris = np.take_along_axis(tris, (alone[:, None] + np.arange(3)) % 3, axis=1)
+    a, b, c = tris[:, 0], tris[:, 1], tris[:, 2]
+    start, end = np.concatenate([a, a]), np.concatenate([b, c])
+    t = (distance[start] / (distance[start] - distance[end]))[:, None]
+
+    def cut_points(array):
+        return array[start] + (array[end] - array[start]) * t
+
+    ab = len(clip) + np.arange(len(tris))
+    ac = ab + len(tris)
+    clip = np.concatenate([clip, cut_points(clip)])
+    attributes = [None if array is None else np.concatenate([array, cut_points(array)]) for array in attributes]
+    front = count == 1
+    back = ~front
+    indices = np.concatenate([
+        whole,
+        np.stack([a, ab, ac], axis=1)[front],
+        np.stack([ab, b, c], axis=1)[back],
+        np.stack([ab, c, ac], axis=1)[back],
+    ])
+    return clip, indices, attributes
+
+
+def checker_texture(size=64, squares=8, light=(220, 220, 220), dark=(90, 90, 90)):
+    """Return a (size, size, 3) uint8 checkerboard"""
+    cells = (np.arange(size) * squares // size) % 2
+    mask = (cells[:, None] ^ cells[None, :]).astype(bool)
+    return np.where(mask[..., None], np.array(dark, np.uint8), np.array(light, np.uint8))
+
+
+class Rasterizer:
+    """Z-buffered software renderer into a NumPy framebuffer
+
+    Triangles are rasterized in batches: every pixel of every triangle's
+    screen bounding box becomes a candidate, edge functions keep the ones
+    inside, and a single sort on (pixel, depth) resolves overlaps before
+    the survivors are tested against the depth buffer.
+    """
+
+    def __init__(self, width, height, background=(29, 29, 29), grid_color=(51, 51, 51),
+                 axis_color=(85, 85, 85)):
+        self.background = np.array(background, dtype=np.uint8)
+        self.grid_color = np.array(grid_color, dtype=np.uint8)
+        self.axis_color = np.array(axis_color, dtype=np.uint8)
+        self.texture = checker_texture()
+        self.triangles = 0
+        self.pixels = 0
+        self.resize(width, height)
+
+    def resize(self, width, height):
+        """Reallocate the framebuffer for a new size"""
+        self.width = max(1, int(width))
+        self.height = max(1, int(height))
+        self.color = np.empty((self.height, self.width, 3), dtype=np.uint8)
+        self.depth = np.empty((self.height, self.width), dtype=np.float32)
+        self.clear()
+
+    def clear(self, grid_spacing=20):
+        """Fill the framebuffer with the background and screen grid, and reset depth"""
+        self.color[:] = self.background
+        if grid_spacing:
+            self.color[::grid_spacing] = self.grid_color
+            self.color[:, ::grid_spacing] = self.grid_color
+            self.color[self.height // 2] = self.axis_color
+            self.color[:, self.width // 2] = self.axis_color
+        self.depth[:] = np.inf
+        self.triangles = 0
+        self.pixels = 0
+
+    def ppm(self):
+        """Return the framebuffer as binary PPM for a Tk PhotoImage"""
+        return b"P6 %d %d 255\n" % (self.width, self.height) + self.color.tobytes()
+
+    def draw_mesh(self, vertices, indices, model, view, projection, mode=SHADED,
+                  color=(180, 180, 180), uvs=None, texture=None):
+        """Transform, clip and rasterize one triangle mesh, or one instance of it per model matrix"""
+        vertices = np.asarray(vertices, dtype=np.float64).reshape(-1, 3)
+        indices = np.asarray(indices, dtype=np.int64).reshape(-1, 3)
+        models = np.asarray(model, dtype=np.float64).reshape(-1, 4, 4)
+        if not len(vertices) or not len(indices) or not len(models):
+            return 0
+        world = (vertices @ models[:, :3, :3].transpose(0, 2, 1) + models[:, None, :3, 3]).reshape(-1, 3)
+        if len(models) > 1:
+            # Instances share the buffers; only the expanded copies are per draw
+            indices = (indices + (np.arange(len(models)) * len(vertices))[:, None, None]).reshape(-1, 3)
+            vertices = np.tile(vertices, (len(models), 1))
+            if uvs is not None:
+                uvs = np.tile(np.asarray(uvs).reshape(-1, 2), (len(models), 1))
+        clip = world @ (projection @ view)[:, :3].T + (projection @ view)[:, 3]
+        if uvs is not None:
+            uvs = np.asarray(uvs, dtype=np.float64).reshape(-1, 2)
+        clip, indices, (world, vertices, uvs) = clip_near(clip, indices, [world, vertices, uvs])
+        if not len(indices):
+            return 0
+        w = clip[:, 3]
+
+        # Drop triangles wholly outside the frustum
+        ndc = clip[:, :3] / np.where(np.abs(w) > 1e-12, w, 1e-12)[:, None]
+        i0, i1, i2 = indices[:, 0], indices[:, 1], indices[:, 2]
+        keep = np.ones(len(indices), dtype=bool)
+        for axis in range(3):
+            a, b, c = ndc[i0, axis], ndc[i1, axis], ndc[i2, axis]
+            keep &= ~((a < -1) & (b < -1) & (c < -1)) & ~((a > 1) & (b > 1) & (c > 1))
+        indices = indices[keep]
+        if not len(indices):
+            return 0
+
+        screen = np.empty((len(vertices), 3))
+        screen[:, 0] = (ndc[:, 0] + 1) * 0.5 * self.width
+        screen[:, 1] = (1 - ndc[:, 1]) * 0.5 * self.height
+        screen[:, 2] = ndc[:, 2] * 0.5 + 0.5
+        if mode == WIREFRAME:
+            self._draw_edges(screen, indices, np.asarray(color, dtype=np.uint8))
+        else:
+            self._fill(screen, w, world, indices, view, mode, np.asarray(color, dtype=np.float64),
+                       vertices if uvs is None else None, uvs, self.texture if texture is None else texture)
+        self.triangles += len(indices)
+        return len(indices)
+
+    def _draw_edges(self, screen, indices, color):
+        edges = indices[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2)
+        p0, p1 = screen[edges[:, 0], :2], screen[edges[:, 1], :2]
+        # Limit steps so edges running far off screen stay bounded
+        steps = np.minimum(np.ceil(np.abs(p1 - p0).max(axis=1)), 2 * (self.width + self.height)).astype(np.int64) + 1
+        for start, stop in batch_ranges(steps):
+            count = steps[start:stop]
+            owner = np.repeat(np.arange(start, stop), count)
+            offsets = np.cumsum(count) - count
+            t = (np.arange(count.sum()) - np.repeat(offsets, count)) / np.maximum(np.repeat(count, count) - 1, 1)
+            x = (p0[owner, 0] + (p1[owner, 0] - p0[owner, 0]) * t).astype(np.int64)
+            y = (p0[owner, 1] + (p1[owner, 1] - p0[owner, 1]) * t).astype(np.int64)
+            inside = (x >= 0) & (x < self.width) & (y >= 0) & (y < self.height)
+            self.color[y[inside], x[inside]] = color
+            self.pixels += int(np.count_nonzero(inside))
+
+    def _fill(self, screen, w, world, indices, view, mode, color, positions, uvs, texture):
+        i0, i1, i2 = indices[:, 0], indices[:, 1], indices[:, 2]
+        x0, x1, x2 = screen[i0, 0], screen[i1, 0], screen[i2, 0]
+        y0, y1, y2 = screen[i0, 1], screen[i1, 1], screen[i2, 1]
+        z0 = screen[i0, 2]
+        area = (x1 - x0) * (y2 - y0) - (x2 - x0) * (y1 - y0)
+        x_min = np.clip(np.floor(np.minimum(np.minimum(x0, x1), x2)), 0, self.width - 1).astype(np.int64)
+        x_max = np.clip(np.ceil(np.maximum(np.maximum(x0, x1), x2)), 0, self.width - 1).astype(np.int64)
+        y_min = np.clip(np.floor(np.minimum(np.minimum(y0, y1), y2)), 0, self.height - 1).astype(np.int64)
+        y_max = np.clip(np.ceil(np.maximum(np.maximum(y0, y1), y2)), 0, self.height - 1).astype(np.int64)
+        live = np.flatnonzero(np.abs(area) > 1e-12)
+
+        # Flat two-sided Lambert shading lit from the camera
+        a = world[i0]
+        normals = np.cross(world[i1] - a, world[i2] - a)
+        light = view[2, :3]
+        shade = 0.25 + 0.75 * np.abs(normals @ light) / np.maximum(np.sqrt((normals * normals).sum(axis=1)), 1e-12)
+
+        # Edge functions as affine maps of pixel offsets within the bounding
+        # box: b1 = e1x * dx + e1y * dy + c1, likewise b2; b0 = 1 - b1 - b2
+        inv_area = 1.0 / np.where(np.abs(area) > 1e-12, area, 1.0)
+        ox, oy = x_min + 0.5 - x0, y_min + 0.5 - y0
+        e1x, e1y = (y2 - y0) * inv_area, (x0 - x2) * inv_area
+        e2x, e2y = (y0 - y1) * inv_area, (x1 - x0) * inv_area
+        setup = {
+            'e1x': e1x.astype(np.float32), 'e1y': e1y.astype(np.float32),
+            'c1': (e1x * ox + e1y * oy).astype(np.float32),
+            'e2x': e2x.astype(np.float32), 'e2y': e2y.astype(np.float32),
+            'c2': (e2x * ox + e2y * oy).astype(np.float32),
+            'x_min': x_min, 'y_min': y_min,
+            'z0': z0, 'dz1': screen[i1, 2] - z0, 'dz2': screen[i2, 2] - z0,
+            'shade': shade, 'mode': mode, 'color': color, 'texture': texture,
+        }
+        if mode == TEXTURED:
+            if uvs is None:
+                # Project each face onto the plane its normal faces most
+                axis = np.abs(np.cross(positions[i1] - positions[i0], positions[i2] - positions[i0])).argmax(axis=1)
+                planes = np.array([[1, 2], [0, 2], [0, 1]])[axis]
+                setup['uv'] = np.take_along_axis(positions[indices], planes[:, None, :], axis=2) * 0.25
+            else:
+                setup['uv'] = np.asarray(uvs, dtype=np.float64)[indices]
+            setup['inv_w'] = 1.0 / w[indices]
+
+        # Bucket triangles by padded box size so each bucket is a dense
+        # (triangles, rows, columns) block computed by broadcasting
+        width = x_max - x_min + 1
+        height = y_max - y_min + 1
+        pad_x, pad_y = padded_size(width), padded_size(height)
+        bucket = pad_x * (self.height * 2 + 1) + pad_y
+        order = live[np.argsort(bucket[live], kind='stable')]
+        bounds = np.flatnonzero(np.diff(bucket[order])) + 1
+        for group in np.split(order, bounds) if len(order) else []:
+            kw, kh = int(pad_x[group[0]]), int(pad_y[group[0]])
+            step = max(1, BATCH_PIXELS // (kw * kh))
+            cols = np.arange(kw, dtype=np.float32)
+            rows = np.arange(kh, dtype=np.float32)[:, None]
+            for lo in range(0, len(group), step):
+                tris = group[lo:lo + step]
+                self._fill_block(tris, cols, rows, width[tris], height[tris], setup)
+
+    def _fill_block(self, tris, cols, rows, width, height, setup):
+        b1 = (setup['e1x'][tris, None, None] * cols + setup['e1y'][tris, None, None] * rows
+              + setup['c1'][tris, None, None])
+        b2 = (setup['e2x'][tris, None, None] * cols + setup['e2y'][tris, None, None] * rows
+              + setup['c2'][tris, None, None])
+        mask = (b1 >= 0) & (b2 >= 0) & (b1 + b2 <= 1)
+        mask &= cols < width[:, None, None]
+        mask &= rows < height[:, None, None]
+        t, row, col = np.nonzero(mask)
+        if not len(t):
+            return
+        b1, b2 = b1[mask], b2[mask]
+        tri = tris[t]
+        depth = setup['z0'][tri] + setup['dz1'][tri] * b1 + setup['dz2'][tri] * b2
+        px = setup['x_min'][tri] + col
+        py = setup['y_min'][tri] + row
+        near = np.flatnonzero((depth >= 0) & (depth <= 1))
+
+        # Nearest candidate per pixel: one sort on (pixel, quantized depth)
+        pixel = py[near] * self.width + px[near]
+        key = (pixel << DEPTH_BITS) | (depth[near] * ((1 << DEPTH_BITS) - 1)).astype(np.int64)
+        order = np.argsort(key)
+        sorted_pixel = pixel[order]
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = sorted_pixel[1:] != sorted_pixel[:-1]
+        chosen = near[order[first]]
+        pixel = sorted_pixel[first]
+        nearer = depth[chosen] < self.depth.reshape(-1)[pixel]
+        chosen, pixel = chosen[nearer], pixel[nearer]
+        self.depth.reshape(-1)[pixel] = depth[chosen]
+
+        tri = tri[chosen]
+        shade, color = setup['shade'][tri, None], setup['color']
+        if setup['mode'] == TEXTURED:
+            # Perspective-correct texture coordinates
+            b1, b2 = b1[chosen], b2[chosen]
+            weights = np.stack([1.0 - b1 - b2, b1, b2], axis=1) * setup['inv_w'][tri]
+            uv = (weights[:, :, None] * setup['uv'][tri]).sum(axis=1) / weights.sum(axis=1)[:, None]
+            texture = setup['texture']
+            size_v, size_u = texture.shape[:2]
+            texel = texture[(uv[:, 1] * size_v).astype(np.int64) % size_v,
+                            (uv[:, 0] * size_u).astype(np.int64) % size_u]
+            rgb = texel * shade * (color / 255.0)
+        else:
+            rgb = color * shade
+        self.color.reshape(-1, 3)[pixel] = np.clip(rgb, 0, 255).astype(np.uint8)
+        self.pixels += len(pixel)
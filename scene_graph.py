@@ -0,0 +1,421 @@
+import numpy as np
+
+# Channel box rows: label, transform column, component
+CHANNELS = [
+    ("Translate X", 'translate', 0),
+    ("Translate Y", 'translate', 1),
+    ("Translate Z", 'translate', 2),
+    ("Rotate X", 'rotate', 0),
+    ("Rotate Y", 'rotate', 1),
+    ("Rotate Z", 'rotate', 2),
+    ("Scale X", 'scale', 0),
+    ("Scale Y", 'scale', 1),
+    ("Scale Z", 'scale', 2),
+]
+TRANSFORM_COLUMNS = ('translate', 'rotate', 'scale')
+
+# Channel box edits: a plain number sets the value, an operator prefix
+# applies it relative to each node's current value
+CHANNEL_OPERATORS = {
+    '=': lambda current, value: np.full_like(current, value),
+    '+=': np.add,
+    '-=': np.subtract,
+    '*=': np.multiply,
+    '/=': np.divide,
+}
+
+
+def parse_channel_edit(text):
+    """Split channel box text such as '2.5' or '+=1' into (operator, value); ValueError if malformed"""
+    text = text.strip()
+    operator = '='
+    for prefix in ('+=', '-=', '*=', '/='):
+        if text.startswith(prefix):
+            operator, text = prefix, text[len(prefix):]
+            break
+    value = float(text)
+    if operator == '/=' and value == 0:
+        raise ValueError("division by zero")
+    return operator, value
+
+
+def compose_matrices(translate, rotate, scale):
+    """Build local 4x4 matrices from (n, 3) translate, rotate (degrees, XYZ order) and scale"""
+    rx, ry, rz = np.radians(rotate).T
+    cx, cy, cz = np.cos(rx), np.cos(ry), np.cos(rz)
+    sx, sy, sz = np.sin(rx), np.sin(ry), np.sin(rz)
+
+    matrices = np.zeros((len(translate), 4, 4))
+    # Rotation is Rz @ Ry @ Rx, then each column is scaled
+    matrices[:, 0, 0] = cy * cz
+    matrices[:, 0, 1] = sx * sy * cz - cx * sz
+    matrices[:, 0, 2] = cx * sy * cz + sx * sz
+    matrices[:, 1, 0] = cy * sz
+    matrices[:, 1, 1] = sx * sy * sz + cx * cz
+    matrices[:, 1, 2] = cx * sy * sz - sx * cz
+    matrices[:, 2, 0] = -sy
+    matrices[:, 2, 1] = sx * cy
+    matrices[:, 2, 2] = cx * cy
+    matrices[:, :3, :3] *= scale[:, None, :]
+    matrices[:, :3, 3] = translate
+    matrices[:, 3, 3] = 1.0
+    return matrices
+
+
+class SceneGraph:
+    """Scene nodes with transforms held in structure-of-arrays columns
+
+    Nodes are stored in topological order: a parent always has a lower
+    index than its children. World matrices are then computed one depth
+    level at a time, each level a single batched matrix product.
+
+    Edits only flag work: local_dirty marks nodes whose own transform
+    changed and dirty_roots holds the subtrees whose world matrices are
+    stale. update_world() then touches just those subtrees, and the
+    recomputed counters report how many nodes that was. Nodes whose world
+    matrix was rewritten stay flagged in moved until take_moved().
+    """
+
+    def __init__(self, capacity=64):
+        self.count = 0
+        self.names = []
+        self.types = []
+        self.attributes = []
+        self.parent = np.full(capacity, -1, dtype=np.int32)
+        self.depth = np.zeros(capacity, dtype=np.int32)
+        self.translate = np.zeros((capacity, 3))
+        self.rotate = np.zeros((capacity, 3))
+        self.scale = np.ones((capacity, 3))
+        self.visibility = np.ones(capacity, dtype=bool)
+        self.local = np.tile(np.eye(4), (capacity, 1, 1))
+        self.world = np.tile(np.eye(4), (capacity, 1, 1))
+        self.local_dirty = np.zeros(capacity, dtype=bool)
+        self.moved = np.zeros(capacity, dtype=bool)
+        self.dirty_roots = set()
+        self.recomputed_last = 0
+        self.recomputed_total = 0
+        self._levels = None
+        self._children = None
+
+    def __len__(self):
+        return self.count
+
+    def _grow(self, needed):
+        capacity = len(self.parent)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        extra = capacity - len(self.parent)
+        self.parent = np.concatenate([self.parent, np.full(extra, -1, dtype=np.int32)])
+        self.depth = np.concatenate([self.depth, np.zeros(extra, dtype=np.int32)])
+        self.translate = np.concatenate([self.translate, np.zeros((extra, 3))])
+        self.rotate = np.concatenate([self.rotate, np.zeros((extra, 3))])
+        self.scale = np.concatenate([self.scale, np.ones((extra, 3))])
+        self.visibility = np.concatenate([self.visibility, np.ones(extra, dtype=bool)])
+        self.local = np.concatenate([self.local, np.tile(np.eye(4), (extra, 1, 1))])
+        self.world = np.concatenate([self.world, np.tile(np.eye(4), (extra, 1, 1))])
+        self.local_dirty = np.concatenate([self.local_dirty, np.zeros(extra, dtype=bool)])
+        self.moved = np.concatenate([self.moved, np.zeros(extra, dtype=bool)])
+
+    def add_node(self, name, node_type='Transform', parent=-1,
+                 translate=(0, 0, 0), rotate=(0, 0, 0), scale=(1, 1, 1),
+                 visibility=True, attributes=None):
+        """Append a node under an existing parent and return its index"""
+        if parent >= self.count:
+            raise ValueError(f"parent {parent} must be added before its children")
+        index = self.count
+        self._grow(index + 1)
+        self.count += 1
+        self.names.append(name)
+        self.types.append(node_type)
+        self.attributes.append(dict(attributes or {}))
+        self.parent[index] = parent
+        self.depth[index] = self.depth[parent] + 1 if parent >= 0 else 0
+        self.translate[index] = translate
+        self.rotate[index] = rotate
+        self.scale[index] = scale
+        self.visibility[index] = visibility
+        self._levels = None
+        self._children = None
+        self.mark_dirty(index)
+        self.update_world()
+        return index
+
+    def add_nodes(self, names, types, parents, translate=None, rotate=None, scale=None):
+        """Append many nodes at once; parents may refer to nodes in the same batch"""
+        parents = np.asarray(parents, dtype=np.int32)
+        start = self.count
+        n = len(parents)
+        indices = np.arange(start, start + n)
+        if np.any(parents >= indices):
+            raise ValueError("parents must be added before their children")
+        self._grow(start + n)
+        self.count += n
+        self.names.extend(names)
+        self.types.extend(types)
+        self.attributes.extend({} for _ in range(n))
+        self.parent[indices] = parents
+        # Depth has to follow parents within the batch, which topological
+        # order lets us do in a single forward sweep
+        depth = self.depth
+        for i, p in zip(indices.tolist(), parents.tolist()):
+            depth[i] = depth[p] + 1 if p >= 0 else 0
+        self.translate[indices] = 0.0 if translate is None else translate
+        self.rotate[indices] = 0.0 if rotate is None else rotate
+        self.scale[indices] = 1.0 if scale is None else scale
+        self.visibility[indices] = True
+        self._levels = None
+        self._children = None
+        self.mark_dirty(indices)
+        self.update_world()
+        return indices
+
+    def unique_names(self, names):
+        """Return names not yet in the graph, renumbering taken ones as pCube1 becomes pCube2"""
+        taken = set(self.names)
+        counters = {}
+        unique = []
+        for name in names:
+            base = name.rstrip("0123456789") or name
+            number = counters.get(base, 1)
+            while f"{base}{number}" in taken:
+                number += 1
+            counters[base] = number + 1
+            taken.add(f"{base}{number}")
+            unique.append(f"{base}{number}")
+        return unique
+
+    def duplicate(self, indices):
+        """Copy the given nodes and everything below them; return (sources, copies)
+
+        Copies are appended in index order, so parents still precede their
+        children. A copied root keeps its original's parent. Only transform
+        rows, visibility and attributes are copied.
+        """
+        sources = self.descendants(indices)
+        copies = np.arange(self.count, self.count + len(sources))
+        # Parents inside the copied set map to their copies
+        parents = self.parent[sources].astype(np.int64)
+        position = np.minimum(np.searchsorted(sources, parents), len(sources) - 1)
+        parents = np.where(sources[position] == parents, copies[position], parents)
+        self.add_nodes(self.unique_names([self.names[i] for i in sources.tolist()]),
+                       [self.types[i] for i in sources.tolist()], parents,
+                       translate=self.translate[sources], rotate=self.rotate[sources], scale=self.scale[sources])
+        self.visibility[copies] = self.visibility[sources]
+        for source, copy in zip(sources.tolist(), copies.tolist()):
+            self.attributes[copy] = dict(self.attributes[source])
+        return sources, copies
+
+    def levels(self):
+        """Return node indices grouped by depth, roots first"""
+        if self._levels is None:
+            depth = self.depth[:self.count]
+            order = np.argsort(depth, kind='stable')
+            bounds = np.searchsorted(depth[order], np.arange(1, depth.max(initial=0) + 1))
+            self._levels = np.split(order, bounds)
+        return self._levels
+
+    def child_table(self):
+        """Return (offsets, children) listing every node's children contiguously"""
+        if self._children is None:
+            parent = self.parent[:self.count]
+            order = np.argsort(parent, kind='stable')
+            # Roots have parent -1 and sort first; skip them
+            order = order[np.searchsorted(parent[order], 0):]
+            offsets = np.searchsorted(parent[order], np.arange(self.count + 1))
+            self._children = (offsets, order)
+        return self._children
+
+    def children(self, index):
+        """Return the direct children of a node"""
+        offsets, children = self.child_table()
+        return children[offsets[index]:offsets[index + 1]]
+
+    def descendants(self, indices, include_self=True):
+        """Return every node below the given nodes, expanded one generation at a time"""
+        offsets, children = self.child_table()
+        indices = np.atleast_1d(np.asarray(indices, dtype=np.int64))
+        if len(indices) * 8 >= self.count:
+            return self._descendants_mask(indices, include_self)
+        frontier = np.unique(indices)
+        found = [frontier] if include_self else []
+        while len(frontier):
+            starts, ends = offsets[frontier], offsets[frontier + 1]
+            counts = ends - starts
+            total = counts.sum()
+            if total == 0:
+                break
+            # Concatenate the child ranges without a Python loop
+            shift = np.repeat(starts - np.cumsum(counts) + counts, counts)
+            frontier = children[np.arange(total) + shift]
+            found.append(frontier)
+        if not found:
+            return np.empty(0, dtype=np.int64)
+        return np.unique(np.concatenate(found))
+
+    def _descendants_mask(self, indices, include_self):
+        """descendants() for large inputs, deduplicating with a mask over all nodes instead of sorting"""
+        offsets, children = self.child_table()
+        found = np.zeros(self.count, dtype=bool)
+        found[indices] = True
+        frontier = np.flatnonzero(found)
+        if not include_self:
+            found[:] = False
+        while len(frontier):
+            starts, ends = offsets[frontier], offsets[frontier + 1]
+            counts = ends - starts
+            total = counts.sum()
+            if total == 0:
+                break
+            shift = np.repeat(starts - np.cumsum(counts) + counts, counts)
+            frontier = children[np.arange(total) + shift]
+            # Each node has one parent, so only nodes reached twice repeat
+            frontier = frontier[~found[frontier]]
+            found[frontier] = True
+        return np.flatnonzero(found)
+
+    def get_channel(self, index, column, component):
+        """Return one transform value"""
+        return float(getattr(self, column)[index, component])
+
+    def set_channel(self, index, column, component, value):
+        """Write one transform value and refresh the affected world matrices"""
+        getattr(self, column)[index, component] = value
+        self.mark_dirty(index)
+        self.update_world()
+
+    def edit_channel(self, indices, column, component, operator, value):
+        """Apply one channel box edit to many nodes in a single write; return their previous values
+
+        Nodes are only flagged dirty; call update_world() to move them.
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        previous = getattr(self, column)[indices, component]
+        self.write_channel(indices, column, component, CHANNEL_OPERATORS[operator](previous, value))
+        return previous
+
+    def write_channel(self, indices, column, component, values):
+        """Write per-node values into one channel of many nodes; component is None for visibility"""
+        indices = np.asarray(indices, dtype=np.int64)
+        channel = getattr(self, column)
+        if component is None:
+            channel[indices] = values
+            return
+        channel[indices, component] = values
+        if column == 'translate':
+            # Translation is the local matrix's last column; no need to recompose it
+            self.local[indices, component, 3] = values
+            self.dirty_roots.update(indices.tolist())
+        else:
+            self.mark_dirty(indices)
+
+    def mark_dirty(self, indices):
+        """Flag nodes whose local transform changed"""
+        indices = np.atleast_1d(np.asarray(indices, dtype=np.int64))
+        self.local_dirty[indices] = True
+        self.dirty_roots.update(indices.tolist())
+
+    def update_world(self):
+        """Recompute local and world matrices below dirty nodes only"""
+        if not self.dirty_roots:
+            self.recomputed_last = 0
+            return 0
+        affected = self.descendants(np.fromiter(self.dirty_roots, dtype=np.int64))
+        self.dirty_roots.clear()
+
+        changed = affected[self.local_dirty[affected]]
+        self.local[changed] = compose_matrices(self.translate[changed], self.rotate[changed],
+                                               self.scale[changed])
+        self.local_dirty[changed] = False
+
+        # Parents come before children once grouped by depth
+        depth = self.depth[affected]
+        order = np.argsort(depth, kind='stable')
+        affected, depth = affected[order], depth[order]
+        bounds = np.flatnonzero(np.diff(depth)) + 1
+        for group in np.split(affected, bounds):
+            parents = self.parent[group]
+            if parents[0] < 0:
+                self.world[group] = self.local[group]
+            else:
+                self.world[group] = self.world[parents] @ self.local[group]
+        self.moved[affected] = True
+
+        self.recomputed_last = len(affected)
+        self.recomputed_total += len(affected)
+        return len(affected)
+
+    def update_all(self):
+        """Recompute every local and world matrix in one batched pass per level"""
+        n = self.count
+        if n == 0:
+            return 0
+        self.local[:n] = compose_matrices(self.translate[:n], self.rotate[:n], self.scale[:n])
+        for level, indices in enumerate(self.levels()):
+            if level == 0:
+                self.world[indices] = self.local[indices]
+            else:
+                self.world[indices] = self.world[self.parent[indices]] @ self.local[indices]
+        self.local_dirty[:n] = False
+        self.moved[:n] = True
+        self.dirty_roots.clear()
+        self.recomputed_last = n
+        self.recomputed_total += n
+        return n
+
+    def set_pose(self, indices, local, world):
+        """Install matrices computed elsewhere for nodes whose columns already hold that pose"""
+        self.local[indices] = local
+        self.world[indices] = world
+        self.local_dirty[indices] = False
+        self.moved[indices] = True
+        self.dirty_roots.difference_update(np.asarray(indices).tolist())
+
+    def take_moved(self):
+        """Return the nodes whose world matrix changed since the last call, and clear the flags"""
+        moved = np.flatnonzero(self.moved[:self.count])
+        self.moved[moved] = False
+        return moved
+
+    def reset_counters(self):
+        """Start a new frame of recompute counting"""
+        self.recomputed_total = 0
+
+    def world_position(self, index):
+        """Return the world-space position of a node"""
+        return self.world[index, :3, 3].copy()
+
+    def node_attributes(self, index):
+        """Return a node's transform as JSON-friendly attributes"""
+        return {
+            'translate': self.translate[index].tolist(),
+            'rotate': self.rotate[index].tolist(),
+            'scale': self.scale[index].tolist(),
+            'visibility': bool(self.visibility[index]),
+        }
+
+    def set_node_attribute(self, index, name, value):
+        """Apply a saved attribute, routing transforms into their columns"""
+        if name in TRANSFORM_COLUMNS:
+            getattr(self, name)[index] = value
+            self.mark_dirty(index)
+        elif name == 'visibility':
+            self.visibility[index] = bool(value)
+        else:
+            self.attributes[index][name] = value
+
+    @classmethod
+    def from_records(cls, records):
+        """Build a graph from .gks node records"""
+        graph = cls(capacity=max(64, len(records)))
+        graph.add_nodes(
+            [record['name'] for record in records],
+            [record.get('type', '') for record in records],
+            [record.get('parent', -1) for record in records],
+        )
+        for index, record in enumerate(records):
+            for name, value in record.get('attributes', {}).items():
+                graph.set_node_attribute(index, name, value)
+        graph.update_all()
+        return graph
@@ -0,0 +1,217 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# Chunk kinds a skinned mesh's binding is saved as
+SKIN_CHUNKS = ('skin_influences', 'skin_bind', 'skin_indptr', 'skin_joints', 'skin_weights')
+
+# Most joints binding lets move one vertex
+MAX_INFLUENCES = 4
+
+# Meshes with fewer vertices deform in the calling process
+PARALLEL_VERTICES = 200_000
+
+# Vertices per batch when binding, capping the (vertices, joints) distance matrix
+BIND_BATCH = 65536
+
+# Vertices blended per pass, so each pass's (rows, 12) matrices stay in cache
+DEFORM_BATCH = 16384
+
+# Shared blocks this worker process has attached, by name
+_attached = {}
+
+
+def segment_distances(points, starts, ends):
+    """Return the (len(points), len(starts)) distances from points to line segments"""
+    direction = ends - starts
+    length = np.maximum((direction ** 2).sum(axis=1), 1e-12)
+    offset = points[:, None, :] - starts[None, :, :]
+    t = np.clip((offset * direction).sum(axis=2) / length, 0, 1)
+    return np.linalg.norm(offset - t[..., None] * direction, axis=2)
+
+
+def bind_weights(vertices, starts, ends, influences=MAX_INFLUENCES):
+    """Return CSR (indptr, joints, weights) binding vertices to the nearest bones
+
+    Joint j's bone runs from starts[j] to ends[j]. Each vertex takes its
+    nearest bones, weighted by inverse squared distance and normalized.
+    """
+    influences = min(influences, len(starts))
+    joints = np.empty((len(vertices), influences), dtype=np.int32)
+    weights = np.empty((len(vertices), influences), dtype=np.float32)
+    for lo in range(0, len(vertices), BIND_BATCH):
+        distance = segment_distances(vertices[lo:lo + BIND_BATCH], starts, ends)
+        nearest = np.argpartition(distance, influences - 1, axis=1)[:, :influences]
+        inverse = 1.0 / (np.take_along_axis(distance, nearest, axis=1) ** 2 + 1e-8)
+        joints[lo:lo + BIND_BATCH] = nearest
+        weights[lo:lo + BIND_BATCH] = inverse / inverse.sum(axis=1, keepdims=True)
+    indptr = np.arange(len(vertices) + 1, dtype=np.int64) * influences
+    return indptr, joints.ravel(), weights.ravel()
+
+
+def deform_points(vertices, indptr, joints, weights, matrices, out):
+    """Write linear blend skinned vertices into out
+
+    matrices holds each joint's (3, 4) skin matrix. A vertex's blended
+    matrix is its CSR row of weights times the flattened joint matrices,
+    a sparse-dense product done as one gather and a segmented sum; the
+    blended matrices are then applied to the rest positions. Batches whose
+    rows all hold the same number of influences, as bound meshes do, sum
+    them with a batched matrix product instead.
+    """
+    flat = matrices.reshape(len(matrices), 12)
+    for lo in range(0, len(vertices), DEFORM_BATCH):
+        hi = min(lo + DEFORM_BATCH, len(vertices))
+        start, stop = indptr[lo], indptr[hi]
+        counts = np.diff(indptr[lo:hi + 1])
+        if stop == start:
+            out[lo:hi] = vertices[lo:hi]
+            continue
+        terms = np.take(flat, joints[start:stop], axis=0)
+        stride = counts[0]
+        if stride and (counts == stride).all():
+            blended = weights[start:stop].reshape(-1, 1, stride) @ terms.reshape(-1, stride, 12)
+        else:
+            terms *= weights[start:stop, None]
+            blended = np.add.reduceat(terms, np.minimum(indptr[lo:hi] - start, stop - start - 1), axis=0)
+            # reduceat copies a term for empty rows instead of summing nothing; those keep their rest position
+            blended[counts == 0] = np.eye(3, 4, dtype=blended.dtype).ravel()
+        blended = blended.reshape(-1, 3, 4)
+        out[lo:hi] = np.einsum('nij,nj->ni', blended[:, :, :3], vertices[lo:hi]) + blended[:, :, 3]
+    return out
+
+
+def skin_arrays(buffer, vertex_count, term_count):
+    """Return the (vertices, indptr, joints, weights, out) arrays laid out in a skin block"""
+    arrays = []
+    offset = 0
+    for shape, dtype in (((vertex_count, 3), np.float32), ((vertex_count + 1,), np.int64),
+                         ((term_count,), np.int32), ((term_count,), np.float32), ((vertex_count, 3), np.float32)):
+        array = np.ndarray(shape, dtype=dtype, buffer=buffer, offset=offset)
+        offset += array.nbytes
+        arrays.append(array)
+    return arrays
+
+
+def deform_rows(name, shape, matrices, lo, hi):
+    """Worker process entry point: deform a range of vertices straight into the shared block"""
+    block = _attached.get(name)
+    if block is None:
+        for old in _attached.values():
+            old.close()
+        _attached.clear()
+        block = _attached[name] = shared_memory.SharedMemory(name=name)
+    vertices, indptr, joints, weights, out = skin_arrays(block.buf, *shape)
+    start, stop = indptr[lo], indptr[hi]
+    deform_points(vertices[lo:hi], indptr[lo:hi + 1] - start, joints[start:stop], weights[start:stop],
+                  matrices, out[lo:hi])
+    return hi - lo
+
+
+class SkinCluster:
+    """Linear blend skinning of one mesh by a set of joint nodes
+
+    Weights are a CSR matrix with a row per vertex: vertex i follows
+    joints[indptr[i]:indptr[i + 1]] by the matching weights. bind holds
+    the inverse of each joint's matrix in the mesh's space when it was
+    bound. Meshes of PARALLEL_VERTICES or more are split into row ranges
+    deformed by a pool of worker processes writing into one shared block.
+    The last pose is kept until a joint or the mesh moves; version counts
+    the poses computed.
+    """
+
+    def __init__(self, vertices, influences, bind, indptr, joints, weights, workers=None):
+        self.vertices = np.ascontiguousarray(vertices, dtype=np.float32)
+        self.influences = np.asarray(influences, dtype=np.int64)
+        self.bind = np.asarray(bind, dtype=np.float64)
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.joints = np.asarray(joints, dtype=np.int32)
+        self.weights = np.asarray(weights, dtype=np.float32)
+        self.workers = workers if workers is not None else os.cpu_count() or 1
+        self.matrices = None
+        self.version = 0
+        self.posed = np.empty_like(self.vertices)
+        self._block = None
+        self._pool = None
+
+    @classmethod
+    def bind_mesh(cls, vertices, nodes, mesh_world, worlds, parents, influences=MAX_INFLUENCES, workers=None):
+        """Bind a mesh to joint nodes at their world matrices as they are now
+
+        parents gives each joint's parent as a position in nodes, or -1;
+        a joint's bone runs to the middle of its children, or is a point
+        for a joint without any.
+        """
+        to_mesh = np.linalg.inv(mesh_world) @ worlds
+        positions = to_mesh[:, :3, 3]
+        parents = np.asarray(parents)
+        ends = positions.copy()
+        children = np.flatnonzero(parents >= 0)
+        counts = np.bincount(parents[children], minlength=len(positions))
+        sums = np.zeros_like(positions)
+        np.add.at(sums, parents[children], positions[children])
+        ends[counts > 0] = sums[counts > 0] / counts[counts > 0, None]
+        indptr, joints, weights = bind_weights(np.asarray(vertices, dtype=np.float64), positions, ends, influences)
+        return cls(vertices, nodes, np.linalg.inv(to_mesh), indptr, joints, weights, workers)
+
+    @classmethod
+    def from_arrays(cls, vertices, arrays, workers=None):
+        """Rebuild a cluster from the .gks chunks written by to_arrays()"""
+        return cls(vertices, arrays['skin_influences'], arrays['skin_bind'], arrays['skin_indptr'],
+                   arrays['skin_joints'], arrays['skin_weights'], workers)
+
+    def to_arrays(self):
+        """Return the binding as .gks chunks"""
+        return {
+            'skin_influences': self.influences,
+            'skin_bind': self.bind,
+            'skin_indptr': self.indptr,
+            'skin_joints': self.joints,
+            'skin_weights': self.weights,
+        }
+
+    def skin_matrices(self, mesh_world, worlds):
+        """Return each joint's (3, 4) matrix from bound to posed, in the mesh's space"""
+        skin = np.linalg.inv(mesh_world) @ worlds @ self.bind
+        return np.ascontiguousarray(skin[:, :3, :], dtype=np.float32)
+
+    def deform(self, mesh_world, worlds):
+        """Return the vertices posed by the joints' world matrices, reusing the last pose if nothing moved"""
+        matrices = self.skin_matrices(mesh_world, worlds)
+        if self.matrices is not None and np.array_equal(matrices, self.matrices):
+            return self.posed
+        self.matrices = matrices
+        self.version += 1
+        if self.workers > 1 and len(self.vertices) >= PARALLEL_VERTICES:
+            self._deform_parallel(matrices)
+        else:
+            deform_points(self.vertices, self.indptr, self.joints, self.weights, matrices, self.posed)
+        return self.posed
+
+    def close(self):
+        """Stop the worker processes and free the shared block"""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        if self._block is not None:
+            self.posed = np.array(self.posed)
+            self._block.close()
+            self._block.unlink()
+            self._block = None
+
+    def _deform_parallel(self, matrices):
+        shape = (len(self.vertices), len(self.joints))
+        if self._block is None:
+            size = sum(array.nbytes for array in (self.vertices, self.indptr, self.joints, self.weights, self.posed))
+            self._block = shared_memory.SharedMemory(create=True, size=size)
+            vertices, indptr, joints, weights, self.posed = skin_arrays(self._block.buf, *shape)
+            vertices[:], indptr[:], joints[:], weights[:] = self.vertices, self.indptr, self.joints, self.weights
+            self._pool = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context('spawn'))
+        bounds = np.linspace(0, len(self.vertices), self.workers + 1).astype(np.int64)
+        futures = [self._pool.submit(deform_rows, self._block.name, shape, matrices, lo, hi)
+                   for lo, hi in zip(bounds[:-1].tolist(), bounds[1:].tolist()) if hi > lo]
+        for future in futures:
+            future.result()
@@ -1,7 +1,54 @@
+import itertools
+import os
+import threading
+import time
 import tkinter as tk
-from tkinter import ttk, messagebox, filedialog, Menu
+import weakref
+from tkinter import ttk, messagebox, filedialog, simpledialog, Menu
 from tkinter import font as tkfont
 
+import numpy as np
+
+from animation import ANIMATION_CHUNKS, KeyframeStore
+from attribute_editor import AttributeEditor
+from bvh import BVH, MeshBVH, frustum_planes, points_in_polygon, transform_boxes
+from channel_box import ChannelBox
+from chunk_cache import ChunkCache, format_bytes
+from frame_evaluator import FrameEvaluator
+from gks_format import GKSFormatError, discard_staged, load_scene, stage_scene
+from gks_journal import SceneJournal, replay_journal
+from lod import LOD_CHUNKS, LODMesh, bounding_sphere, lod_level
+from mesh_import import import_mesh
+from name_index import NameIndex
+from nurbs import NURBS_CHUNKS, NurbsCurve, NurbsSurface, extrude as extrude_curve, loft, planar, revolve
+from outliner import VirtualOutliner
+from playback import PlaybackClock
+from playback_cache import PlaybackCache
+from poly_mesh import PolyMesh, bevel, bridge, extrude, multi_cut, weld
+from primitives import PrimitiveLibrary, transform_points
+from rasterizer import (SHADED, TEXTURED, WIREFRAME, camera_matrices, project_points, screen_ray,
+                        window_matrix)
+from skinning import SKIN_CHUNKS, SkinCluster
+from scene_graph import CHANNELS, TRANSFORM_COLUMNS, SceneGraph, parse_channel_edit
+from undo import AttributeChange, ChannelChange, KeyChange, MeshChange, NameChange, UndoStack
+from viewport_grid import GRID_DEBOUNCE_MS, ViewportGrid
+from viewport_renderer import ViewportRenderer
+
+# Autosave appends to the scene journal; compaction folds a journal that
+# has grown past COMPACT_MIN_BYTES back into the .gks file off the UI thread
+AUTOSAVE_INTERVAL = 30000
+COMPACT_INTERVAL = 60000
+COMPACT_MIN_BYTES = 64 * 1024 * 1024
+
+# Target playback rate for the time slider transport
+PLAYBACK_FPS = 24.0
+
+# How often to look for a pose finished by the frame evaluator thread
+EVALUATOR_POLL_MS = 4
+
+# How often to collect frames filled by the playback cache workers
+CACHE_POLL_MS = 100
+
 class GKSHALA(tk.Tk):
     def __init__(self):
         super().__init__()
@@ -29,9 +76,49 @@ class GKSHALA(tk.Tk):
         
         # Variables
         self.current_file = None
+        self.scene_file = None
+        self.chunk_cache = ChunkCache()
+        self.primitives = PrimitiveLibrary()
+        self.lod_meshes = {}
+        self.geometry_ids = {}
+        self.geometry_counter = itertools.count()
+        self.mesh_sharers = {}
+        self.nurbs_surfaces = {}
+        self.skin_clusters = {}
+        self.dirty_nodes = set()
+        self.dirty_attributes = []
+        self.compaction = None
+        self.scene = SceneGraph()
+        self.name_index = NameIndex()
+        self.search_placeholder = True
+        self.undo_stack = UndoStack()
+        self.selected_node = None
+        self.selected_nodes = []
+        self.select_tool = 'select'
+        self.lasso_points = []
+        self.lasso_item = None
+        self.scene_bvh = None
+        self.local_bounds = np.empty((0, 6))
+        self.node_meshes = []
+        self.mesh_groups = {}
+        self.mesh_bvhs = {}
+        self.keyframes = KeyframeStore()
+        self.auto_key = False
         self.is_maximized = False
         self.current_frame = 1
         self.playback_active = False
+        self.playback_clock = PlaybackClock(fps=PLAYBACK_FPS)
+        self.playback_job = None
+        self.posed_frame = None
+        self.frame_evaluator = FrameEvaluator()
+        self.evaluator_job = None
+        self.cache_playback = False
+        self.playback_cache = PlaybackCache()
+        self.cache_job = None
+        self.viewport_grids = []
+        self.viewport_renderers = []
+        self.display_mode = SHADED
+        self.render_job = None
         
         # Custom title bar
         self.create_title_bar()
@@ -63,12 +150,23 @@ class GKSHALA(tk.Tk):
         # Status bar
         self.create_status_bar()
         
+        self.report_attribute_editor()
+        
         # Bindings for window dragging
         self.title_bar.bind("<ButtonPress-1>", self.start_move)
         self.title_bar.bind("<B1-Motion>", self.on_move)
         
         # Bind escape key to close
         self.bind("<Escape>", lambda e: self.quit())
+        self.bind("<Control-s>", lambda e: self.save_file())
+        self.bind("<F2>", lambda e: self.rename_node())
+        self.bind("<Control-d>", lambda e: self.duplicate_selected())
+        self.bind("<Control-z>", lambda e: self.undo())
+        self.bind("<Control-y>", lambda e: self.redo())
+        
+        # Background autosave and journal compaction
+        self.after(AUTOSAVE_INTERVAL, self.autosave)
+        self.after(COMPACT_INTERVAL, self.compact_journal)
         
     def configure_style(self):
         """Configure ttk styles for the application"""
@@ -205,7 +303,7 @@ class GKSHALA(tk.Tk):
         file_menu.add_command(label="Save", command=self.save_file, accelerator="Ctrl+S")
         file_menu.add_command(label="Save As...", command=self.save_file_as, accelerator="Ctrl+Shift+S")
         file_menu.add_separator()
-        file_menu.add_command(label="Import", command=lambda: None)
+        file_menu.add_command(label="Import", command=self.import_file)
         file_menu.add_command(label="Export", command=lambda: None)
         file_menu.add_separator()
         file_menu.add_command(label="Preferences", command=lambda: None)
@@ -217,22 +315,28 @@ class GKSHALA(tk.Tk):
         edit_menu = Menu(menubar, tearoff=0, bg=self.bg_darker, fg=self.text_color,
                         activebackground=self.highlight_color,
                         activeforeground=self.text_color)
-        edit_menu.add_command(label="Undo", accelerator="Ctrl+Z")
-        edit_menu.add_command(label="Redo", accelerator="Ctrl+Y")
+        edit_menu.add_command(label="Undo", accelerator="Ctrl+Z", command=self.undo)
+        edit_menu.add_command(label="Redo", accelerator="Ctrl+Y", command=self.redo)
         edit_menu.add_separator()
         edit_menu.add_command(label="Cut", accelerator="Ctrl+X")
         edit_menu.add_command(label="Copy", accelerator="Ctrl+C")
         edit_menu.add_command(label="Paste", accelerator="Ctrl+V")
         edit_menu.add_separator()
-        edit_menu.add_command(label="Duplicate", accelerator="Ctrl+D")
+        edit_menu.add_command(label="Duplicate", accelerator="Ctrl+D", command=self.duplicate_selected)
         edit_menu.add_command(label="Delete", accelerator="Del")
+        edit_menu.add_command(label="Rename...", accelerator="F2", command=self.rename_node)
         menubar.add_cascade(label="Edit", menu=edit_menu)
         
         # Create Menu
         create_menu = Menu(menubar, tearoff=0, bg=self.bg_darker, fg=self.text_color,
                           activebackground=self.highlight_color,
                           activeforeground=self.text_color)
-        create_menu.add_command(label="Polygon Primitive", command=lambda: None)
+        primitive_menu = Menu(create_menu, tearoff=0, bg=self.bg_darker, fg=self.text_color,
+                              activebackground=self.highlight_color,
+                              activeforeground=self.text_color)
+        for kind in PrimitiveLibrary.BUILDERS:
+            primitive_menu.add_command(label=kind.title(), command=lambda k=kind: self.create_primitive(k))
+        create_menu.add_cascade(label="Polygon Primitive", menu=primitive_menu)
         create_menu.add_command(label="NURBS Primitive", command=lambda: None)
         create_menu.add_command(label="Lights", command=lambda: None)
         create_menu.add_command(label="Cameras", command=lambda: None)
@@ -247,9 +351,9 @@ class GKSHALA(tk.Tk):
                              activeforeground=self.text_color)
         workspace_menu.add_command(label="Modeling")
         workspace_menu.add_command(label="Animation")
-        workspace_menu.add_command(label("Rendering"))
-        workspace_menu.add_command(label("Dynamics"))
-        workspace_menu.add_command(label("FX"))
+        workspace_menu.add_command(label="Rendering")
+        workspace_menu.add_command(label="Dynamics")
+        workspace_menu.add_command(label="FX")
         menubar.add_cascade(label="Workspace", menu=workspace_menu)
         
         # Help Menu
@@ -319,7 +423,7 @@ class GKSHALA(tk.Tk):
         io_group = ttk.LabelFrame(parent, text="Import/Export", padding=(5, 5, 5, 5))
         io_group.pack(fill=tk.X, padx=5, pady=5)
         
-        ttk.Button(io_group, text="Import").pack(side=tk.LEFT, padx=2)
+        ttk.Button(io_group, text="Import", command=self.import_file).pack(side=tk.LEFT, padx=2)
         ttk.Button(io_group, text="Export").pack(side=tk.LEFT, padx=2)
         ttk.Button(io_group, text="Reference").pack(side=tk.LEFT, padx=2)
     
@@ -329,9 +433,12 @@ class GKSHALA(tk.Tk):
         select_group = ttk.LabelFrame(parent, text="Selection", padding=(5, 5, 5, 5))
         select_group.pack(fill=tk.X, padx=5, pady=5)
         
-        ttk.Button(select_group, text="Select").pack(side=tk.LEFT, padx=2)
-        ttk.Button(select_group, text="Lasso Select").pack(side=tk.LEFT, padx=2)
-        ttk.Button(select_group, text="Paint Select").pack(side=tk.LEFT, padx=2)
+        ttk.Button(select_group, text="Select",
+                   command=lambda: self.set_select_tool('select')).pack(side=tk.LEFT, padx=2)
+        ttk.Button(select_group, text="Lasso Select",
+                   command=lambda: self.set_select_tool('lasso')).pack(side=tk.LEFT, padx=2)
+        ttk.Button(select_group, text="Paint Select",
+                   command=lambda: self.set_select_tool('paint')).pack(side=tk.LEFT, padx=2)
         
         # Transform section
         transform_group = ttk.LabelFrame(parent, text="Transform", padding=(5, 5, 5, 5))
@@ -346,9 +453,12 @@ class GKSHALA(tk.Tk):
         display_group = ttk.LabelFrame(parent, text="Display", padding=(5, 5, 5, 5))
         display_group.pack(fill=tk.X, padx=5, pady=5)
         
-        ttk.Button(display_group, text="Wireframe").pack(side=tk.LEFT, padx=2)
-        ttk.Button(display_group, text="Shaded").pack(side=tk.LEFT, padx=2)
-        ttk.Button(display_group, text="Textured").pack(side=tk.LEFT, padx=2)
+        ttk.Button(display_group, text="Wireframe",
+                   command=lambda: self.set_display_mode(WIREFRAME)).pack(side=tk.LEFT, padx=2)
+        ttk.Button(display_group, text="Shaded",
+                   command=lambda: self.set_display_mode(SHADED)).pack(side=tk.LEFT, padx=2)
+        ttk.Button(display_group, text="Textured",
+                   command=lambda: self.set_display_mode(TEXTURED)).pack(side=tk.LEFT, padx=2)
         ttk.Button(display_group, text="Lighting").pack(side=tk.LEFT, padx=2)
     
     def create_modeling_tab(self, parent):
@@ -357,19 +467,19 @@ class GKSHALA(tk.Tk):
         poly_group = ttk.LabelFrame(parent, text="Polygon", padding=(5, 5, 5, 5))
         poly_group.pack(fill=tk.X, padx=5, pady=5)
         
-        ttk.Button(poly_group, text="Extrude").pack(side=tk.LEFT, padx=2)
-        ttk.Button(poly_group, text="Bevel").pack(side=tk.LEFT, padx=2)
-        ttk.Button(poly_group, text="Bridge").pack(side=tk.LEFT, padx=2)
-        ttk.Button(poly_group, text="Multi-Cut").pack(side=tk.LEFT, padx=2)
+        ttk.Button(poly_group, text="Extrude", command=self.extrude_faces).pack(side=tk.LEFT, padx=2)
+        ttk.Button(poly_group, text="Bevel", command=self.bevel_faces).pack(side=tk.LEFT, padx=2)
+        ttk.Button(poly_group, text="Bridge", command=self.bridge_faces).pack(side=tk.LEFT, padx=2)
+        ttk.Button(poly_group, text="Multi-Cut", command=self.multi_cut_faces).pack(side=tk.LEFT, padx=2)
         
         # NURBS section
         nurbs_group = ttk.LabelFrame(parent, text="NURBS", padding=(5, 5, 5, 5))
         nurbs_group.pack(fill=tk.X, padx=5, pady=5)
         
-        ttk.Button(nurbs_group, text="Revolve").pack(side=tk.LEFT, padx=2)
-        ttk.Button(nurbs_group, text="Loft").pack(side=tk.LEFT, padx=2)
-        ttk.Button(nurbs_group, text="Extrude").pack(side=tk.LEFT, padx=2)
-        ttk.Button(nurbs_group, text="Planar").pack(side=tk.LEFT, padx=2)
+        ttk.Button(nurbs_group, text="Revolve", command=self.revolve_surface).pack(side=tk.LEFT, padx=2)
+        ttk.Button(nurbs_group, text="Loft", command=self.loft_surface).pack(side=tk.LEFT, padx=2)
+        ttk.Button(nurbs_group, text="Extrude", command=self.extrude_surface).pack(side=tk.LEFT, padx=2)
+        ttk.Button(nurbs_group, text="Planar", command=self.planar_surface).pack(side=tk.LEFT, padx=2)
     
     def create_animation_tab(self, parent):
         """Create content for Animation tab"""
@@ -377,18 +487,27 @@ class GKSHALA(tk.Tk):
         key_group = ttk.LabelFrame(parent, text="Keyframes", padding=(5, 5, 5, 5))
         key_group.pack(fill=tk.X, padx=5, pady=5)
         
-        ttk.Button(key_group, text="Set Key").pack(side=tk.LEFT, padx=2)
-        ttk.Button(key_group, text="Auto Key").pack(side=tk.LEFT, padx=2)
+        ttk.Button(key_group, text="Set Key", command=self.set_key).pack(side=tk.LEFT, padx=2)
+        self.auto_key_btn = ttk.Button(key_group, text="Auto Key", command=self.toggle_auto_key)
+        self.auto_key_btn.pack(side=tk.LEFT, padx=2)
         ttk.Button(key_group, text="Graph Editor").pack(side=tk.LEFT, padx=2)
         ttk.Button(key_group, text="Dope Sheet").pack(side=tk.LEFT, padx=2)
         
+        # Playback section
+        playback_group = ttk.LabelFrame(parent, text="Playback", padding=(5, 5, 5, 5))
+        playback_group.pack(fill=tk.X, padx=5, pady=5)
+        
+        self.cache_playback_btn = ttk.Button(playback_group, text="Cache Playback",
+                                             command=self.toggle_cache_playback)
+        self.cache_playback_btn.pack(side=tk.LEFT, padx=2)
+        
         # Rigging section
         rig_group = ttk.LabelFrame(parent, text="Rigging", padding=(5, 5, 5, 5))
         rig_group.pack(fill=tk.X, padx=5, pady=5)
         
-        ttk.Button(rig_group, text="Joint Tool").pack(side=tk.LEFT, padx=2)
+        ttk.Button(rig_group, text="Joint Tool", command=self.create_joints).pack(side=tk.LEFT, padx=2)
         ttk.Button(rig_group, text="IK Handle").pack(side=tk.LEFT, padx=2)
-        ttk.Button(rig_group, text="Skin").pack(side=tk.LEFT, padx=2)
+        ttk.Button(rig_group, text="Skin", command=self.bind_skin).pack(side=tk.LEFT, padx=2)
         ttk.Button(rig_group, text="Blend Shape").pack(side=tk.LEFT, padx=2)
     
     def create_render_tab(self, parent):
@@ -516,6 +635,15 @@ class GKSHALA(tk.Tk):
             fg=self.text_color
         )
         render_stats.pack(side=tk.RIGHT, padx=10)
+        
+        # Transforms recomputed by the last scene update
+        self.xform_stats = tk.Label(
+            self.status_line, 
+            text="Xforms: 0", 
+            bg=self.bg_darker, 
+            fg=self.text_color
+        )
+        self.xform_stats.pack(side=tk.RIGHT, padx=10)
     
     def create_workspace(self):
         """Create the main workspace with viewports"""
@@ -548,9 +676,14 @@ class GKSHALA(tk.Tk):
         search_frame = tk.Frame(self.toolbox, bg=self.bg_darker)
         search_frame.pack(fill=tk.X, padx=5, pady=5)
         
-        search_entry = ttk.Entry(search_frame)
-        search_entry.pack(fill=tk.X, padx=2)
-        search_entry.insert(0, "Search...")
+        # Filters the outliner on every keystroke through the name index
+        self.search_var = tk.StringVar(value="Search...")
+        self.search_entry = ttk.Entry(search_frame, textvariable=self.search_var)
+        self.search_entry.pack(fill=tk.X, padx=2)
+        self.search_entry.bind("<FocusIn>", self.on_search_focus)
+        self.search_entry.bind("<FocusOut>", self.on_search_focus)
+        self.search_entry.bind("<Escape>", lambda e: self.search_var.set(""))
+        self.search_var.trace_add('write', lambda *args: self.filter_scene())
         
         # Scene hierarchy
         scene_frame = tk.Frame(self.toolbox, bg=self.bg_darker)
@@ -565,35 +698,381 @@ class GKSHALA(tk.Tk):
         )
         scene_label.pack(fill=tk.X, pady=(5, 0))
         
-        # Treeview for scene hierarchy
-        self.scene_tree = ttk.Treeview(
+        # Virtualized outliner for the scene hierarchy
+        self.scene_tree = VirtualOutliner(
             scene_frame,
-            columns=('type'),
-            show='tree',
-            selectmode='browse'
+            bg=self.bg_darker,
+            fg=self.text_color,
+            select_bg=self.highlight_color
         )
         
-        # Configure style for treeview
-        style = ttk.Style()
-        style.configure("Treeview", 
-                       background=self.bg_darker,
-                       fieldbackground=self.bg_darker,
-                       foreground=self.text_color)
-        style.map("Treeview", 
-                background=[('selected', self.highlight_color)],
-                foreground=[('selected', self.text_color)])
-        
-        self.scene_tree.heading('#0', text='Name', anchor=tk.W)
-        self.scene_tree.heading('type', text='Type', anchor=tk.W)
-        
         # Add sample items
-        root_node = self.scene_tree.insert('', 'end', text='Scene', open=True)
-        self.scene_tree.insert(root_node, 'end', text='pCube1', values=('Polygon'))
-        self.scene_tree.insert(root_node, 'end', text='pSphere1', values=('Polygon'))
-        self.scene_tree.insert(root_node, 'end', text='light1', values=('Light'))
-        self.scene_tree.insert(root_node, 'end', text='camera1', values=('Camera'))
+        self.scene_nodes = [
+            {'name': 'pCube1', 'type': 'Polygon', 'parent': -1, 'attributes': {'primitive': 'cube'}},
+            {'name': 'pSphere1', 'type': 'Polygon', 'parent': -1,
+             'attributes': {'primitive': 'sphere', 'translate': [3, 0, 0]}},
+            {'name': 'light1', 'type': 'Light', 'parent': -1, 'attributes': {'translate': [0, 8, 0]}},
+            {'name': 'camera1', 'type': 'Camera', 'parent': -1, 'attributes': {'translate': [0, 4, 12]}},
+        ]
+        self.scene = SceneGraph.from_records(self.scene_nodes)
+        self.populate_scene_tree()
         
         self.scene_tree.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        self.scene_tree.bind("<<OutlinerSelect>>", self.on_scene_select)
+    
+    def create_primitive(self, kind):
+        """Add a polygon primitive node instancing the shared tessellation"""
+        number = 1
+        while f"p{kind.title()}{number}" in self.scene.names:
+            number += 1
+        name = f"p{kind.title()}{number}"
+        attributes = {'primitive': kind}
+        index = self.scene.add_node(name, 'Polygon', attributes=attributes)
+        self.scene_nodes.append({'name': name, 'type': 'Polygon', 'parent': -1, 'attributes': dict(attributes)})
+        self.mark_node_dirty(index)
+        self.invalidate_pose()
+        self.populate_scene_tree()
+        self.select_node(index)
+        return index
+    
+    def create_nurbs(self, name, surface):
+        """Add a NURBS surface node; it is tessellated when first drawn"""
+        number = 1
+        while f"{name}{number}" in self.scene.names:
+            number += 1
+        name = f"{name}{number}"
+        index = self.scene.add_node(name, 'NURBS')
+        self.scene_nodes.append({'name': name, 'type': 'NURBS', 'parent': -1, 'attributes': {},
+                                 'arrays': surface.to_arrays()})
+        self.nurbs_surfaces[index] = surface
+        self.mark_node_dirty(index)
+        self.invalidate_pose()
+        self.populate_scene_tree()
+        self.select_node(index)
+        return index
+    
+    # There are no curve tools yet, so each surface tool starts from a stock profile
+    
+    def revolve_surface(self):
+        """Revolve a vase profile around the Y axis"""
+        profile = NurbsCurve([(0.6, 0, 0), (1.0, 0.4, 0), (0.5, 1.2, 0), (0.7, 1.8, 0), (0.4, 2.2, 0)])
+        self.create_nurbs("revolvedSurface", revolve(profile))
+    
+    def loft_surface(self):
+        """Loft through circles of varying radius stacked along Y"""
+        circles = [NurbsCurve.circle(radius, (0, height, 0))
+                   for radius, height in ((1.0, 0.0), (0.6, 0.7), (0.9, 1.4), (0.4, 2.1))]
+        self.create_nurbs("loftedSurface", loft(circles))
+    
+    def extrude_surface(self):
+        """Extrude a unit circle two units up Y"""
+        self.create_nurbs("extrudedSurface", extrude_curve(NurbsCurve.circle(), (0, 2, 0)))
+    
+    def planar_surface(self):
+        """Fill a unit circle with a planar surface"""
+        self.create_nurbs("planarTrimmedSurface", planar(NurbsCurve.circle()))
+    
+    def duplicate_selected(self):
+        """Duplicate the selected nodes and their children, sharing every mesh buffer"""
+        if not self.selected_nodes:
+            return
+        start = time.perf_counter()
+        sources, copies = self.scene.duplicate(self.selected_nodes)
+        for source, copy in zip(sources.tolist(), copies.tolist()):
+            record = self.share_record(source, copy)
+            self.scene_nodes.append(record)
+            self.mesh_sharers.setdefault(record['instance'], set()).add(copy)
+            self.mark_node_dirty(copy)
+        elapsed = time.perf_counter() - start
+        self.invalidate_pose()
+        self.populate_scene_tree()
+        self.select_nodes(copies[np.searchsorted(sources, self.selected_nodes)].tolist())
+        self.status_message.config(text=f"Duplicated {len(copies)} nodes in {elapsed * 1000:.1f} ms")
+        self.after(3000, lambda: self.status_message.config(text="Ready"))
+    
+    def share_record(self, source, copy):
+        """Return the record of a duplicate that shares its original's chunks copy-on-write"""
+        node = self.scene_nodes[source]
+        for array in node.get('arrays', {}).values():
+            # Shared buffers must not change under either node; own_mesh() copies them first
+            array.flags.writeable = False
+        instance = node.get('instance')
+        return dict(node, name=self.scene.names[copy], parent=int(self.scene.parent[copy]),
+                    attributes=dict(node.get('attributes', {})),
+                    instance=source if instance is None else instance)
+    
+    def own_mesh(self, index, copy=True):
+        """Give a node writable vertex and index buffers of its own before its mesh is edited
+
+        Buffers that are still shared with a duplicate, mapped from the
+        scene file or a primitive tessellation are copied, unless copy is
+        False because the edit replaces them; the node's stale levels of
+        detail are dropped. Returns the node's arrays.
+        """
+        node = self.scene_nodes[index]
+        attributes = self.scene.attributes[index]
+        nurbs = 'nurbs_control' in self.node_chunk_kinds(index)
+        if 'primitive' in attributes:
+            vertices, _, triangles = self.primitives.mesh(attributes['primitive'], attributes.get('resolution'))
+            arrays = {'vertices': vertices, 'indices': triangles}
+            for name in ('primitive', 'resolution'):
+                attributes.pop(name, None)
+                node.get('attributes', {}).pop(name, None)
+        else:
+            arrays = {kind: self.node_array(index, kind) for kind in self.node_chunk_kinds(index)
+                      if kind not in LOD_CHUNKS and kind not in NURBS_CHUNKS and kind not in SKIN_CHUNKS}
+        for kind in ('vertices', 'indices'):
+            if copy and not arrays[kind].flags.writeable:
+                arrays[kind] = np.array(arrays[kind])
+        # Nodes sharing this one's old buffers now share them with the first of themselves
+        sharers = sorted(self.mesh_sharers.pop(index, ()))
+        for other in sharers:
+            self.set_instance(other, sharers[0] if other != sharers[0] else None)
+            self.mark_node_dirty(other)
+        node['arrays'] = arrays
+        node.pop('source', None)
+        self.set_instance(index, None)
+        # Buffers this node already owned are edited in place, so their cached levels go
+        if nurbs:
+            surface = self.nurbs_surfaces.pop(index, None)
+            lod = surface.lod() if surface is not None else None
+        else:
+            lod = self.lod_meshes.pop(self.geometry_key(index), None)
+        self.mesh_bvhs.pop(lod, None)
+        self.mark_node_dirty(index)
+        return arrays
+    
+    def set_instance(self, index, instance):
+        """Point a node at the node whose mesh buffers it shares, or at None, keeping mesh_sharers in step"""
+        node = self.scene_nodes[index]
+        old = node.get('instance')
+        if old is not None:
+            sharers = self.mesh_sharers.get(old)
+            if sharers is not None:
+                sharers.discard(index)
+                if not sharers:
+                    del self.mesh_sharers[old]
+        if instance is None:
+            node.pop('instance', None)
+        else:
+            node['instance'] = instance
+            self.mesh_sharers.setdefault(instance, set()).add(index)
+    
+    def index_sharers(self):
+        """Rebuild mesh_sharers from the node records, as after loading a scene"""
+        self.mesh_sharers = {}
+        for index, node in enumerate(self.scene_nodes):
+            if node.get('instance') is not None:
+                self.mesh_sharers.setdefault(node['instance'], set()).add(index)
+    
+    # Polygon modeling
+    
+    def selected_meshes(self):
+        """Return the selected nodes that have a mesh, the lead last"""
+        return [index for index in self.selected_nodes if self.mesh_lod(index) is not None]
+    
+    def node_poly(self, index):
+        """Return a mesh node's polygons; meshes saved without them are read as triangles"""
+        attributes = self.scene.attributes[index]
+        if 'primitive' in attributes:
+            vertices, quads, _ = self.primitives.mesh(attributes['primitive'], attributes.get('resolution'))
+            # Join the seams and poles a sphere's UV grid leaves open
+            return weld(PolyMesh.from_faces(vertices, quads))
+        if 'nurbs_control' in self.node_chunk_kinds(index):
+            # Converted at full detail, with the seams of closed surfaces joined
+            return weld(PolyMesh.from_faces(*self.node_surface(index).lod().mesh(0)))
+        if 'face_offsets' in self.node_chunk_kinds(index):
+            return PolyMesh(self.node_array(index, 'vertices'), self.node_array(index, 'face_offsets'),
+                            self.node_array(index, 'face_vertices'))
+        return PolyMesh.from_faces(self.node_array(index, 'vertices'), self.node_array(index, 'indices'))
+    
+    def read_mesh(self, index):
+        """Return what defines a node's mesh: its arrays, where they are shared from, and its primitive"""
+        node = self.scene_nodes[index]
+        attributes = self.scene.attributes[index]
+        return {
+            'arrays': node.get('arrays', {}),
+            'source': node.get('source'),
+            'instance': node.get('instance'),
+            'primitive': {name: attributes[name] for name in ('primitive', 'resolution') if name in attributes},
+        }
+    
+    def write_mesh(self, index, mesh):
+        """Restore a node's mesh from read_mesh(), as undo and redo do"""
+        node = self.scene_nodes[index]
+        node['arrays'] = mesh['arrays']
+        if mesh['source'] is None:
+            node.pop('source', None)
+        else:
+            node['source'] = mesh['source']
+        self.set_instance(index, mesh['instance'])
+        attributes = self.scene.attributes[index]
+        for name in ('primitive', 'resolution'):
+            attributes.pop(name, None)
+        attributes.update(mesh['primitive'])
+        self.mesh_changed(index)
+    
+    def set_poly(self, index, label, mesh):
+        """Replace a node's mesh with new polygons, recording the old mesh for undo"""
+        self.undo_stack.push(MeshChange(self, label, index, self.read_mesh(index)))
+        self.own_mesh(index, copy=False).update(mesh.to_arrays())
+        self.mesh_changed(index)
+    
+    def mesh_changed(self, index):
+        """Re-bound and redraw a node whose mesh was replaced"""
+        self.nurbs_surfaces.pop(index, None)
+        skin = self.skin_clusters.pop(index, None)
+        if skin is not None:
+            skin[0].close()
+            self.mesh_bvhs.pop(skin[1], None)
+        self.regroup_mesh(index)
+        lod = self.mesh_lod(index)
+        if lod is not None and index < len(self.local_bounds):
+            centre, radius = lod.bounds[:3], lod.bounds[3]
+            self.local_bounds[index] = np.concatenate([centre - radius, centre + radius])
+            # Refit the scene BVH over the new bounds on the next query
+            self.scene.moved[index] = True
+        self.mark_node_dirty(index)
+        self.request_render()
+        if index == self.selected_node:
+            self.show_node_info(index)
+    
+    def model_selected(self, label, operator):
+        """Apply a modeling operator to every face of each selected mesh, as one undo step"""
+        nodes = self.selected_meshes()
+        if not nodes:
+            self.status_message.config(text=f"Select a mesh to {label.lower()}")
+            self.after(3000, lambda: self.status_message.config(text="Ready"))
+            return
+        start = time.perf_counter()
+        faces = 0
+        with self.undo_stack.group(label):
+            for index in nodes:
+                mesh = operator(self.node_poly(index))
+                self.set_poly(index, label, mesh)
+                faces += len(mesh)
+        elapsed = time.perf_counter() - start
+        self.status_message.config(text=f"{label}: {faces:,} faces in {elapsed * 1000:.1f} ms")
+        self.after(3000, lambda: self.status_message.config(text="Ready"))
+    
+    def extrude_faces(self):
+        """Extrude every face of the selected meshes on its own along its normal"""
+        distance = simpledialog.askfloat("Extrude", "Distance:", initialvalue=0.2, parent=self)
+        if distance is not None:
+            self.model_selected("Extrude", lambda mesh: extrude(mesh, np.arange(len(mesh)), distance,
+                                                                together=False))
+    
+    def bevel_faces(self):
+        """Bevel every face of the selected meshes"""
+        fraction = simpledialog.askfloat("Bevel", "Width (fraction of each face):", initialvalue=0.2,
+                                         minvalue=0.0, maxvalue=1.0, parent=self)
+        if fraction is not None:
+            self.model_selected("Bevel", lambda mesh: bevel(mesh, np.arange(len(mesh)), fraction))
+    
+    def multi_cut_faces(self):
+        """Slice the selected meshes in half across their longest side"""
+        def cut(mesh):
+            low, high = mesh.bounds()
+            return multi_cut(mesh, np.arange(len(mesh)), (low + high) / 2, np.eye(3)[np.argmax(high - low)])
+        self.model_selected("Multi-Cut", cut)
+    
+    def bridge_faces(self):
+        """Join two selected meshes into the lead one with a tube between their nearest faces
+
+        The other mesh is merged into the lead in the lead's space and
+        hidden. Its face nearest the lead's closest face, with as many
+        corners, is bridged to it.
+        """
+        nodes = self.selected_meshes()
+        if len(nodes) != 2:
+            self.status_message.config(text="Select two meshes to bridge")
+            self.after(3000, lambda: self.status_message.config(text="Ready"))
+            return
+        other, target = nodes
+        start = time.perf_counter()
+        mesh, joined = self.node_poly(target), self.node_poly(other)
+        matrix = np.linalg.inv(self.scene.world[target]) @ self.scene.world[other]
+        vertices = transform_points(joined.vertices, matrix)
+        centres, joined_centres = mesh.centroids(), PolyMesh(vertices, joined.offsets, joined.corners).centroids()
+        face_a = int(np.argmin(np.linalg.norm(centres - vertices.mean(axis=0), axis=1)))
+        candidates = np.flatnonzero(joined.sizes() == mesh.sizes()[face_a])
+        if not len(candidates):
+            self.status_message.config(text="Bridge: no face with matching corners")
+            self.after(3000, lambda: self.status_message.config(text="Ready"))
+            return
+        face_b = candidates[np.argmin(np.linalg.norm(joined_centres[candidates] - centres[face_a], axis=1))]
+        merged = PolyMesh(np.concatenate([mesh.vertices, vertices]),
+                          np.concatenate([mesh.offsets, joined.offsets[1:] + mesh.offsets[-1]]),
+                          np.concatenate([mesh.corners, joined.corners + len(mesh.vertices)]))
+        with self.undo_stack.group("Bridge"):
+            self.set_poly(target, "Bridge", bridge(merged, [face_a], [len(mesh) + face_b]))
+            self.undo_stack.push(ChannelChange(self, "Bridge", [other], 'visibility', None,
+                                               self.read_channel([other], 'visibility', None)))
+            self.write_channel([other], 'visibility', None, False)
+        elapsed = time.perf_counter() - start
+        self.status_message.config(text=f"Bridged {self.scene.names[other]} into {self.scene.names[target]} "
+                                        f"in {elapsed * 1000:.1f} ms")
+        self.after(3000, lambda: self.status_message.config(text="Ready"))
+    
+    def populate_scene_tree(self):
+        """Point the outliner at the scene graph; rows are only built for what is on screen"""
+        indexed = len(self.name_index)
+        if indexed < self.scene.count:
+            self.name_index.add(self.scene.names[indexed:], self.scene.types[indexed:])
+        self.scene_tree.set_scene(self.scene)
+        self.filter_scene()
+    
+    def search_text(self):
+        """Return the text typed in the search box, ignoring its placeholder"""
+        return "" if self.search_placeholder else self.search_var.get().strip()
+    
+    def on_search_focus(self, event):
+        """Swap the search placeholder out while the box has focus"""
+        if str(event.type) == 'FocusIn' and self.search_placeholder:
+            self.search_placeholder = False
+            self.search_var.set("")
+        elif str(event.type) == 'FocusOut' and not self.search_var.get():
+            self.search_placeholder = True
+            self.search_var.set("Search...")
+    
+    def filter_scene(self):
+        """Show only the nodes whose name or type contains the search text"""
+        text = self.search_text()
+        if not text:
+            self.scene_tree.set_filter(None)
+            return
+        start = time.perf_counter()
+        matches = self.name_index.search(text)
+        elapsed = time.perf_counter() - start
+        self.scene_tree.set_filter(matches)
+        self.status_message.config(text=f"{len(matches):,} matching \"{text}\" | search {elapsed * 1000:.2f} ms")
+    
+    def rename_node(self):
+        """Rename the selected node, keeping the search index current"""
+        index = self.selected_node
+        if index is None:
+            return
+        name = simpledialog.askstring("Rename", "New name:", initialvalue=self.scene.names[index], parent=self)
+        if not name or name == self.scene.names[index]:
+            return
+        if name in self.scene.names:
+            messagebox.showerror("Rename", f"A node named {name} already exists")
+            return
+        self.undo_stack.push(NameChange(self, "Rename", index, self.scene.names[index]))
+        self.write_name(index, name)
+    
+    def read_name(self, index):
+        """Return a node's name"""
+        return self.scene.names[index]
+    
+    def write_name(self, index, name):
+        """Rename a node everywhere it is shown or indexed"""
+        self.scene.names[index] = name
+        self.name_index.rename(index, name)
+        self.mark_node_dirty(index)
+        self.select_nodes(self.selected_nodes)
+        self.scene_tree.draw()
+        self.filter_scene()
     
     def create_viewports(self):
         """Create viewports with gridlines"""
@@ -606,6 +1085,7 @@ class GKSHALA(tk.Tk):
         )
         self.perspective_canvas.pack(fill=tk.BOTH, expand=True)
         self.draw_grid(self.perspective_canvas)
+        self.attach_renderer(self.perspective_canvas, 'perspective')
         
         # Add viewport controls
         viewport_controls = tk.Frame(perspective, bg=self.bg_darker)
@@ -623,6 +1103,7 @@ class GKSHALA(tk.Tk):
         front_canvas = tk.Canvas(front, bg=self.bg_dark, highlightthickness=0)
         front_canvas.pack(fill=tk.BOTH, expand=True)
         self.draw_grid(front_canvas)
+        self.attach_renderer(front_canvas, 'front')
         
         # Front view controls
         front_controls = tk.Frame(front, bg=self.bg_darker)
@@ -640,6 +1121,7 @@ class GKSHALA(tk.Tk):
         side_canvas = tk.Canvas(side, bg=self.bg_dark, highlightthickness=0)
         side_canvas.pack(fill=tk.BOTH, expand=True)
         self.draw_grid(side_canvas)
+        self.attach_renderer(side_canvas, 'side')
         
         # Side view controls
         side_controls = tk.Frame(side, bg=self.bg_darker)
@@ -657,6 +1139,7 @@ class GKSHALA(tk.Tk):
         top_canvas = tk.Canvas(top, bg=self.bg_dark, highlightthickness=0)
         top_canvas.pack(fill=tk.BOTH, expand=True)
         self.draw_grid(top_canvas)
+        self.attach_renderer(top_canvas, 'top')
         
         # Top view controls
         top_controls = tk.Frame(top, bg=self.bg_darker)
@@ -670,30 +1153,322 @@ class GKSHALA(tk.Tk):
         self.viewport_tabs.add(top, text="Top")
     
     def draw_grid(self, canvas):
-        """Draw gridlines on the viewport canvas"""
-        width = canvas.winfo_width()
-        height = canvas.winfo_height()
-        
-        if width <= 1 or height <= 1:
+        """Attach a grid to the viewport canvas that follows its size"""
+        # The grid binds its own resize handling and reuses its line items
+        self.viewport_grids.append(ViewportGrid(canvas))
+    
+    def attach_renderer(self, canvas, camera):
+        """Render the scene into a viewport canvas from one of the standard cameras"""
+        renderer = ViewportRenderer(canvas, camera)
+        self.viewport_renderers.append(renderer)
+        canvas.bind("<Configure>", lambda e: self.request_render(GRID_DEBOUNCE_MS), add='+')
+        canvas.bind("<Map>", lambda e: self.request_render(), add='+')
+        canvas.bind("<ButtonPress-1>", lambda e: self.on_viewport_press(renderer, e))
+        canvas.bind("<B1-Motion>", lambda e: self.on_viewport_drag(renderer, e))
+        canvas.bind("<ButtonRelease-1>", lambda e: self.on_viewport_release(renderer, e))
+    
+    def request_render(self, delay=0):
+        """Redraw the viewports once pending events are handled, or after a delay"""
+        if self.render_job is not None:
+            self.after_cancel(self.render_job)
+        if delay:
+            self.render_job = self.after(delay, self.render_viewports)
+        else:
+            self.render_job = self.after_idle(self.render_viewports)
+    
+    def render_viewports(self):
+        """Rasterize the scene meshes into every visible viewport"""
+        self.render_job = None
+        meshes = self.viewport_meshes()
+        for renderer in self.viewport_renderers:
+            renderer.render(meshes, self.display_mode, self.visible_nodes)
+    
+    def viewport_meshes(self):
+        """Return (LODMesh, world matrices, color, node indices) for every visible mesh node
+
+        Nodes are grouped by shared mesh, a primitive tessellation or the
+        buffers of duplicates, so each is drawn once with a stack of
+        instance matrices. The groups are kept by mesh_instances(), so a
+        render only filters each group's indices with array operations.
+        """
+        meshes = []
+        selected = np.array(self.selected_nodes, dtype=np.int64)
+        for lod, indices in self.mesh_instances().items():
+            indices = indices[self.scene.visibility[indices]]
+            highlighted = np.isin(indices, selected)
+            for mask, color in ((~highlighted, (180, 180, 180)), (highlighted, (77, 124, 255))):
+                if mask.any():
+                    meshes.append((lod, self.scene.world[indices[mask]], color, indices[mask]))
+        return meshes
+    
+    def mesh_instances(self):
+        """Return {LODMesh: node indices} for every mesh node, grouping nodes added since the last call
+
+        mesh_changed() moves a node whose mesh was replaced to its new
+        group, and closing the scene file starts the grouping over.
+        """
+        start = len(self.node_meshes)
+        if start < self.scene.count:
+            added = {}
+            for index in range(start, self.scene.count):
+                lod = self.mesh_lod(index)
+                self.node_meshes.append(lod)
+                if lod is not None:
+                    added.setdefault(lod, []).append(index)
+            for lod, indices in added.items():
+                group = self.mesh_groups.get(lod)
+                indices = np.array(indices, dtype=np.int64)
+                self.mesh_groups[lod] = indices if group is None else np.concatenate([group, indices])
+        return self.mesh_groups
+    
+    def regroup_mesh(self, index):
+        """Move a node whose mesh was replaced into the group of its new levels of detail"""
+        if index >= len(self.node_meshes):
             return
-        
-        # Clear existing grid
-        canvas.delete("grid_line")
-        
-        # Draw vertical lines
-        for i in range(0, width, 20):
-            canvas.create_line(i, 0, i, height, fill='#333333', tags="grid_line")
-        
-        # Draw horizontal lines
-        for i in range(0, height, 20):
-            canvas.create_line(0, i, width, i, fill='#333333', tags="grid_line")
-        
-        # Draw center lines
-        canvas.create_line(width//2, 0, width//2, height, fill='#555555', width=1, tags="grid_line")
-        canvas.create_line(0, height//2, width, height//2, fill='#555555', width=1, tags="grid_line")
-        
-        # Bind resize event to redraw grid
-        canvas.bind("<Configure>", lambda e: self.draw_grid(canvas))
+        old, lod = self.node_meshes[index], self.mesh_lod(index)
+        if old is lod:
+            return
+        if old is not None:
+            group = self.mesh_groups[old]
+            group = group[group != index]
+            if len(group):
+                self.mesh_groups[old] = group
+            else:
+                del self.mesh_groups[old]
+        self.node_meshes[index] = lod
+        if lod is not None:
+            group = self.mesh_groups.get(lod)
+            self.mesh_groups[lod] = np.array([index]) if group is None else np.sort(np.append(group, index))
+    
+    def mesh_lod(self, index):
+        """Return the levels of detail of a mesh node, or None for a node without a shape"""
+        attributes = self.scene.attributes[index]
+        if 'primitive' in attributes:
+            return self.primitives.lod(attributes['primitive'], attributes.get('resolution'))
+        kinds = self.node_chunk_kinds(index)
+        if 'nurbs_control' in kinds:
+            return self.node_surface(index).lod()
+        if 'vertices' not in kinds or 'indices' not in kinds:
+            return None
+        if 'skin_weights' in kinds:
+            return self.node_skin(index)[1]
+        return self.node_lod(index)
+    
+    def node_skin(self, index):
+        """Return a skinned node's (cluster, levels of detail), drawing it posed by its joints"""
+        skin = self.skin_clusters.get(index)
+        if skin is None:
+            cluster = SkinCluster.from_arrays(self.node_array(index, 'vertices'),
+                                              {kind: self.node_array(index, kind) for kind in SKIN_CHUNKS})
+            indices = self.node_array(index, 'indices')
+            # Decimated levels would not follow the joints, so skinned meshes always draw at full detail
+            lod = LODMesh(bounding_sphere(cluster.vertices), [], lambda level: (cluster.posed, indices))
+            skin = self.skin_clusters[index] = (cluster, lod)
+            self.pose_skin(index)
+        return skin
+    
+    def pose_skin(self, index):
+        """Deform a skinned node to its joints' current pose, re-bounding it when the pose changed"""
+        cluster, lod = self.skin_clusters[index]
+        version = cluster.version
+        # The scene grows its matrix arrays by replacing them, so they are looked up on every pose
+        world = self.scene.world
+        cluster.deform(world[index], world[cluster.influences])
+        if cluster.version == version:
+            return
+        lod.bounds[:] = bounding_sphere(cluster.posed)
+        self.mesh_bvhs.pop(lod, None)
+        if index < len(self.local_bounds):
+            centre, radius = lod.bounds[:3], lod.bounds[3]
+            self.local_bounds[index] = np.concatenate([centre - radius, centre + radius])
+            self.scene.moved[index] = True
+    
+    def node_surface(self, index):
+        """Return a NURBS node's surface, built from its chunks on first use"""
+        surface = self.nurbs_surfaces.get(index)
+        if surface is None:
+            surface = NurbsSurface.from_arrays({kind: self.node_array(index, kind) for kind in NURBS_CHUNKS})
+            self.nurbs_surfaces[index] = surface
+        return surface
+    
+    def scene_index(self):
+        """Return the BVH over node world bounds, extended for new nodes and refit for moved ones"""
+        # Skinned meshes are posed first, so culling and picking see where their joints put them
+        for index in list(self.skin_clusters):
+            self.pose_skin(index)
+        count = self.scene.count
+        if self.scene_bvh is None or len(self.scene_bvh) != count:
+            bounds = []
+            for index in range(len(self.local_bounds), count):
+                lod = self.mesh_lod(index)
+                if lod is None:
+                    bounds.append([np.inf] * 3 + [-np.inf] * 3)
+                else:
+                    centre, radius = lod.bounds[:3], lod.bounds[3]
+                    bounds.append(np.concatenate([centre - radius, centre + radius]))
+            self.local_bounds = np.concatenate([self.local_bounds, np.reshape(bounds, (-1, 6))])
+            self.scene.take_moved()
+            lo, hi = transform_boxes(self.local_bounds[:, :3], self.local_bounds[:, 3:], self.scene.world[:count])
+            self.scene_bvh = BVH(lo, hi)
+        else:
+            moved = self.scene.take_moved()
+            if len(moved):
+                lo, hi = transform_boxes(self.local_bounds[moved, :3], self.local_bounds[moved, 3:],
+                                         self.scene.world[moved])
+                self.scene_bvh.refit(moved, lo, hi)
+        return self.scene_bvh
+    
+    def mesh_bvh(self, index):
+        """Return the triangle BVH of a mesh node at full detail, shared by its instances"""
+        lod = self.mesh_lod(index)
+        bvh = self.mesh_bvhs.get(lod)
+        if bvh is None:
+            bvh = MeshBVH(*lod.mesh(0))
+            self.mesh_bvhs[lod] = bvh
+        return bvh
+    
+    def visible_nodes(self, planes):
+        """Return a mask of the nodes whose bounds reach into a view frustum"""
+        mask = np.zeros(self.scene.count, dtype=bool)
+        mask[self.scene_index().frustum(planes)] = True
+        return mask
+    
+    def viewport_camera(self, renderer):
+        """Return (width, height, view, projection) of a viewport"""
+        width = max(renderer.canvas.winfo_width(), 1)
+        height = max(renderer.canvas.winfo_height(), 1)
+        view, projection = camera_matrices(renderer.camera, width / height)
+        return width, height, view, projection
+    
+    def pick_node(self, renderer, x, y):
+        """Return the nearest visible mesh node under a viewport pixel, or None"""
+        width, height, view, projection = self.viewport_camera(renderer)
+        origin, direction = screen_ray(x, y, width, height, view, projection)
+        items, entries = self.scene_index().ray(origin, direction)
+        nearest, picked = np.inf, None
+        for index, entry in zip(items.tolist(), entries.tolist()):
+            if entry > nearest:
+                break
+            if not self.scene.visibility[index]:
+                continue
+            # An affine map keeps the ray parameter, so hits in each mesh's space compare directly
+            inverse = np.linalg.inv(self.scene.world[index])
+            t, _ = self.mesh_bvh(index).raycast(inverse[:3, :3] @ origin + inverse[:3, 3], inverse[:3, :3] @ direction)
+            if t < nearest:
+                nearest, picked = t, index
+        return picked
+    
+    def lasso_nodes(self, renderer, points):
+        """Return the visible mesh nodes whose bounds centre falls inside a viewport lasso"""
+        width, height, view, projection = self.viewport_camera(renderer)
+        polygon = np.array(points, dtype=np.float64)
+        (x0, y0), (x1, y1) = polygon.min(axis=0), polygon.max(axis=0)
+        # Only nodes in the frustum under the lasso's bounding rectangle can be inside it
+        planes = frustum_planes(window_matrix(x0, y0, x1, y1, width, height) @ projection @ view)
+        bvh = self.scene_index()
+        candidates = bvh.frustum(planes)
+        lo, hi = bvh.boxes(candidates)
+        pixels, in_front = project_points((lo + hi) / 2, width, height, view, projection)
+        inside = in_front & points_in_polygon(pixels, polygon) & self.scene.visibility[candidates]
+        return candidates[inside].tolist()
+    
+    def set_select_tool(self, tool):
+        """Choose how viewport clicks select: 'select', 'lasso' or 'paint'"""
+        self.select_tool = tool
+        self.status_message.config(text=f"{tool.title()} tool")
+        self.after(3000, lambda: self.status_message.config(text="Ready"))
+    
+    def on_viewport_press(self, renderer, event):
+        """Pick under the cursor, or start a lasso"""
+        if self.select_tool == 'lasso':
+            self.lasso_points = [(event.x, event.y)]
+            self.lasso_item = renderer.canvas.create_line(event.x, event.y, event.x, event.y,
+                                                          fill=self.highlight_color)
+            return
+        start = time.perf_counter()
+        index = self.pick_node(renderer, event.x, event.y)
+        elapsed = time.perf_counter() - start
+        # Shift adds to the selection; painting always does
+        add = self.select_tool == 'paint' or bool(event.state & 0x0001)
+        if index is not None or not add:
+            self.select_nodes([] if index is None else [index], add=add)
+        self.report_selection("pick", elapsed)
+    
+    def on_viewport_drag(self, renderer, event):
+        """Extend a lasso or paint more nodes into the selection"""
+        if self.select_tool == 'lasso' and self.lasso_item is not None:
+            self.lasso_points.append((event.x, event.y))
+            renderer.canvas.coords(self.lasso_item, *[c for point in self.lasso_points for c in point])
+        elif self.select_tool == 'paint':
+            index = self.pick_node(renderer, event.x, event.y)
+            if index is not None and index not in self.selected_nodes:
+                self.select_nodes([index], add=True)
+    
+    def on_viewport_release(self, renderer, event):
+        """Select what a finished lasso encloses"""
+        if self.lasso_item is None:
+            return
+        renderer.canvas.delete(self.lasso_item)
+        self.lasso_item = None
+        if len(self.lasso_points) >= 3:
+            start = time.perf_counter()
+            indices = self.lasso_nodes(renderer, self.lasso_points)
+            elapsed = time.perf_counter() - start
+            self.select_nodes(indices, add=bool(event.state & 0x0001))
+            self.report_selection("lasso", elapsed)
+        self.lasso_points = []
+    
+    def report_selection(self, query, elapsed):
+        """Show the selection size and how long its query took"""
+        count = len(self.selected_nodes)
+        text = f"{count} selected" if count else "Nothing selected"
+        self.selection_info.config(text=f"{text} | {query} {elapsed * 1000:.2f} ms")
+    
+    def geometry_key(self, index):
+        """Return what identifies a mesh node's buffers, the same for nodes sharing them"""
+        node = self.scene_nodes[index]
+        vertices = node.get('arrays', {}).get('vertices')
+        if vertices is not None:
+            number = self.geometry_ids.get(id(vertices))
+            if number is None:
+                number = self.geometry_ids[id(vertices)] = next(self.geometry_counter)
+                # Forget the number when the array is freed, so a new array given its id() gets a new one
+                weakref.finalize(vertices, self.geometry_ids.pop, id(vertices), None)
+            return 'arrays', number
+        return 'chunk', self.scene_file.chunk_offset(node['source'], 'vertices')
+    
+    def node_lod(self, index):
+        """Return a mesh node's levels of detail, reading the ones decimated at import
+
+        Levels are cached per geometry, so duplicates sharing a mesh share
+        its levels and triangle BVH too.
+        """
+        key = self.geometry_key(index)
+        lod = self.lod_meshes.get(key)
+        if lod is None:
+            # Read through the buffers, not the node, which may later get its own copy
+            node = self.scene_nodes[index]
+            geometry = (node.get('arrays', {}), node.get('source'))
+            if 'lod_levels' in self.node_chunk_kinds(index):
+                cells = self.geometry_array(geometry, 'lod_levels')[:, 2]
+                lod = LODMesh(self.geometry_array(geometry, 'lod_bounds'), cells,
+                              lambda level: self.geometry_level(geometry, level))
+            else:
+                lod = LODMesh(bounding_sphere(self.geometry_array(geometry, 'vertices')), [],
+                              lambda level: self.geometry_level(geometry, level))
+            self.lod_meshes[key] = lod
+        return lod
+    
+    def geometry_level(self, geometry, level):
+        """Return (vertices, indices) of a mesh, level 0 being full detail"""
+        if level == 0:
+            return self.geometry_array(geometry, 'vertices'), self.geometry_array(geometry, 'indices')
+        return lod_level({kind: self.geometry_array(geometry, kind) for kind in LOD_CHUNKS}, level - 1)
+    
+    def set_display_mode(self, mode):
+        """Switch the viewports between wireframe, shaded and textured drawing"""
+        self.display_mode = mode
+        self.request_render()
     
     def create_channel_box(self):
         """Create the channel box on the right side"""
@@ -705,7 +1480,7 @@ class GKSHALA(tk.Tk):
         self.channel_notebook.add(channel_tab, text="Channel Box")
         
         # Title Label
-        title = tk.Label(
+        self.channel_title = tk.Label(
             channel_tab, 
             text="pCube1", 
             bg=self.bg_light, 
@@ -714,65 +1489,19 @@ class GKSHALA(tk.Tk):
             padx=5,
             anchor=tk.W
         )
-        title.pack(fill=tk.X)
-        
-        # Scrollable frame for attributes
-        scroll_frame = tk.Frame(channel_tab, bg=self.bg_darker)
-        scroll_frame.pack(fill=tk.BOTH, expand=True)
-        
-        canvas = tk.Canvas(scroll_frame, bg=self.bg_darker, highlightthickness=0)
-        scrollbar = ttk.Scrollbar(scroll_frame, orient="vertical", command=canvas.yview)
-        scrollable_frame = tk.Frame(canvas, bg=self.bg_darker)
+        self.channel_title.pack(fill=tk.X)
         
-        scrollable_frame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(
-                scrollregion=canvas.bbox("all")
-            )
+        # Recycled rows, rebound to the selected node's channels as it changes
+        self.channel_box = ChannelBox(
+            channel_tab,
+            value=self.channel_value,
+            commit=self.edit_channel,
+            bg=self.bg_darker,
+            fg=self.text_color,
+            field_bg=self.bg_light
         )
-        
-        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
-        
-        canvas.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
-        
-        # Add sample attributes
-        transform_attrs = [
-            ("Translate X", "0.000"),
-            ("Translate Y", "0.000"),
-            ("Translate Z", "0.000"),
-            ("Rotate X", "0.000"),
-            ("Rotate Y", "0.000"),
-            ("Rotate Z", "0.000"),
-            ("Scale X", "1.000"),
-            ("Scale Y", "1.000"),
-            ("Scale Z", "1.000"),
-            ("Visibility", "on")
-        ]
-        
-        for attr, value in transform_attrs:
-            attr_frame = tk.Frame(scrollable_frame, bg=self.bg_darker)
-            attr_frame.pack(fill=tk.X, padx=5, pady=1)
-            
-            tk.Label(
-                attr_frame, 
-                text=attr, 
-                bg=self.bg_darker, 
-                fg=self.text_color,
-                width=12,
-                anchor=tk.W
-            ).pack(side=tk.LEFT)
-            
-            tk.Entry(
-                attr_frame, 
-                bg=self.bg_light,
-                fg=self.text_color,
-                insertbackground=self.text_color,
-                bd=0,
-                width=10
-            ).pack(side=tk.RIGHT)
-            attr_frame.children['!entry'].insert(0, value)
+        self.channel_box.pack(fill=tk.BOTH, expand=True)
+        self.channel_box.set_channels(self.node_channels(None))
         
         # Shape Node Tab
         shape_tab = tk.Frame(self.channel_notebook, bg=self.bg_darker)
@@ -783,120 +1512,239 @@ class GKSHALA(tk.Tk):
         self.channel_notebook.add(layer_tab, text="Layer Editor")
     
     def create_attribute_editor(self):
-        """Create the attribute editor below the viewports"""
-        self.attribute_editor = ttk.Notebook(self.viewport_area)
-        self.viewport_area.add(self.attribute_editor)
-        
-        # Node Attributes Tab
-        node_tab = tk.Frame(self.attribute_editor, bg=self.bg_darker)
-        
-        # Scrollable area
-        scroll_frame = tk.Frame(node_tab, bg=self.bg_darker)
-        scroll_frame.pack(fill=tk.BOTH, expand=True)
-        
-        canvas = tk.Canvas(scroll_frame, bg=self.bg_darker, highlightthickness=0)
-        scrollbar = ttk.Scrollbar(scroll_frame, orient="vertical", command=canvas.yview)
-        scrollable_frame = tk.Frame(canvas, bg=self.bg_darker)
-        
-        scrollable_frame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(
-                scrollregion=canvas.bbox("all")
-            )
-        )
-        
-        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
-        
-        canvas.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
-        
-        # Transform attributes section
-        transform_frame = tk.LabelFrame(
-            scrollable_frame, 
-            text="Transform Attributes", 
+        """Create the attribute editor below the viewports; panels are built when first shown"""
+        start = time.perf_counter()
+        self.attribute_editor = AttributeEditor(
+            self.viewport_area,
+            value=self.channel_value,
+            commit=self.edit_channel,
             bg=self.bg_darker,
             fg=self.text_color,
-            padx=5,
-            pady=5
+            field_bg=self.bg_light
         )
-        transform_frame.pack(fill=tk.X, padx=5, pady=5)
-        
-        # Add transform attributes
-        transform_attrs = [
-            ("Translate", ["X", "0.000"], ["Y", "0.000"], ["Z", "0.000"]),
-            ("Rotate", ["X", "0.000"], ["Y", "0.000"], ["Z", "0.000"]),
-            ("Scale", ["X", "1.000"], ["Y", "1.000"], ["Z", "1.000"]),
-            ("Visibility", ["", "on"])
-        ]
-        
-        for attr_group in transform_attrs:
-            group_frame = tk.Frame(transform_frame, bg=self.bg_darker)
-            group_frame.pack(fill=tk.X, pady=2)
-            
-            tk.Label(
-                group_frame, 
-                text=attr_group[0], 
-                bg=self.bg_darker, 
-                fg=self.text_color,
-                width=12,
-                anchor=tk.W
-            ).pack(side=tk.LEFT)
-            
-            for attr in attr_group[1:]:
-                if attr[0]:  # If there's an axis label
-                    tk.Label(
-                        group_frame, 
-                        text=attr[0], 
-                        bg=self.bg_darker, 
-                        fg=self.text_color,
-                        width=1
-                    ).pack(side=tk.LEFT)
-                
-                tk.Entry(
-                    group_frame, 
-                    bg=self.bg_light,
-                    fg=self.text_color,
-                    insertbackground=self.text_color,
-                    bd=0,
-                    width=8
-                ).pack(side=tk.LEFT, padx=2)
-                group_frame.children['!entry'].insert(0, attr[1])
-        
-        # Add more attribute sections (Pivot, Limits, etc.)
-        sections = ["Pivot", "Limits", "Display"]
-        for section in sections:
-            section_frame = tk.LabelFrame(
-                scrollable_frame, 
-                text=f"{section} Attributes", 
-                bg=self.bg_darker,
-                fg=self.text_color,
-                padx=5,
-                pady=5
-            )
-            section_frame.pack(fill=tk.X, padx=5, pady=5)
-            
-            # Add some dummy controls
-            for i in range(3):
-                tk.Checkbutton(
-                    section_frame,
-                    text=f"{section} Option {i+1}",
-                    bg=self.bg_darker,
-                    fg=self.text_color,
-                    activebackground=self.bg_darker,
-                    activeforeground=self.text_color,
-                    selectcolor=self.bg_darker
-                ).pack(anchor=tk.W)
-        
-        self.attribute_editor.add(node_tab, text="pCube1")
-        
-        # Material Tab
-        material_tab = tk.Frame(self.attribute_editor, bg=self.bg_darker)
-        self.attribute_editor.add(material_tab, text="lambert1")
+        self.viewport_area.add(self.attribute_editor)
         
-        # Render Tab
-        render_tab = tk.Frame(self.attribute_editor, bg=self.bg_darker)
-        self.attribute_editor.add(render_tab, text="Render Stats")
+        if self.scene.count:
+            self.select_node(0)
+        self.attribute_editor_startup = time.perf_counter() - start
+    
+    def report_attribute_editor(self):
+        """Show how many attribute editor widgets exist and what building them has cost"""
+        if not hasattr(self, 'status_message'):
+            return
+        editor = self.attribute_editor
+        built = sum(editor.build_times.values()) * 1000
+        self.status_message.config(
+            text=f"Attribute editor: {editor.widget_count()} widgets, {len(editor.build_times)} panels "
+                 f"built in {built:.1f} ms (startup {self.attribute_editor_startup * 1000:.1f} ms)")
+        self.after(3000, lambda: self.status_message.config(text="Ready"))
+    
+    def node_channels(self, index):
+        """Return the channel box rows of a node: transforms, visibility and numeric custom attributes"""
+        channels = [(label, (column, component)) for label, column, component in CHANNELS]
+        channels.append(("Visibility", ('visibility', None)))
+        if index is not None:
+            for name, value in sorted(self.scene.attributes[index].items()):
+                if isinstance(value, (bool, int, float)):
+                    channels.append((name, (name, None)))
+        return channels
+    
+    def channel_value(self, key):
+        """Return the text the channel box shows for a channel of the selected node"""
+        index = self.selected_node
+        column, component = key
+        if index is None:
+            return ""
+        if column == 'visibility':
+            return "on" if self.scene.visibility[index] else "off"
+        if column in TRANSFORM_COLUMNS:
+            return f"{self.scene.get_channel(index, column, component):.3f}"
+        value = self.scene.attributes[index].get(column)
+        if value is None:
+            return ""
+        if isinstance(value, bool):
+            return "on" if value else "off"
+        return f"{value:.3f}" if isinstance(value, float) else str(value)
+    
+    def edit_channel(self, key, text):
+        """Write an edited channel box or attribute editor value to every selected node at once
+
+        Text may be a value or a relative edit such as '+=1' or '*=2'. The
+        whole selection is written with one array operation, journaled as
+        one record and redrawn once.
+        """
+        if self.selected_node is None:
+            return
+        nodes = np.array(self.selected_nodes, dtype=np.int64)
+        column, component = key
+        if column not in TRANSFORM_COLUMNS and column != 'visibility':
+            self.edit_custom_attribute(nodes, column, text)
+            return
+        if column == 'visibility':
+            value = text.lower() in ("on", "1", "true", "yes")
+            previous = self.scene.visibility[nodes]
+            if (previous == value).all():
+                self.refresh_transform_fields()
+                return
+            self.scene.write_channel(nodes, column, None, value)
+        else:
+            try:
+                operator, value = parse_channel_edit(text)
+            except ValueError:
+                self.refresh_transform_fields()
+                return
+            previous = self.scene.edit_channel(nodes, column, component, operator, value)
+            if np.array_equal(previous, self.read_channel(nodes, column, component)):
+                self.refresh_transform_fields()
+                return
+        label = self.channel_label(column, component)
+        span = None
+        with self.undo_stack.group(label):
+            self.undo_stack.push(ChannelChange(self, label, nodes, column, component, previous))
+            if self.auto_key and column != 'visibility':
+                # The curves set the pose, so undo has to restore them along with the value
+                self.undo_stack.push(KeyChange(self, label, nodes, column, component,
+                                               self.read_curves(nodes, column, component)))
+                spans = []
+                for node, node_value in zip(nodes.tolist(), self.read_channel(nodes, column, component).tolist()):
+                    self.keyframes.set_key(node, column, component, self.current_frame, node_value)
+                    spans.append(self.keyframes.influence(node, column, component, self.current_frame))
+                self.dirty_nodes.update(nodes.tolist())
+                self.invalidate_pose()
+                # The curves override the static values, so only the keys' span changes
+                span = (min(lo for lo, _ in spans), max(hi for _, hi in spans))
+        self.channel_written(nodes, column, span)
+    
+    def channel_label(self, column, component):
+        """Return the channel box label of a channel, as undo history names it"""
+        for label, channel_column, channel_component in CHANNELS:
+            if (channel_column, channel_component) == (column, component):
+                return label
+        return column.title()
+    
+    def read_channel(self, nodes, column, component):
+        """Return one channel's values for many nodes"""
+        if component is None:
+            return getattr(self.scene, column)[nodes]
+        return getattr(self.scene, column)[nodes, component]
+    
+    def write_channel(self, nodes, column, component, values):
+        """Write one channel's values for many nodes, as undo and redo do"""
+        self.scene.write_channel(nodes, column, component, values)
+        self.channel_written(nodes, column)
+    
+    def channel_written(self, nodes, column, span=None):
+        """Journal, re-pose and redraw after a channel of many nodes changed"""
+        self.journal_attribute(nodes, column, getattr(self.scene, column)[nodes])
+        self.update_scene()
+        self.frame_evaluator.invalidate()
+        if column != 'visibility':
+            self.invalidate_cache(nodes, span)
+        self.refresh_transform_fields()
+    
+    def read_curves(self, nodes, column, component):
+        """Return copies of one channel's curve for many nodes, empty where a node has none"""
+        keyframes = self.keyframes
+        curves = []
+        for node in np.asarray(nodes).tolist():
+            channel = keyframes.channel(node, column, component)
+            if channel is None:
+                curves.append((np.empty(0), np.empty(0), np.empty(0, dtype=np.int8)))
+            else:
+                curves.append((keyframes.times[channel].copy(), keyframes.values[channel].copy(),
+                               keyframes.modes[channel].copy()))
+        return curves
+    
+    def write_curves(self, nodes, column, component, curves):
+        """Replace one channel's curve for many nodes, as undo and redo do"""
+        for node, (times, values, modes) in zip(np.asarray(nodes).tolist(), curves):
+            self.keyframes.set_curve(node, column, component, times, values, modes)
+        self.dirty_nodes.update(np.asarray(nodes).tolist())
+        self.invalidate_pose()
+        self.invalidate_cache(nodes)
+    
+    def edit_custom_attribute(self, nodes, name, text):
+        """Write an edited numeric custom attribute to the selected nodes, keeping its type
+
+        Nodes lacking the attribute get it only when the lead node lacks it
+        too, as when a template field is filled in for the first time.
+        """
+        current = self.scene.attributes[self.selected_node].get(name)
+        if isinstance(current, bool):
+            value = text.lower() in ("on", "1", "true", "yes")
+        else:
+            try:
+                value = int(float(text)) if isinstance(current, int) else float(text)
+            except ValueError:
+                self.refresh_transform_fields()
+                return
+        changed = []
+        for index in nodes.tolist():
+            attributes = self.scene.attributes[index]
+            if (name in attributes or current is None) and attributes.get(name) != value:
+                changed.append(index)
+        if not changed:
+            self.refresh_transform_fields()
+            return
+        self.undo_stack.push(AttributeChange(self, name, changed, name, self.read_attribute(changed, name)))
+        self.write_attribute(changed, name, [value] * len(changed))
+    
+    def read_attribute(self, nodes, name):
+        """Return a custom attribute of many nodes, None where a node lacks it"""
+        return [self.scene.attributes[index].get(name) for index in np.asarray(nodes).tolist()]
+    
+    def write_attribute(self, nodes, name, values):
+        """Set a custom attribute of many nodes, removing it where the value is None"""
+        for index, value in zip(np.asarray(nodes).tolist(), values):
+            if value is None:
+                self.scene.attributes[index].pop(name, None)
+            else:
+                self.scene.attributes[index][name] = value
+            self.dirty_attributes.append((index, name, value))
+        self.frame_evaluator.invalidate()
+        self.request_render()
+        self.refresh_transform_fields()
+    
+    def journal_attribute(self, nodes, name, values):
+        """Queue one attribute of many nodes for the next incremental save as a single record"""
+        if len(nodes) == 1:
+            self.dirty_attributes.append((int(nodes[0]), name, values[0].tolist()))
+        else:
+            self.dirty_attributes.append((nodes, name, values.copy()))
+    
+    def refresh_transform_fields(self):
+        """Show the selected node's transform in the channel box and attribute editor"""
+        index = self.selected_node
+        # Only the rows on screen are rebound and read
+        self.channel_box.set_channels(self.node_channels(index))
+        self.attribute_editor.refresh()
+    
+    def select_node(self, index):
+        """Make a node the only selection, or clear the selection with None"""
+        self.select_nodes([] if index is None else [index])
+    
+    def select_nodes(self, indices, add=False):
+        """Select nodes; the last becomes the target of the channel box and attribute editor"""
+        indices = [int(index) for index in indices]
+        if add:
+            indices = [index for index in self.selected_nodes if index not in indices] + indices
+        self.selected_nodes = list(dict.fromkeys(indices))
+        index = self.selected_nodes[-1] if self.selected_nodes else None
+        self.selected_node = index
+        name = self.scene.names[index] if index is not None else ""
+        self.channel_title.config(text=name)
+        if self.attribute_editor.show(self.scene.types[index] if index is not None else None, name):
+            self.report_attribute_editor()
+        self.refresh_transform_fields()
+        self.show_node_info(index)
+        count = len(self.selected_nodes)
+        self.selection_info.config(text=f"{count} selected" if count else "Nothing selected")
+        if set(self.scene_tree.selection()) != set(self.selected_nodes):
+            self.scene_tree.selection_set(self.selected_nodes)
+            if index is not None:
+                self.scene_tree.focus(index)
+                self.scene_tree.see(index)
+        self.request_render()
     
     def create_time_slider(self):
         """Create the time slider at the bottom"""
@@ -962,14 +1810,18 @@ class GKSHALA(tk.Tk):
         range_frame.pack(side=tk.RIGHT)
         
         tk.Label(range_frame, text="Start:", bg=self.bg_darker, fg=self.text_color).pack(side=tk.LEFT)
-        start_entry = ttk.Entry(range_frame, width=4)
-        start_entry.pack(side=tk.LEFT)
-        start_entry.insert(0, "1")
+        self.start_entry = ttk.Entry(range_frame, width=4)
+        self.start_entry.pack(side=tk.LEFT)
+        self.start_entry.insert(0, "1")
         
         tk.Label(range_frame, text="End:", bg=self.bg_darker, fg=self.text_color).pack(side=tk.LEFT)
-        end_entry = ttk.Entry(range_frame, width=4)
-        end_entry.pack(side=tk.LEFT)
-        end_entry.insert(0, "100")
+        self.end_entry = ttk.Entry(range_frame, width=4)
+        self.end_entry.pack(side=tk.LEFT)
+        self.end_entry.insert(0, "100")
+        
+        for entry in (self.start_entry, self.end_entry):
+            entry.bind("<Return>", lambda e: self.apply_playback_range())
+            entry.bind("<FocusOut>", lambda e: self.apply_playback_range())
     
     def create_status_bar(self):
         """Create status bar at bottom"""
@@ -1005,13 +1857,31 @@ class GKSHALA(tk.Tk):
         res_label.pack(side=tk.RIGHT, padx=10)
         
         # Memory usage
-        mem_label = tk.Label(
+        self.mem_label = tk.Label(
             self.status_bar, 
-            text="Mem: 1.2GB", 
+            text="Mem: 0B", 
             bg=self.bg_darker,
             fg=self.text_color
         )
-        mem_label.pack(side=tk.RIGHT, padx=10)
+        self.mem_label.pack(side=tk.RIGHT, padx=10)
+        
+        # Playback rate and dropped frames
+        self.playback_label = tk.Label(
+            self.status_bar, 
+            text=f"Playback: -/{PLAYBACK_FPS:g} fps", 
+            bg=self.bg_darker,
+            fg=self.text_color
+        )
+        self.playback_label.pack(side=tk.RIGHT, padx=10)
+        
+        # Frames filled by the playback cache
+        self.cache_label = tk.Label(
+            self.status_bar, 
+            text="Cache: off", 
+            bg=self.bg_darker,
+            fg=self.text_color
+        )
+        self.cache_label.pack(side=tk.RIGHT, padx=10)
     
     def show_minimized(self):
         """Minimize the window"""
@@ -1029,9 +1899,33 @@ class GKSHALA(tk.Tk):
             self.maximize_btn.config(text="❐")
             self.is_maximized = True
     
+    def undo(self):
+        """Revert the latest edit"""
+        command = self.undo_stack.undo()
+        self.status_message.config(text=f"Undo: {command.label}" if command else "Nothing to undo")
+        self.after(3000, lambda: self.status_message.config(text="Ready"))
+    
+    def redo(self):
+        """Reapply the latest undone edit"""
+        command = self.undo_stack.redo()
+        self.status_message.config(text=f"Redo: {command.label}" if command else "Nothing to redo")
+        self.after(3000, lambda: self.status_message.config(text="Ready"))
+    
     def new_scene(self):
         """Create a new scene"""
+        self.close_scene_file()
         self.current_file = None
+        self.scene_nodes = []
+        self.mesh_sharers = {}
+        self.scene = SceneGraph()
+        self.name_index = NameIndex()
+        self.undo_stack.clear()
+        self.keyframes = KeyframeStore()
+        self.invalidate_pose()
+        self.playback_cache.reset()
+        self.update_cache_label()
+        self.select_node(None)
+        self.populate_scene_tree()
         self.doc_label.config(text="Untitled.gks")
         self.status_message.config(text="New scene created")
         self.after(3000, lambda: self.status_message.config(text="Ready"))
@@ -1039,8 +1933,14 @@ class GKSHALA(tk.Tk):
     def save_file(self):
         """Handle save file action"""
         if self.current_file:
-            # In a real app, you would save the file here
-            self.status_message.config(text=f"Saved {self.current_file}")
+            try:
+                written = self.save_incremental()
+            except OSError as e:
+                # The changes stay queued for the next save or autosave
+                messagebox.showerror("Save Scene", str(e))
+                self.status_message.config(text=f"Save failed: {e}")
+                return
+            self.status_message.config(text=f"Saved {self.current_file} (+{format_bytes(written)})")
             self.after(3000, lambda: self.status_message.config(text="Ready"))
         else:
             self.save_file_as()
@@ -1051,10 +1951,9 @@ class GKSHALA(tk.Tk):
             defaultextension=".gks",
             filetypes=[("GKSHALA Files", "*.gks"), ("All Files", "*.*")]
         )
-        if file_path:
+        if file_path and self.write_scene(file_path):
             self.current_file = file_path
             self.doc_label.config(text=file_path.split("/")[-1])
-            # In a real app, you would save the file here
             self.status_message.config(text=f"Saved as {file_path}")
             self.after(3000, lambda: self.status_message.config(text="Ready"))
     
@@ -1064,11 +1963,338 @@ class GKSHALA(tk.Tk):
             filetypes=[("GKSHALA Files", "*.gks"), ("All Files", "*.*")]
         )
         if file_path:
+            try:
+                recovered = self.read_scene(file_path)
+            except (OSError, GKSFormatError) as e:
+                messagebox.showerror("Open Scene", str(e))
+                return
             self.current_file = file_path
             self.doc_label.config(text=file_path.split("/")[-1])
-            # In a real app, you would open the file here
-            self.status_message.config(text=f"Opened {file_path}")
+            if recovered:
+                self.status_message.config(text=f"Opened {file_path}, recovered {recovered} journaled changes")
+            else:
+                self.status_message.config(text=f"Opened {file_path}")
+            self.after(3000, lambda: self.status_message.config(text="Ready"))
+    
+    def import_file(self):
+        """Import a mesh file as a new node, decimating its levels of detail once"""
+        file_path = filedialog.askopenfilename(
+            filetypes=[("Wavefront OBJ", "*.obj"), ("All Files", "*.*")]
+        )
+        if not file_path:
+            return
+        try:
+            record = import_mesh(file_path)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Import", str(e))
+            return
+        index = self.scene.add_node(record['name'], record['type'])
+        self.scene_nodes.append(record)
+        self.mark_node_dirty(index)
+        self.invalidate_pose()
+        self.populate_scene_tree()
+        self.select_node(index)
+        levels = len(record['arrays']['lod_levels'])
+        self.status_message.config(text=f"Imported {record['name']} with {levels} levels of detail")
+        self.after(3000, lambda: self.status_message.config(text="Ready"))
+    
+    def write_scene(self, file_path):
+        """Write the current scene to a .gks file, returning False if it could not be written"""
+        try:
+            self.swap_in_scene(stage_scene(file_path, self.scene_records()), file_path)
+        except OSError as e:
+            # The old file, its journal and the pending changes are left as they were
+            messagebox.showerror("Save Scene", str(e))
+            self.status_message.config(text=f"Save failed: {e}")
+            return False
+        SceneJournal(file_path).remove()
+        self.dirty_nodes.clear()
+        self.dirty_attributes = []
+        # Reopen so node arrays map the file we just wrote
+        self.read_scene(file_path)
+        return True
+    
+    def swap_in_scene(self, tmp_path, file_path):
+        """Replace a scene file with one written by stage_scene(), letting go of our mapping of it first
+
+        Windows refuses to replace a mapped file, so the open scene is
+        closed for the swap and then mapped again, from the new file or,
+        if the swap failed, the old one. Raises OSError on failure. Views
+        still held elsewhere can keep the old mapping alive; the swap then
+        fails there and is left to be retried.
+        """
+        mapped = self.scene_file is not None and os.path.abspath(self.scene_file.path) == os.path.abspath(file_path)
+        if mapped:
+            self.close_scene_file()
+        try:
+            os.replace(tmp_path, file_path)
+        except OSError:
+            discard_staged(tmp_path)
+            raise
+        finally:
+            if mapped:
+                self.scene_file = load_scene(file_path)
+    
+    def save_incremental(self):
+        """Append dirty nodes and attribute deltas to the scene journal"""
+        nodes = {index: self.journal_record(index) for index in self.dirty_nodes}
+        written = SceneJournal(self.current_file).append(nodes, self.dirty_attributes)
+        self.dirty_nodes.clear()
+        self.dirty_attributes = []
+        return written
+    
+    def autosave(self):
+        """Journal pending changes on a timer"""
+        if self.current_file and (self.dirty_nodes or self.dirty_attributes):
+            written = self.save_incremental()
+            self.status_message.config(text=f"Autosaved (+{format_bytes(written)})")
             self.after(3000, lambda: self.status_message.config(text="Ready"))
+        self.after(AUTOSAVE_INTERVAL, self.autosave)
+    
+    def compact_journal(self):
+        """Fold a large journal back into the scene file on a worker thread"""
+        self.after(COMPACT_INTERVAL, self.compact_journal)
+        if not self.current_file or self.compaction is not None:
+            return
+        journal = SceneJournal(self.current_file)
+        journal_size = journal.size()
+        if journal_size < COMPACT_MIN_BYTES:
+            return
+        
+        # Snapshot on the UI thread; anything journaled after this point is
+        # kept when the journal is truncated
+        records = self.scene_records()
+        compaction = {'path': self.current_file, 'keep_from': journal_size, 'count': len(records), 'error': None,
+                      # Mesh edits give a node a new arrays dict, so identity tells which nodes were left alone
+                      'meshes': [(node.get('arrays'), node.get('source')) for node in self.scene_nodes]}
+        
+        def work():
+            # Only the new file is written here; it is swapped in on the UI
+            # thread, which can release the mapping of the old one first
+            try:
+                compaction['staged'] = stage_scene(compaction['path'], records)
+            except OSError as e:
+                compaction['error'] = e
+        
+        compaction['thread'] = threading.Thread(target=work, daemon=True)
+        compaction['thread'].start()
+        self.compaction = compaction
+        self.after(200, self.finish_compaction)
+    
+    def finish_compaction(self):
+        """Swap in the compacted scene once the worker thread is done"""
+        compaction = self.compaction
+        if compaction['thread'].is_alive():
+            self.after(200, self.finish_compaction)
+            return
+        self.compaction = None
+        if compaction['error'] is None:
+            try:
+                self.swap_in_scene(compaction['staged'], compaction['path'])
+            except OSError as e:
+                compaction['error'] = e
+        if compaction['error'] is not None:
+            # The journal is kept whole, so the next interval tries again
+            self.status_message.config(text=f"Journal compaction failed: {compaction['error']}")
+            return
+        SceneJournal(compaction['path']).truncate(keep_from=compaction['keep_from'])
+        if compaction['path'] != self.current_file:
+            return
+        
+        # Point nodes unchanged since the snapshot at the rewritten file; nodes
+        # edited meanwhile keep their buffers, as the file holds their old mesh
+        for index, (arrays, source) in enumerate(compaction['meshes']):
+            node = self.scene_nodes[index]
+            if node.get('arrays') is arrays and node.get('source') == source:
+                node['source'] = index
+        self.status_message.config(text="Journal compacted")
+        self.after(3000, lambda: self.status_message.config(text="Ready"))
+    
+    def read_scene(self, file_path):
+        """Map a .gks file and rebuild the scene hierarchy from its table of contents"""
+        scene_file = load_scene(file_path)
+        self.close_scene_file()
+        self.scene_file = scene_file
+        # Chunks stay on disk until a panel asks for them through node_array()
+        self.scene_nodes = []
+        for index, entry in enumerate(scene_file.nodes):
+            self.scene_nodes.append({
+                'name': entry['name'],
+                'type': entry['type'],
+                'parent': entry['parent'],
+                'attributes': entry['attributes'],
+                'source': index,
+                'arrays': {},
+            })
+        # Replay changes journaled after the last full save (or before a crash)
+        recovered = replay_journal(file_path, self.scene_nodes)
+        self.index_sharers()
+        self.dirty_nodes.clear()
+        self.dirty_attributes = []
+        self.scene = SceneGraph.from_records(self.scene_nodes)
+        self.name_index = NameIndex()
+        self.undo_stack.clear()
+        self.populate_scene_tree()
+        self.keyframes = KeyframeStore()
+        for index in range(self.scene.count):
+            if 'anim_offsets' in self.node_chunk_kinds(index):
+                arrays = {kind: self.node_array(index, kind) for kind in ANIMATION_CHUNKS}
+                self.keyframes.load_node_arrays(index, arrays)
+        self.select_node(0 if self.scene.count else None)
+        self.invalidate_pose()
+        self.playback_cache.reset()
+        self.refresh_playback_cache()
+        self.update_frame(self.current_frame)
+        self.update_memory_label()
+        return recovered
+    
+    def close_scene_file(self):
+        """Release the memory map of the currently open scene"""
+        self.chunk_cache.clear()
+        self.lod_meshes.clear()
+        self.nurbs_surfaces.clear()
+        for cluster, _ in self.skin_clusters.values():
+            cluster.close()
+        self.skin_clusters.clear()
+        self.mesh_bvhs.clear()
+        self.scene_bvh = None
+        self.local_bounds = np.empty((0, 6))
+        self.node_meshes = []
+        self.mesh_groups = {}
+        if self.scene_file is not None:
+            self.scene_file.close()
+            self.scene_file = None
+        self.update_memory_label()
+    
+    def scene_records(self):
+        """Return node records with every chunk resolved for saving"""
+        return [self.resolve_node(index) for index in range(len(self.scene_nodes))]
+    
+    def resolve_node(self, index):
+        """Return one node record with its chunks resolved"""
+        node = self.scene_nodes[index]
+        arrays = {}
+        source = node.get('source')
+        if source is not None:
+            # Stream straight from the mapping instead of through the cache
+            arrays.update(self.scene_file.arrays(source))
+        arrays.update(node.get('arrays', {}))
+        # Curves are saved from the keyframe store, which may have dropped keys
+        for kind in ANIMATION_CHUNKS:
+            arrays.pop(kind, None)
+        arrays.update(self.keyframes.node_arrays(index))
+        attributes = dict(node.get('attributes', {}))
+        attributes.update(self.scene.attributes[index])
+        attributes.update(self.scene.node_attributes(index))
+        return dict(
+            node,
+            name=self.scene.names[index],
+            type=self.scene.types[index],
+            parent=int(self.scene.parent[index]),
+            attributes=attributes,
+            arrays=arrays,
+        )
+    
+    def journal_record(self, index):
+        """Return a node record for the journal, leaving out the chunks a duplicate shares"""
+        record = self.resolve_node(index)
+        if record.get('instance') is not None:
+            # Only keyframes are a duplicate's own until its mesh is edited
+            record['arrays'] = {kind: array for kind, array in record['arrays'].items()
+                                if kind in ANIMATION_CHUNKS}
+        return record
+    
+    def mark_node_dirty(self, index):
+        """Queue a whole node for the next incremental save"""
+        self.dirty_nodes.add(index)
+    
+    def set_node_attribute(self, index, name, value):
+        """Set a node attribute and queue the delta for the next incremental save"""
+        self.scene.set_node_attribute(index, name, value)
+        self.update_scene()
+        self.frame_evaluator.invalidate()
+        self.dirty_attributes.append((index, name, value))
+    
+    def update_scene(self):
+        """Recompute world matrices below edited nodes and report the cost"""
+        recomputed = self.scene.update_world()
+        self.xform_stats.config(text=f"Xforms: {recomputed}")
+        self.request_render()
+        return recomputed
+    
+    def node_chunk_kinds(self, index):
+        """Return the chunk kinds available for a node"""
+        node = self.scene_nodes[index]
+        kinds = list(node.get('arrays', {}))
+        if node.get('source') is not None:
+            kinds += [k for k in self.scene_file.chunk_kinds(node['source']) if k not in kinds]
+        return kinds
+    
+    def node_array(self, index, kind):
+        """Return a node's chunk, paging it in through the chunk cache"""
+        node = self.scene_nodes[index]
+        return self.geometry_array((node.get('arrays', {}), node.get('source')), kind)
+    
+    def geometry_array(self, geometry, kind):
+        """Return a chunk of an (arrays, source) pair, preferring arrays held in memory"""
+        arrays, source = geometry
+        if kind in arrays:
+            return arrays[kind]
+        array = self.chunk_cache.get(self.scene_file, source, kind)
+        self.update_memory_label()
+        return array
+    
+    def update_memory_label(self):
+        """Show the resident size of the chunk cache"""
+        if hasattr(self, 'mem_label'):
+            self.mem_label.config(text=f"Mem: {format_bytes(self.chunk_cache.resident_bytes)}")
+    
+    def on_scene_select(self, event=None):
+        """Select the nodes picked in the outliner, the focused one leading"""
+        selection = self.scene_tree.selection()
+        if set(selection) == set(self.selected_nodes):
+            return
+        focus = self.scene_tree.focus()
+        if focus in selection:
+            selection.remove(focus)
+            selection.append(focus)
+        self.select_nodes(selection)
+    
+    def show_node_info(self, index):
+        """Describe a node's shape in the attribute editor"""
+        if index is None:
+            self.attribute_editor.set_info("")
+            return
+        primitive = self.scene.attributes[index].get('primitive')
+        if primitive is not None:
+            vertices, quads, _ = self.primitives.mesh(primitive, self.scene.attributes[index].get('resolution'))
+            self.attribute_editor.set_info(f"Primitive: {primitive} | Verts: {len(vertices)} | Faces: {len(quads)}")
+            return
+        kinds = self.node_chunk_kinds(index)
+        if 'nurbs_control' in kinds:
+            surface = self.node_surface(index)
+            rows, columns = surface.control.shape[:2]
+            triangles = len(surface.lod().mesh(0)[1])
+            self.attribute_editor.set_info(f"NURBS: {rows} x {columns} CVs | Degree: {surface.degree_u} x "
+                                           f"{surface.degree_v} | Tris: {triangles}")
+            return
+        if 'vertices' not in kinds:
+            self.attribute_editor.set_info("No shape")
+            return
+        vertices = self.node_array(index, 'vertices')
+        if 'face_offsets' in kinds:
+            faces = len(self.node_array(index, 'face_offsets')) - 1
+        else:
+            faces = len(self.node_array(index, 'indices')) if 'indices' in kinds else 0
+        if len(vertices):
+            low, high = vertices.min(axis=0), vertices.max(axis=0)
+            size = " x ".join(f"{v:.2f}" for v in high - low)
+        else:
+            size = "empty"
+        levels = len(self.node_array(index, 'lod_levels')) if 'lod_levels' in kinds else 0
+        skinned = f" | Joints: {len(self.node_array(index, 'skin_influences'))}" if 'skin_weights' in kinds else ""
+        self.attribute_editor.set_info(f"Verts: {len(vertices)} | Faces: {faces} | Size: {size} | "
+                                       f"LODs: {levels}{skinned}")
     
     def start_move(self, event):
         """Start window move on title bar drag"""
@@ -1110,64 +2336,256 @@ class GKSHALA(tk.Tk):
         copyright = tk.Label(about, text="© 2023 GKSHALA Team. All rights reserved.", font=("Arial", 8))
         copyright.pack(side=tk.BOTTOM, pady=10)
     
+    def playback_range(self):
+        """Return the (start, end) frames from the time slider range entries"""
+        try:
+            start = int(float(self.start_entry.get()))
+            end = int(float(self.end_entry.get()))
+        except ValueError:
+            return int(self.time_slider.cget('from')), int(self.time_slider.cget('to'))
+        return start, max(start, end)
+    
+    def apply_playback_range(self):
+        """Resize the time slider to the range entries"""
+        start, end = self.playback_range()
+        self.time_slider.config(from_=start, to=end)
+        self.refresh_playback_cache()
+        if not start <= self.current_frame <= end:
+            self.go_to_frame(min(max(self.current_frame, start), end))
+    
+    def go_to_frame(self, frame):
+        """Move the time slider and pose the scene"""
+        self.current_frame = frame
+        self.time_slider.set(frame)
+        self.update_frame(frame)
+    
     def play(self):
         """Start animation playback"""
         if not self.playback_active:
+            start, end = self.playback_range()
+            frame = self.current_frame if start <= self.current_frame < end else start
             self.playback_active = True
+            self.playback_clock.start(frame, start, end)
             self.animate()
     
     def pause(self):
         """Pause animation playback"""
         self.playback_active = False
+        if self.playback_job is not None:
+            self.after_cancel(self.playback_job)
+            self.playback_job = None
     
     def stop(self):
-        """Stop animation and reset to frame 1"""
-        self.playback_active = False
-        self.current_frame = 1
-        self.time_slider.set(1)
-        self.update_frame(1)
+        """Stop animation and reset to the start frame"""
+        self.pause()
+        self.go_to_frame(self.playback_range()[0])
     
     def rewind(self):
         """Go to first frame"""
-        self.current_frame = 1
-        self.time_slider.set(1)
-        self.update_frame(1)
+        self.go_to_frame(self.playback_range()[0])
     
     def fast_forward(self):
         """Go to last frame"""
-        self.current_frame = 100
-        self.time_slider.set(100)
-        self.update_frame(100)
+        self.go_to_frame(self.playback_range()[1])
     
     def step_back(self):
         """Go to previous frame"""
-        if self.current_frame > 1:
-            self.current_frame -= 1
-            self.time_slider.set(self.current_frame)
-            self.update_frame(self.current_frame)
+        if self.current_frame > self.playback_range()[0]:
+            self.go_to_frame(self.current_frame - 1)
     
     def step_forward(self):
         """Go to next frame"""
-        if self.current_frame < 100:
-            self.current_frame += 1
-            self.time_slider.set(self.current_frame)
-            self.update_frame(self.current_frame)
+        if self.current_frame < self.playback_range()[1]:
+            self.go_to_frame(self.current_frame + 1)
     
     def animate(self):
-        """Animate the timeline"""
-        if self.playback_active and self.current_frame < 100:
-            self.current_frame += 1
-            self.time_slider.set(self.current_frame)
-            self.update_frame(self.current_frame)
-            self.after(50, self.animate)
-        else:
+        """Show the frame the playback clock says is due, then wait for the next one"""
+        self.playback_job = None
+        if not self.playback_active:
+            return
+        frame = self.playback_clock.tick()
+        if frame is None:
             self.playback_active = False
+            return
+        if frame != self.current_frame:
+            self.go_to_frame(frame)
+        clock = self.playback_clock
+        self.playback_label.config(
+            text=f"Playback: {clock.achieved_fps():.1f}/{clock.fps:g} fps | dropped {clock.dropped}"
+        )
+        self.playback_job = self.after(clock.delay_ms(), self.animate)
     
     def update_frame(self, frame):
-        """Update current frame display"""
-        self.current_frame = int(frame)
+        """Update current frame display and pose the scene"""
+        self.current_frame = int(float(frame))
         self.frame_var.set(f"Frame: {self.current_frame}")
+        # Moving the slider calls back in here; pose each frame only once
+        if self.current_frame == self.posed_frame:
+            return
+        self.posed_frame = self.current_frame
+        if len(self.keyframes):
+            self.request_pose()
+    
+    def request_pose(self):
+        """Pose the current frame from the playback cache, or hand it to the evaluator thread"""
+        if self.cache_playback and self.playback_cache.ready(self.current_frame):
+            recomputed = self.playback_cache.apply(self.current_frame, self.scene)
+            self.xform_stats.config(text=f"Xforms: {recomputed}")
+            self.request_render()
+            self.refresh_transform_fields()
+            return
+        self.scene.update_world()
+        self.frame_evaluator.sync(self.scene, self.keyframes)
+        # While playing, the next frame is evaluated while this one is shown
+        self.frame_evaluator.request(self.current_frame, ahead=1 if self.playback_active else 0)
+        self.poll_evaluator()
+    
+    def poll_evaluator(self):
+        """Apply the current frame's pose if the evaluator has finished it"""
+        if self.evaluator_job is not None:
+            self.after_cancel(self.evaluator_job)
+            self.evaluator_job = None
+        result = self.frame_evaluator.take(self.current_frame)
+        if result is not None:
+            recomputed = self.frame_evaluator.apply(result, self.scene)
+            self.xform_stats.config(text=f"Xforms: {recomputed}")
+            self.request_render()
+            self.refresh_transform_fields()
+        elif self.frame_evaluator.busy():
+            self.evaluator_job = self.after(EVALUATOR_POLL_MS, self.poll_evaluator)
+    
+    def invalidate_pose(self):
+        """Re-pose the current frame on the next update after keys or transforms change"""
+        self.posed_frame = None
+        self.frame_evaluator.invalidate()
+    
+    def set_key(self):
+        """Key every transform channel of the selected node at the current frame"""
+        index = self.selected_node
+        if index is None:
+            return
+        spans = []
+        for label, column, component in CHANNELS:
+            value = self.scene.get_channel(index, column, component)
+            self.keyframes.set_key(index, column, component, self.current_frame, value)
+            spans.append(self.keyframes.influence(index, column, component, self.current_frame))
+        self.mark_node_dirty(index)
+        self.invalidate_pose()
+        self.invalidate_cache(index, (min(lo for lo, _ in spans), max(hi for _, hi in spans)))
+        self.status_message.config(text=f"Keyed {self.scene.names[index]} at frame {self.current_frame}")
+        self.after(3000, lambda: self.status_message.config(text="Ready"))
+    
+    # Rigging
+    
+    def create_joints(self):
+        """Lay a joint chain along the longest side of the selected mesh, or up from the origin"""
+        count = simpledialog.askinteger("Joint Tool", "Joints in chain:", initialvalue=4,
+                                        minvalue=2, maxvalue=64, parent=self)
+        if count is None:
+            return
+        meshes = self.selected_meshes()
+        if meshes:
+            points = transform_points(self.mesh_lod(meshes[-1]).mesh(0)[0], self.scene.world[meshes[-1]])
+            low, high = points.min(axis=0), points.max(axis=0)
+            axis = np.argmax(high - low)
+            start = (low + high) / 2
+            start[axis] = low[axis]
+            step = np.zeros(3)
+            step[axis] = (high[axis] - low[axis]) / (count - 1)
+        else:
+            start, step = np.zeros(3), np.array([0.0, 4.0 / (count - 1), 0.0])
+        first = self.scene.count
+        names = self.scene.unique_names(["joint1"] * count)
+        parents = np.arange(first - 1, first + count - 1)
+        parents[0] = -1
+        translate = np.vstack([start, np.tile(step, (count - 1, 1))])
+        self.scene.add_nodes(names, ['Joint'] * count, parents, translate=translate)
+        for offset, name in enumerate(names):
+            self.scene_nodes.append({'name': name, 'type': 'Joint', 'parent': int(parents[offset]), 'attributes': {}})
+            self.mark_node_dirty(first + offset)
+        self.invalidate_pose()
+        self.populate_scene_tree()
+        self.select_node(first)
+    
+    def bind_skin(self):
+        """Bind the selected meshes to the selected joints and the joints below them, or to every joint"""
+        selected = [index for index in self.selected_nodes if self.scene.types[index] == 'Joint']
+        candidates = self.scene.descendants(selected) if selected else np.arange(self.scene.count)
+        joints = np.array([index for index in candidates.tolist() if self.scene.types[index] == 'Joint'],
+                          dtype=np.int64)
+        meshes = [index for index in self.selected_meshes() if 'nurbs_control' not in self.node_chunk_kinds(index)]
+        if not len(joints) or not meshes:
+            self.status_message.config(text="Select joints and a polygon mesh to bind")
+            self.after(3000, lambda: self.status_message.config(text="Ready"))
+            return
+        positions = {node: position for position, node in enumerate(joints.tolist())}
+        parents = [positions.get(int(self.scene.parent[node]), -1) for node in joints.tolist()]
+        start = time.perf_counter()
+        vertices = 0
+        with self.undo_stack.group("Bind Skin"):
+            for index in meshes:
+                self.undo_stack.push(MeshChange(self, "Bind Skin", index, self.read_mesh(index)))
+                # Rebinding starts again from the rest pose, dropping the old binding
+                arrays = self.own_mesh(index, copy=False)
+                cluster = SkinCluster.bind_mesh(arrays['vertices'], joints, self.scene.world[index],
+                                                self.scene.world[joints], parents)
+                arrays.update(cluster.to_arrays())
+                self.mesh_changed(index)
+                vertices += len(cluster.vertices)
+        elapsed = time.perf_counter() - start
+        self.status_message.config(text=f"Bound {vertices:,} vertices to {len(joints)} joints "
+                                        f"in {elapsed * 1000:.1f} ms")
+        self.after(3000, lambda: self.status_message.config(text="Ready"))
+    
+    def toggle_auto_key(self):
+        """Turn automatic keying of channel edits on or off"""
+        self.auto_key = not self.auto_key
+        self.auto_key_btn.config(text="Auto Key ●" if self.auto_key else "Auto Key")
+    
+    def toggle_cache_playback(self):
+        """Turn precomputed playback of the time slider range on or off"""
+        self.cache_playback = not self.cache_playback
+        self.cache_playback_btn.config(text="Cache Playback ●" if self.cache_playback else "Cache Playback")
+        if self.cache_playback:
+            self.refresh_playback_cache()
+        else:
+            self.playback_cache.reset()
+            self.update_cache_label()
+    
+    def invalidate_cache(self, nodes, span=None):
+        """Mark cached frames below edited nodes stale, optionally only within a time span"""
+        self.playback_cache.invalidate(self.scene, np.atleast_1d(nodes), *(span or ()))
+        self.refresh_playback_cache()
+    
+    def refresh_playback_cache(self):
+        """Queue every stale frame of the playback range for the cache workers"""
+        if not self.cache_playback or not len(self.keyframes):
+            return
+        self.scene.update_world()
+        start, end = self.playback_range()
+        self.playback_cache.update(self.scene, self.keyframes, start, end)
+        self.poll_playback_cache()
+    
+    def poll_playback_cache(self):
+        """Collect filled frames until the whole range is cached"""
+        if self.cache_job is not None:
+            self.after_cancel(self.cache_job)
+            self.cache_job = None
+        if self.playback_cache.poll():
+            self.cache_job = self.after(CACHE_POLL_MS, self.poll_playback_cache)
+        self.update_cache_label()
+    
+    def update_cache_label(self):
+        """Show how much of the playback range is cached"""
+        cache = self.playback_cache
+        if not self.cache_playback:
+            self.cache_label.config(text="Cache: off")
+        else:
+            self.cache_label.config(
+                text=f"Cache: {cache.filled()}/{len(cache)} frames ({format_bytes(cache.nbytes())})"
+            )
 
 if __name__ == "__main__":
     app = GKSHALA()
-    app.mainloop()
\ No newline at end of file
+    app.mainloop()
+    app.playback_cache.close()
\ No newline at end of file
@@ -0,0 +1,149 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from chunk_cache import ChunkCache
+from poly_mesh import PolyMesh
+from primitives import PrimitiveLibrary
+from scene_graph import SceneGraph
+from test import GKSHALA
+from undo import UndoStack
+
+
+class Label:
+    """Stands in for a Tk label"""
+
+    def config(self, **options):
+        self.options = options
+
+
+class HeadlessEditor(GKSHALA):
+    """The editor's scene and mesh state without its Tk window"""
+
+    def __init__(self):
+        self.scene = SceneGraph()
+        self.scene_nodes = []
+        self.scene_file = None
+        self.chunk_cache = ChunkCache()
+        self.primitives = PrimitiveLibrary()
+        self.lod_meshes = {}
+        self.geometry_ids = {}
+        self.geometry_counter = itertools.count()
+        self.mesh_sharers = {}
+        self.nurbs_surfaces = {}
+        self.skin_clusters = {}
+        self.mesh_bvhs = {}
+        self.node_meshes = []
+        self.mesh_groups = {}
+        self.local_bounds = np.empty((0, 6))
+        self.dirty_nodes = set()
+        self.undo_stack = UndoStack()
+        self.selected_node = None
+        self.selected_nodes = []
+        self.status_message = Label()
+
+    def after(self, *args):
+        pass
+
+    def invalidate_pose(self):
+        pass
+
+    def populate_scene_tree(self):
+        pass
+
+    def request_render(self):
+        pass
+
+    def select_nodes(self, nodes, add=False):
+        self.selected_nodes = list(nodes)
+
+    def add_mesh(self, name, parent=-1):
+        """Add a node with a quad mesh of its own"""
+        vertices = np.array([[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0]], dtype=np.float32)
+        index = self.scene.add_node(name, 'Polygon', parent=parent)
+        self.scene_nodes.append({'name': name, 'type': 'Polygon', 'parent': parent, 'attributes': {},
+                                 'arrays': {'vertices': vertices,
+                                            'indices': np.array([[0, 1, 2], [2, 3, 0]], dtype=np.int32)}})
+        return index
+
+    def duplicate(self, nodes):
+        self.selected_nodes = list(nodes)
+        self.duplicate_selected()
+        return self.selected_nodes
+
+
+@pytest.fixture
+def editor():
+    editor = HeadlessEditor()
+    group = editor.scene.add_node('grp1', 'Transform')
+    editor.scene_nodes.append({'name': 'grp1', 'type': 'Transform', 'parent': -1, 'attributes': {}})
+    editor.add_mesh('mesh1', parent=group)
+    return editor
+
+
+def test_scene_graph_duplicates_subtrees():
+    scene = SceneGraph()
+    root = scene.add_node('grp1', 'Transform', translate=(1, 2, 3))
+    child = scene.add_node('mesh1', 'Polygon', parent=root)
+    scene.add_node('other', 'Transform')
+    sources, copies = scene.duplicate([root])
+    assert sources.tolist() == [root, child]
+    assert copies.tolist() == [3, 4]
+    assert scene.parent[3] == -1 and scene.parent[4] == 3
+    assert scene.names[3] != 'grp1' and scene.names[4] != 'mesh1'
+    assert scene.translate[3].tolist() == [1, 2, 3]
+
+
+def test_duplicates_share_buffers_read_only(editor):
+    assert editor.duplicate([0]) == [2]
+    mesh_copy = 3
+    assert editor.scene.parent[mesh_copy] == 2
+    original, copy = editor.scene_nodes[1], editor.scene_nodes[mesh_copy]
+    assert copy['instance'] == 1
+    for kind in ('vertices', 'indices'):
+        assert copy['arrays'][kind] is original['arrays'][kind]
+        assert not original['arrays'][kind].flags.writeable
+    assert editor.geometry_key(1) == editor.geometry_key(mesh_copy)
+    assert editor.mesh_lod(1) is editor.mesh_lod(mesh_copy)
+
+
+def test_editing_a_duplicate_copies_its_buffers(editor):
+    copy = editor.duplicate([1])[0]
+    rest = editor.node_array(1, 'vertices').copy()
+    editor.own_mesh(copy)['vertices'][:] += 1
+    np.testing.assert_array_equal(editor.node_array(1, 'vertices'), rest)
+    np.testing.assert_array_equal(editor.node_array(copy, 'vertices'), rest + 1)
+    assert 'instance' not in editor.scene_nodes[copy]
+    assert editor.mesh_sharers == {}
+    assert editor.geometry_key(1) != editor.geometry_key(copy)
+
+
+def test_editing_the_original_hands_sharing_on(editor):
+    first = editor.duplicate([1])[0]
+    second = editor.duplicate([1])[0]
+    third = editor.duplicate([first])[0]
+    assert editor.mesh_sharers == {1: {first, second, third}}
+    buffers = editor.node_array(1, 'vertices')
+    editor.own_mesh(1)
+    assert editor.scene_nodes[first].get('instance') is None
+    assert editor.scene_nodes[second]['instance'] == first
+    assert editor.scene_nodes[third]['instance'] == first
+    assert editor.mesh_sharers == {first: {second, third}}
+    assert editor.node_array(third, 'vertices') is buffers
+
+
+def test_undoing_a_mesh_edit_restores_sharing(editor):
+    copy = editor.duplicate([1])[0]
+    buffers = editor.node_array(1, 'vertices')
+    quad = PolyMesh.from_faces(np.eye(4, 3, dtype=np.float32) * 2, np.array([[0, 1, 2, 3]]))
+    editor.set_poly(copy, "Edit", quad)
+    assert editor.node_array(copy, 'vertices') is not buffers
+    assert editor.mesh_sharers == {}
+
+    editor.undo_stack.undo()
+    assert editor.scene_nodes[copy]['instance'] == 1
+    assert editor.node_array(copy, 'vertices') is buffers
+    assert editor.mesh_sharers == {1: {copy}}
+    editor.undo_stack.redo()
+    assert editor.mesh_sharers == {}
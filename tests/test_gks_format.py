@@ -0,0 +1,107 @@
+import os
+
+import numpy as np
+import pytest
+
+from gks_format import ALIGNMENT, GKSFormatError, load_scene, save_scene, stage_scene
+
+
+def sample_nodes():
+    """Return a small hierarchy: a group, a mesh under it, and a duplicate sharing the mesh"""
+    vertices = np.arange(24, dtype=np.float32).reshape(8, 3)
+    indices = np.array([[0, 1, 2], [2, 3, 0]], dtype=np.int32)
+    return [
+        {'name': 'grp1', 'type': 'Transform', 'parent': -1, 'attributes': {'translate': [1, 2, 3]}},
+        {'name': 'mesh1', 'type': 'Polygon', 'parent': 0, 'attributes': {},
+         'arrays': {'vertices': vertices, 'indices': indices}},
+        {'name': 'mesh2', 'type': 'Polygon', 'parent': 0, 'attributes': {'visibility': False},
+         'arrays': {'vertices': vertices, 'indices': indices}},
+    ]
+
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / "scene.gks")
+    nodes = sample_nodes()
+    save_scene(path, nodes)
+    with load_scene(path) as scene:
+        assert len(scene) == 3
+        assert [node['name'] for node in scene.nodes] == ['grp1', 'mesh1', 'mesh2']
+        assert [node['parent'] for node in scene.nodes] == [-1, 0, 0]
+        assert scene.nodes[0]['attributes'] == {'translate': [1, 2, 3]}
+        assert scene.nodes[2]['attributes'] == {'visibility': False}
+        assert scene.chunk_kinds(0) == []
+        for index in (1, 2):
+            for kind, array in nodes[index]['arrays'].items():
+                loaded = scene.array(index, kind)
+                assert loaded.dtype == array.dtype
+                np.testing.assert_array_equal(loaded, array)
+                assert scene.chunk_nbytes(index, kind) == array.nbytes
+                assert scene.chunk_offset(index, kind) % ALIGNMENT == 0
+
+
+def test_chunks_are_read_only_views(tmp_path):
+    path = str(tmp_path / "scene.gks")
+    save_scene(path, sample_nodes())
+    with load_scene(path) as scene:
+        vertices = scene.array(1, 'vertices')
+        assert not vertices.flags.writeable
+        del vertices
+
+
+def test_shared_buffers_are_written_once(tmp_path):
+    shared = str(tmp_path / "shared.gks")
+    copied = str(tmp_path / "copied.gks")
+    nodes = sample_nodes()
+    save_scene(shared, nodes)
+    nodes[2]['arrays'] = {kind: array.copy() for kind, array in nodes[2]['arrays'].items()}
+    save_scene(copied, nodes)
+    with load_scene(shared) as scene:
+        assert scene.chunk_offset(1, 'vertices') == scene.chunk_offset(2, 'vertices')
+    with load_scene(copied) as scene:
+        assert scene.chunk_offset(1, 'vertices') != scene.chunk_offset(2, 'vertices')
+    assert os.path.getsize(shared) < os.path.getsize(copied)
+
+
+def test_big_endian_arrays_are_stored_little_endian(tmp_path):
+    path = str(tmp_path / "scene.gks")
+    values = np.arange(5, dtype='>f8')
+    save_scene(path, [{'name': 'n', 'arrays': {'values': values}}])
+    with load_scene(path) as scene:
+        loaded = scene.array(0, 'values')
+        assert loaded.dtype == np.dtype('<f8')
+        np.testing.assert_array_equal(loaded, values)
+
+
+@pytest.mark.parametrize("data", [b"", b"GKS", b"NOPE" + bytes(28)])
+def test_rejects_files_that_are_not_scenes(tmp_path, data):
+    path = tmp_path / "bad.gks"
+    path.write_bytes(data)
+    with pytest.raises(GKSFormatError):
+        load_scene(str(path))
+
+
+def test_failed_save_keeps_previous_file(tmp_path, monkeypatch):
+    path = str(tmp_path / "scene.gks")
+    save_scene(path, sample_nodes())
+    before = open(path, "rb").read()
+
+    def replace(source, target):
+        raise OSError(28, "No space left on device")
+
+    monkeypatch.setattr(os, 'replace', replace)
+    with pytest.raises(OSError):
+        save_scene(path, sample_nodes()[:1])
+    assert open(path, "rb").read() == before
+    assert os.listdir(tmp_path) == ["scene.gks"]
+
+
+def test_staged_scene_leaves_the_open_file_alone(tmp_path):
+    path = str(tmp_path / "scene.gks")
+    save_scene(path, sample_nodes())
+    with load_scene(path) as scene:
+        staged = stage_scene(path, sample_nodes()[:1])
+        assert len(scene) == 3
+        np.testing.assert_array_equal(scene.array(1, 'indices'), sample_nodes()[1]['arrays']['indices'])
+    os.replace(staged, path)
+    with load_scene(path) as scene:
+        assert len(scene) == 1
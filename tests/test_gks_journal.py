@@ -0,0 +1,97 @@
+import os
+
+import numpy as np
+
+from gks_format import load_scene, save_scene
+from gks_journal import SceneJournal, journal_path, replay_journal
+
+
+def saved_scene(tmp_path):
+    """Save a two-node scene and return its path with the records read back as read_scene() does"""
+    path = str(tmp_path / "scene.gks")
+    save_scene(path, [
+        {'name': 'grp1', 'type': 'Transform', 'parent': -1, 'attributes': {}},
+        {'name': 'mesh1', 'type': 'Polygon', 'parent': 0, 'attributes': {},
+         'arrays': {'vertices': np.zeros((4, 3), dtype=np.float32)}},
+    ])
+    return path, open_records(path)
+
+
+def open_records(path):
+    """Return node records pointing at the chunks of a saved scene"""
+    with load_scene(path) as scene:
+        return [{'name': entry['name'], 'type': entry['type'], 'parent': entry['parent'],
+                 'attributes': entry['attributes'], 'source': index, 'arrays': {}}
+                for index, entry in enumerate(scene.nodes)]
+
+
+def test_replay_applies_nodes_and_attributes(tmp_path):
+    path, nodes = saved_scene(tmp_path)
+    journal = SceneJournal(path)
+    vertices = np.ones((4, 3), dtype=np.float32)
+    journal.append({1: dict(nodes[1], arrays={'vertices': vertices}),
+                    2: {'name': 'mesh2', 'type': 'Polygon', 'parent': 0, 'instance': 1}})
+    journal.append(attributes=[(0, 'visibility', False)])
+    journal.append(attributes=[(np.array([0, 1]), 'translateX', np.array([2.0, 3.0]))])
+
+    nodes = open_records(path)
+    assert replay_journal(path, nodes) == 4
+    assert len(nodes) == 3
+    np.testing.assert_array_equal(nodes[1]['arrays']['vertices'], vertices)
+    assert nodes[2]['instance'] == 1
+    assert nodes[2]['arrays']['vertices'] is nodes[1]['arrays']['vertices']
+    assert nodes[0]['attributes'] == {'visibility': False, 'translateX': 2.0}
+    assert nodes[1]['attributes'] == {'translateX': 3.0}
+
+
+def test_torn_tail_is_cut_off(tmp_path):
+    path, nodes = saved_scene(tmp_path)
+    journal = SceneJournal(path)
+    journal.append(attributes=[(0, 'visibility', False)])
+    intact = journal.size()
+    journal.append(attributes=[(1, 'visibility', False)])
+    # A crash part-way through the second append
+    with open(journal_path(path), "r+b") as f:
+        f.truncate(intact + 5)
+
+    assert replay_journal(path, open_records(path)) == 1
+    assert journal.size() == intact
+    # Records appended after the repair are not hidden behind the torn one
+    journal.append(attributes=[(1, 'name', 'kept')])
+    nodes = open_records(path)
+    assert replay_journal(path, nodes) == 2
+    assert nodes[1]['attributes'] == {'name': 'kept'}
+
+
+def test_corrupt_record_stops_replay(tmp_path):
+    path, nodes = saved_scene(tmp_path)
+    journal = SceneJournal(path)
+    journal.append(attributes=[(0, 'visibility', False)])
+    journal.append(attributes=[(1, 'visibility', False)])
+    with open(journal_path(path), "r+b") as f:
+        f.seek(-1, os.SEEK_END)
+        last = f.read(1)
+        f.seek(-1, os.SEEK_END)
+        f.write(bytes([last[0] ^ 0xFF]))
+
+    nodes = open_records(path)
+    assert replay_journal(path, nodes) == 1
+    assert 'visibility' not in nodes[1]['attributes']
+
+
+def test_truncate_keeps_records_after_compaction_started(tmp_path):
+    path, nodes = saved_scene(tmp_path)
+    journal = SceneJournal(path)
+    journal.append(attributes=[(0, 'visibility', False)])
+    keep_from = journal.size()
+    journal.append(attributes=[(1, 'visibility', False)])
+
+    journal.truncate(keep_from=keep_from)
+    nodes = open_records(path)
+    assert replay_journal(path, nodes) == 1
+    assert nodes[0]['attributes'] == {}
+    assert nodes[1]['attributes'] == {'visibility': False}
+
+    journal.truncate()
+    assert not journal.exists()
+    assert replay_journal(path, open_records(path)) == 0
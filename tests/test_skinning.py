@@ -0,0 +1,108 @@
+import numpy as np
+
+import skinning
+from skinning import MAX_INFLUENCES, SkinCluster, bind_weights, deform_points
+
+
+def chain(joint_count=4, vertex_count=500):
+    """Return (vertices, worlds, parents) for a joint chain up Y inside a cloud of vertices"""
+    rng = np.random.default_rng(1)
+    vertices = (rng.random((vertex_count, 3)) * [1, joint_count, 1] - [0.5, 0, 0.5]).astype(np.float32)
+    worlds = np.tile(np.eye(4), (joint_count, 1, 1))
+    worlds[:, 1, 3] = np.arange(joint_count)
+    return vertices, worlds, np.arange(joint_count) - 1
+
+
+def translated(worlds, offset):
+    """Return the world matrices moved by offset"""
+    moved = worlds.copy()
+    moved[:, :3, 3] += offset
+    return moved
+
+
+def dense_reference(vertices, indptr, joints, weights, matrices):
+    """Blend every vertex's skinned positions one influence at a time"""
+    out = np.zeros_like(vertices, dtype=np.float64)
+    for vertex in range(len(vertices)):
+        row = slice(indptr[vertex], indptr[vertex + 1])
+        if row.start == row.stop:
+            out[vertex] = vertices[vertex]
+        for joint, weight in zip(joints[row], weights[row]):
+            out[vertex] += weight * (matrices[joint][:, :3] @ vertices[vertex] + matrices[joint][:, 3])
+    return out
+
+
+def test_bind_weights_are_normalized_csr():
+    vertices, worlds, _ = chain()
+    starts = worlds[:, :3, 3]
+    indptr, joints, weights = bind_weights(vertices.astype(np.float64), starts, starts + [0, 1, 0])
+    assert len(indptr) == len(vertices) + 1
+    assert (np.diff(indptr) == MAX_INFLUENCES).all()
+    np.testing.assert_allclose(np.add.reduceat(weights, indptr[:-1]), 1, rtol=1e-5)
+    # Each vertex leans most on the bone it sits beside
+    strongest = joints.reshape(-1, MAX_INFLUENCES)[np.arange(len(vertices)),
+                                                   weights.reshape(-1, MAX_INFLUENCES).argmax(axis=1)]
+    assert (strongest == np.clip(vertices[:, 1].astype(int), 0, 3)).mean() > 0.9
+
+
+def test_bind_pose_and_rigid_moves():
+    vertices, worlds, parents = chain()
+    cluster = SkinCluster.bind_mesh(vertices, np.arange(4), np.eye(4), worlds, parents, workers=1)
+    np.testing.assert_allclose(cluster.deform(np.eye(4), worlds), vertices, atol=1e-5)
+    np.testing.assert_allclose(cluster.deform(np.eye(4), translated(worlds, (2, 0, -1))),
+                               vertices + [2, 0, -1], atol=1e-5)
+    # Moving the mesh along with its joints leaves it where it was in its own space
+    mesh_world = np.eye(4)
+    mesh_world[:3, 3] = (2, 0, -1)
+    np.testing.assert_allclose(cluster.deform(mesh_world, translated(worlds, (2, 0, -1))), vertices, atol=1e-5)
+
+
+def test_ragged_rows_match_dense_blend():
+    rng = np.random.default_rng(2)
+    vertices = rng.random((9000, 3)).astype(np.float32)
+    counts = rng.integers(0, 4, len(vertices))
+    indptr = np.concatenate([[0], np.cumsum(counts)])
+    joints = rng.integers(0, 5, indptr[-1]).astype(np.int32)
+    weights = rng.random(indptr[-1]).astype(np.float32)
+    matrices = rng.normal(size=(5, 3, 4)).astype(np.float32)
+    out = deform_points(vertices, indptr, joints, weights, matrices, np.empty_like(vertices))
+    np.testing.assert_allclose(out, dense_reference(vertices, indptr, joints, weights, matrices),
+                               rtol=1e-4, atol=1e-4)
+    # Vertices without influences keep their rest position
+    np.testing.assert_array_equal(out[counts == 0], vertices[counts == 0])
+
+
+def test_unchanged_pose_is_reused():
+    vertices, worlds, parents = chain()
+    cluster = SkinCluster.bind_mesh(vertices, np.arange(4), np.eye(4), worlds, parents, workers=1)
+    posed = cluster.deform(np.eye(4), translated(worlds, (1, 0, 0)))
+    version = cluster.version
+    assert cluster.deform(np.eye(4), translated(worlds, (1, 0, 0))) is posed
+    assert cluster.version == version
+    cluster.deform(np.eye(4), worlds)
+    assert cluster.version == version + 1
+
+
+def test_saved_binding_deforms_the_same():
+    vertices, worlds, parents = chain()
+    cluster = SkinCluster.bind_mesh(vertices, np.arange(4), np.eye(4), worlds, parents, workers=1)
+    loaded = SkinCluster.from_arrays(vertices, cluster.to_arrays(), workers=1)
+    pose = translated(worlds, (0, 0, 3))
+    pose[2, :3, :3] = [[0, -1, 0], [1, 0, 0], [0, 0, 1]]
+    np.testing.assert_array_equal(loaded.deform(np.eye(4), pose), cluster.deform(np.eye(4), pose))
+
+
+def test_worker_processes_match_in_process(monkeypatch):
+    monkeypatch.setattr(skinning, 'PARALLEL_VERTICES', 100)
+    vertices, worlds, parents = chain(vertex_count=3000)
+    local = SkinCluster.bind_mesh(vertices, np.arange(4), np.eye(4), worlds, parents, workers=1)
+    pooled = SkinCluster(vertices, local.influences, local.bind, local.indptr, local.joints, local.weights, workers=2)
+    try:
+        for offset in ((1, 0, 0), (0, 2, 0)):
+            pose = translated(worlds, offset)
+            np.testing.assert_array_equal(pooled.deform(np.eye(4), pose), local.deform(np.eye(4), pose))
+        # The workers wrote the pose straight into the shared block
+        assert not pooled.posed.flags.owndata
+    finally:
+        pooled.close()
+    assert pooled.posed.flags.owndata
@@ -0,0 +1,166 @@
+import numpy as np
+
+from undo import ChannelChange, KeyChange, MeshChange, NameChange, UndoStack
+
+
+class Editor:
+    """Holds one channel table, node names and curves the way the scene does, for commands to swap"""
+
+    def __init__(self, count):
+        self.table = np.zeros((count, 3))
+        self.names = [f"node{index}" for index in range(count)]
+        self.curves = {}
+        self.meshes = {}
+
+    def read_channel(self, nodes, column, component):
+        return self.table[nodes, component].copy()
+
+    def write_channel(self, nodes, column, component, values):
+        self.table[nodes, component] = values
+
+    def read_name(self, node):
+        return self.names[node]
+
+    def write_name(self, node, name):
+        self.names[node] = name
+
+    def read_curves(self, nodes, column, component):
+        return [self.curves.get((node, column, component), ()) for node in nodes.tolist()]
+
+    def write_curves(self, nodes, column, component, curves):
+        for node, curve in zip(nodes.tolist(), curves):
+            if len(curve):
+                self.curves[node, column, component] = curve
+            else:
+                self.curves.pop((node, column, component), None)
+
+    def read_mesh(self, node):
+        return self.meshes[node]
+
+    def write_mesh(self, node, mesh):
+        self.meshes[node] = mesh
+
+    def set_mesh(self, stack, node, count, label="Edit"):
+        """Replace a node's mesh with one of count vertices and record it, as modeling tools do"""
+        stack.push(MeshChange(self, label, node, self.read_mesh(node)))
+        self.meshes[node] = {'arrays': {'vertices': np.zeros((count, 3))}}
+
+    def set_channel(self, stack, nodes, component, value, label="Set"):
+        """Apply an edit and record it, as the channel box does"""
+        stack.push(ChannelChange(self, label, nodes, 'translate', component,
+                                 self.read_channel(nodes, 'translate', component)))
+        self.table[nodes, component] = value
+
+
+def test_undo_and_redo_swap_values():
+    editor = Editor(4)
+    stack = UndoStack()
+    editor.set_channel(stack, [0, 2], 1, 5.0)
+    editor.set_channel(stack, [2], 1, 7.0)
+    assert editor.table[:, 1].tolist() == [5, 0, 7, 0]
+
+    assert stack.undo().label == "Set"
+    assert editor.table[:, 1].tolist() == [5, 0, 5, 0]
+    stack.undo()
+    assert editor.table[:, 1].tolist() == [0, 0, 0, 0]
+    assert stack.undo() is None
+
+    stack.redo()
+    stack.redo()
+    assert editor.table[:, 1].tolist() == [5, 0, 7, 0]
+    assert stack.redo() is None
+
+
+def test_push_drops_redo_history():
+    editor = Editor(2)
+    stack = UndoStack()
+    editor.set_channel(stack, [0], 0, 1.0)
+    stack.undo()
+    editor.set_channel(stack, [1], 0, 2.0)
+    assert stack.redo() is None
+    assert len(stack) == 1
+
+
+def test_group_is_one_step_and_coalesces_repeated_edits():
+    editor = Editor(3)
+    stack = UndoStack()
+    with stack.group("Drag"):
+        for value in range(1, 10):
+            editor.set_channel(stack, [0, 1], 0, float(value))
+        stack.push(NameChange(editor, "Rename", 2, editor.names[2]))
+        editor.names[2] = "renamed"
+    assert len(stack) == 1
+    # The nine drag steps merged into one change holding the values before the drag
+    assert len(stack.done[0].commands) == 2
+
+    stack.undo()
+    assert editor.table[:, 0].tolist() == [0, 0, 0]
+    assert editor.names[2] == "node2"
+    stack.redo()
+    assert editor.table[:, 0].tolist() == [9, 9, 0]
+    assert editor.names[2] == "renamed"
+
+
+def test_budget_evicts_oldest_but_keeps_newest():
+    editor = Editor(1000)
+    nodes = np.arange(1000)
+    stack = UndoStack(budget=20_000)
+    for value in range(5):
+        editor.set_channel(stack, nodes, 0, float(value))
+    assert stack.nbytes <= 20_000
+    assert 1 <= len(stack) < 5
+    while stack.undo():
+        pass
+    # Only the retained steps come back; the evicted first edits stay applied
+    assert (editor.table[:, 0] == 5 - len(stack.undone) - 1).all()
+
+    stack = UndoStack(budget=1)
+    editor.set_channel(stack, nodes, 1, 1.0)
+    assert len(stack) == 1
+
+
+def test_key_change_restores_missing_curves():
+    editor = Editor(2)
+    stack = UndoStack()
+    nodes = np.array([0, 1])
+    curve = (np.array([1.0, 10.0]), np.array([0.0, 4.0]), np.array([0, 0], dtype=np.uint8))
+    editor.curves[1, 'translate', 0] = curve
+    with stack.group("Auto Key"):
+        editor.set_channel(stack, nodes, 0, 4.0)
+        stack.push(KeyChange(editor, "Auto Key", nodes, 'translate', 0,
+                             editor.read_curves(nodes, 'translate', 0)))
+        keyed = (np.array([1.0]), np.array([4.0]), np.array([0], dtype=np.uint8))
+        editor.curves[0, 'translate', 0] = editor.curves[1, 'translate', 0] = keyed
+
+    stack.undo()
+    assert (0, 'translate', 0) not in editor.curves
+    assert editor.curves[1, 'translate', 0] is curve
+    assert editor.table[:, 0].tolist() == [0, 0]
+    stack.redo()
+    assert editor.curves[0, 'translate', 0][1].tolist() == [4.0]
+    assert editor.table[:, 0].tolist() == [4, 4]
+
+
+def test_budget_follows_commands_that_change_size():
+    editor = Editor(2)
+    editor.meshes[0] = {'arrays': {'vertices': np.zeros((10, 3))}}
+    stack = UndoStack(budget=40_000)
+
+    def held():
+        return sum(command.nbytes for command in list(stack.done) + stack.undone)
+
+    # The change holds the small old mesh, then swaps in the large new one on undo
+    editor.set_mesh(stack, 0, 1000)
+    assert stack.nbytes == held() == 240
+    stack.undo()
+    assert stack.nbytes == held() == 24_000
+    stack.redo()
+    assert stack.nbytes == held() == 240
+    stack.undo()
+    # Pushing drops the redo history at the size it has now, not the size it was pushed at
+    editor.set_mesh(stack, 0, 10)
+    assert stack.nbytes == held() == 240
+    for _ in range(3):
+        editor.set_mesh(stack, 0, 1000)
+    assert stack.nbytes == held() <= 40_000
+    assert len(stack) < 4
@@ -0,0 +1,303 @@
+from collections import deque
+from contextlib import contextmanager
+
+import numpy as np
+
+# Undo history is trimmed, oldest first, to stay under this many bytes
+UNDO_BUDGET = 64 * 1024 * 1024
+
+
+class ChannelChange:
+    """Values of one channel for a set of nodes
+
+    Only the other state's values are kept: undo and redo both swap them
+    with what the scene holds now, so a change costs one array of the
+    touched nodes rather than a copy of the scene. The editor supplies
+    read_channel(nodes, column, component) and write_channel(...).
+    """
+
+    def __init__(self, editor, label, nodes, column, component, values):
+        self.editor = editor
+        self.label = label
+        self.nodes = np.asarray(nodes, dtype=np.int32)
+        self.column = column
+        self.component = component
+        self.values = np.array(values)
+
+    @property
+    def nbytes(self):
+        return self.nodes.nbytes + self.values.nbytes
+
+    def swap(self):
+        current = self.editor.read_channel(self.nodes, self.column, self.component)
+        self.editor.write_channel(self.nodes, self.column, self.component, self.values)
+        self.values = current
+
+    def undo(self):
+        self.swap()
+
+    def redo(self):
+        self.swap()
+
+    def merge(self, other):
+        """Absorb a later change of the same channel on the same nodes, keeping the earlier values"""
+        return (type(other) is ChannelChange and other.column == self.column
+                and other.component == self.component and np.array_equal(other.nodes, self.nodes))
+
+
+class AttributeChange:
+    """Values of one custom attribute for a set of nodes, None where a node lacked it
+
+    Swapped like ChannelChange, through the editor's read_attribute(nodes,
+    name) and write_attribute(nodes, name, values).
+    """
+
+    def __init__(self, editor, label, nodes, name, values):
+        self.editor = editor
+        self.label = label
+        self.nodes = np.asarray(nodes, dtype=np.int32)
+        self.name = name
+        self.values = list(values)
+
+    @property
+    def nbytes(self):
+        # Boxed Python numbers plus the list slot pointing at each
+        return self.nodes.nbytes + 32 * len(self.values)
+
+    def swap(self):
+        current = self.editor.read_attribute(self.nodes, self.name)
+        self.editor.write_attribute(self.nodes, self.name, self.values)
+        self.values = current
+
+    def undo(self):
+        self.swap()
+
+    def redo(self):
+        self.swap()
+
+    def merge(self, other):
+        """Absorb a later change of the same attribute on the same nodes"""
+        return (type(other) is AttributeChange and other.name == self.name
+                and np.array_equal(other.nodes, self.nodes))
+
+
+class NameChange:
+    """A node's other name, swapped through the editor's read_name(node) and write_name(node, name)"""
+
+    def __init__(self, editor, label, node, name):
+        self.editor = editor
+        self.label = label
+        self.node = node
+        self.name = name
+
+    @property
+    def nbytes(self):
+        return 64 + len(self.name)
+
+    def swap(self):
+        current = self.editor.read_name(self.node)
+        self.editor.write_name(self.node, self.name)
+        self.name = current
+
+    def undo(self):
+        self.swap()
+
+    def redo(self):
+        self.swap()
+
+    def merge(self, other):
+        return type(other) is NameChange and other.node == self.node
+
+
+class KeyChange:
+    """Animation curves of one channel for a set of nodes
+
+    Each node's curve is kept whole as (times, values, modes), empty where
+    the node had none, and swapped through the editor's read_curves(nodes,
+    column, component) and write_curves(...). An auto-keyed edit pushes
+    one next to its ChannelChange, so undo takes back the keys the pose is
+    evaluated from and not only the static value.
+    """
+
+    def __init__(self, editor, label, nodes, column, component, curves):
+        self.editor = editor
+        self.label = label
+        self.nodes = np.asarray(nodes, dtype=np.int32)
+        self.column = column
+        self.component = component
+        self.curves = list(curves)
+
+    @property
+    def nbytes(self):
+        return self.nodes.nbytes + sum(array.nbytes for curve in self.curves for array in curve)
+
+    def swap(self):
+        current = self.editor.read_curves(self.nodes, self.column, self.component)
+        self.editor.write_curves(self.nodes, self.column, self.component, self.curves)
+        self.curves = current
+
+    def undo(self):
+        self.swap()
+
+    def redo(self):
+        self.swap()
+
+    def merge(self, other):
+        """Absorb a later change of the same curves, keeping the earlier ones"""
+        return (type(other) is KeyChange and other.column == self.column
+                and other.component == self.component and np.array_equal(other.nodes, self.nodes))
+
+
+class MeshChange:
+    """A node's other mesh, swapped through the editor's read_mesh(node) and write_mesh(node, mesh)
+
+    The mesh is a dict whose 'arrays' hold its buffers. They are kept by
+    reference, as modeling operators replace buffers rather than write
+    into them.
+    """
+
+    def __init__(self, editor, label, node, mesh):
+        self.editor = editor
+        self.label = label
+        self.node = node
+        self.mesh = mesh
+
+    @property
+    def nbytes(self):
+        return sum(array.nbytes for array in self.mesh['arrays'].values())
+
+    def swap(self):
+        current = self.editor.read_mesh(self.node)
+        self.editor.write_mesh(self.node, self.mesh)
+        self.mesh = current
+
+    def undo(self):
+        self.swap()
+
+    def redo(self):
+        self.swap()
+
+    def merge(self, other):
+        """Absorb a later change of the same node's mesh, keeping the earlier mesh"""
+        return type(other) is MeshChange and other.node == self.node
+
+
+class CompoundCommand:
+    """Changes made by one bulk operation, undone and redone as a unit
+
+    Consecutive changes of the same target are coalesced into the first,
+    so an operation that rewrites a channel many times stores it once.
+    """
+
+    def __init__(self, label):
+        self.label = label
+        self.commands = []
+
+    @property
+    def nbytes(self):
+        return sum(command.nbytes for command in self.commands)
+
+    def add(self, command):
+        if self.commands and self.commands[-1].merge(command):
+            return
+        self.commands.append(command)
+
+    def undo(self):
+        for command in reversed(self.commands):
+            command.undo()
+
+    def redo(self):
+        for command in self.commands:
+            command.redo()
+
+    def merge(self, other):
+        return False
+
+
+class UndoStack:
+    """Undo and redo history of commands, capped at a byte budget
+
+    push() records a change that has already been applied. Pushing drops
+    the redo history; going over budget evicts the oldest commands, though
+    the newest is always kept. Inside group() commands collect into one
+    CompoundCommand pushed when the block ends. A command's size can
+    change when it swaps, so each one's size is kept beside it and taken
+    again after every undo and redo, keeping nbytes the sum of the sizes
+    held.
+    """
+
+    def __init__(self, budget=UNDO_BUDGET):
+        self.budget = budget
+        self.done = deque()
+        self.undone = []
+        self.done_sizes = deque()
+        self.undone_sizes = []
+        self.nbytes = 0
+        self._group = None
+
+    def __len__(self):
+        return len(self.done)
+
+    def push(self, command):
+        """Record a command whose change is already in the scene"""
+        if self._group is not None:
+            self._group.add(command)
+            return
+        self.nbytes -= sum(self.undone_sizes)
+        self.undone.clear()
+        self.undone_sizes.clear()
+        size = command.nbytes
+        self.done.append(command)
+        self.done_sizes.append(size)
+        self.nbytes += size
+        while self.nbytes > self.budget and len(self.done) > 1:
+            self.done.popleft()
+            self.nbytes -= self.done_sizes.popleft()
+
+    @contextmanager
+    def group(self, label):
+        """Collect the commands pushed inside the block into one undo step"""
+        if self._group is not None:
+            yield
+            return
+        self._group = CompoundCommand(label)
+        try:
+            yield
+        finally:
+            compound, self._group = self._group, None
+            if compound.commands:
+                self.push(compound)
+
+    def undo(self):
+        """Revert the latest command and return it, or None if there is nothing to undo"""
+        if not self.done:
+            return None
+        command = self.done.pop()
+        command.undo()
+        self.undone.append(command)
+        self.undone_sizes.append(self.resize(self.done_sizes.pop(), command))
+        return command
+
+    def redo(self):
+        """Reapply the latest undone command and return it, or None"""
+        if not self.undone:
+            return None
+        command = self.undone.pop()
+        command.redo()
+        self.done.append(command)
+        self.done_sizes.append(self.resize(self.undone_sizes.pop(), command))
+        return command
+
+    def resize(self, size, command):
+        """Replace a command's recorded size with what it holds after a swap, and return that"""
+        new_size = command.nbytes
+        self.nbytes += new_size - size
+        return new_size
+
+    def clear(self):
+        """Forget all history, as when another scene is opened"""
+        self.done.clear()
+        self.undone.clear()
+        self.done_sizes.clear()
+        self.undone_sizes.clear()
+        self.nbytes = 0
@@ -0,0 +1,79 @@
+# Wait this long after the last resize event before redrawing
+GRID_DEBOUNCE_MS = 30
+
+
+class ViewportGrid:
+    """Grid lines for a viewport canvas drawn from a pool of reused items
+
+    Lines are created once, long enough to cover the largest size the
+    canvas has had (at least the screen), so a resize only moves the two
+    centre axis lines. Resize events are coalesced into one redraw, and a
+    canvas that is not mapped, such as one on a hidden notebook tab, is
+    brought up to date when it is next shown instead.
+    """
+
+    def __init__(self, canvas, spacing=20, color='#333333', axis_color='#555555', delay_ms=GRID_DEBOUNCE_MS):
+        self.canvas = canvas
+        self.spacing = spacing
+        self.color = color
+        self.axis_color = axis_color
+        self.delay_ms = delay_ms
+        self.width = canvas.winfo_width()
+        self.height = canvas.winfo_height()
+        self.extent = (0, 0)
+        self.vertical = []
+        self.horizontal = []
+        self.axes = []
+        self.drawn = None
+        self._job = None
+        canvas.bind("<Configure>", self.on_configure, add='+')
+        canvas.bind("<Map>", lambda e: self.draw(), add='+')
+
+    def on_configure(self, event):
+        """Remember the new size and redraw once resizing settles"""
+        self.width, self.height = event.width, event.height
+        if self._job is not None:
+            self.canvas.after_cancel(self._job)
+        self._job = self.canvas.after(self.delay_ms, self.draw)
+
+    def draw(self):
+        """Fit the grid to the canvas size if the canvas is showing"""
+        self._job = None
+        width, height = self.width, self.height
+        if width <= 1 or height <= 1 or (width, height) == self.drawn:
+            return
+        if not self.canvas.winfo_ismapped():
+            return
+        self.grow(width, height)
+        self.canvas.coords(self.axes[0], width // 2, 0, width // 2, height)
+        self.canvas.coords(self.axes[1], 0, height // 2, width, height // 2)
+        self.drawn = (width, height)
+
+    def grow(self, width, height):
+        """Extend the line pool when the canvas outgrows it"""
+        old_width, old_height = self.extent
+        if width <= old_width and height <= old_height:
+            return
+        canvas = self.canvas
+        spacing = self.spacing
+        new_width = max(old_width, width, canvas.winfo_screenwidth())
+        new_height = max(old_height, height, canvas.winfo_screenheight())
+
+        # Stretch the lines already in the pool, then add the missing ones
+        if new_height > old_height:
+            for k, item in enumerate(self.vertical):
+                canvas.coords(item, k * spacing, 0, k * spacing, new_height)
+        if new_width > old_width:
+            for k, item in enumerate(self.horizontal):
+                canvas.coords(item, 0, k * spacing, new_width, k * spacing)
+        for x in range(len(self.vertical) * spacing, new_width, spacing):
+            self.vertical.append(canvas.create_line(x, 0, x, new_height, fill=self.color, tags="grid_line"))
+        for y in range(len(self.horizontal) * spacing, new_height, spacing):
+            self.horizontal.append(canvas.create_line(0, y, new_width, y, fill=self.color, tags="grid_line"))
+
+        if not self.axes:
+            self.axes = [canvas.create_line(0, 0, 0, 0, fill=self.axis_color, width=1,
+                                            tags=("grid_line", "grid_axis")) for _ in range(2)]
+        else:
+            canvas.tag_raise("grid_axis")
+        self.extent = (new_width, new_height)
@@ -0,0 +1,72 @@
+import tkinter as tk
+
+import numpy as np
+
+from bvh import frustum_planes
+from lod import screen_diameters
+from rasterizer import Rasterizer, camera_matrices
+
+
+class ViewportRenderer:
+    """Shows a software-rendered camera view on a viewport canvas
+
+    Each frame is rasterized into a NumPy framebuffer and handed to Tk as
+    a single PPM PhotoImage update, so the canvas holds one image item no
+    matter how many triangles are drawn. Hidden canvases are skipped,
+    instances outside the view frustum are culled, and the rest are drawn
+    at the level of detail their on-screen size calls for.
+    """
+
+    def __init__(self, canvas, camera):
+        self.canvas = canvas
+        self.camera = camera
+        self.rasterizer = None
+        self.photo = tk.PhotoImage(master=canvas)
+        self.item = None
+        self.triangles = 0
+        self.levels = {}
+
+    def render(self, meshes, mode, cull=None):
+        """Rasterize (LODMesh, model or instance models, color, nodes) meshes and blit the frame
+
+        cull maps the view's frustum planes to a mask of the nodes worth drawing.
+        """
+        canvas = self.canvas
+        if not canvas.winfo_ismapped():
+            return False
+        width, height = canvas.winfo_width(), canvas.winfo_height()
+        if width <= 1 or height <= 1:
+            return False
+        if not meshes:
+            # Nothing to shade; let the canvas grid show through
+            if self.item is not None:
+                canvas.delete(self.item)
+                self.item = None
+            return False
+
+        if self.rasterizer is None:
+            self.rasterizer = Rasterizer(width, height)
+        elif (self.rasterizer.width, self.rasterizer.height) != (width, height):
+            self.rasterizer.resize(width, height)
+        else:
+            self.rasterizer.clear()
+        view, projection = camera_matrices(self.camera, width / height)
+        self.levels = {}
+        visible = cull(frustum_planes(projection @ view)) if cull is not None else None
+        for lod, models, color, nodes in meshes:
+            models = np.asarray(models, dtype=np.float64).reshape(-1, 4, 4)
+            if visible is not None:
+                models = models[visible[nodes]]
+                if not len(models):
+                    continue
+            levels = lod.select(screen_diameters(lod.bounds, models, view, projection, height))
+            for level in np.unique(levels).tolist():
+                vertices, indices = lod.mesh(level)
+                self.rasterizer.draw_mesh(vertices, indices, models[levels == level], view, projection, mode, color)
+                self.levels[level] = self.levels.get(level, 0) + int(np.count_nonzero(levels == level))
+        self.triangles = self.rasterizer.triangles
+
+        self.photo.configure(width=width, height=height, data=self.rasterizer.ppm(), format='PPM')
+        if self.item is None:
+            self.item = canvas.create_image(0, 0, anchor=tk.NW, image=self.photo)
+        return True